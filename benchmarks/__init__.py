@@ -0,0 +1,11 @@
+r"""
+Benchmarks for the echemdb-converters loaders and command line interface.
+
+The benchmarks are run with `asv <https://asv.readthedocs.io>`_ against the
+installed version of echemdbconverters::
+
+    asv run --python=same
+
+The sizes of the synthetic files can be configured with the environment
+variable ``ECHEMDBCONVERTERS_BENCHMARK_SIZES``, e.g., ``1MB,64MB,4GB``.
+"""
@@ -0,0 +1,85 @@
+r"""
+Benchmarks of the command line interface on synthetic files.
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+from .synthetic import sizes, synthetic_file
+
+
+class CSV:
+    r"""
+    Benchmarks of the ``csv`` command converting synthetic files into
+    unitpackages.
+    """
+
+    params = (["csv", "eclab", "gamry"], sizes())
+    param_names = ["device", "size"]
+    timeout = 3600
+
+    def setup_cache(self):
+        r"""
+        Create the synthetic files once for all benchmarks.
+        """
+        return {
+            (device, size): synthetic_file(device, size)
+            for device in self.params[0]
+            for size in self.params[1]
+        }
+
+    def setup(self, files, device, size):
+        r"""
+        Create a temporary output directory.
+        """
+        import tempfile
+
+        self.outdir = (  # pylint: disable=attribute-defined-outside-init
+            tempfile.TemporaryDirectory()
+        )
+
+    def teardown(self, files, device, size):
+        r"""
+        Remove the temporary output directory.
+        """
+        self.outdir.cleanup()
+
+    def _convert(self, files, device, size):
+        from click.testing import CliRunner
+
+        from echemdbconverters.entrypoint import cli
+
+        args = ["csv", files[device, size], "--outdir", self.outdir.name]
+        if device != "csv":
+            args += ["--device", device]
+
+        invocation = CliRunner().invoke(cli, args, catch_exceptions=False)
+        assert invocation.exit_code == 0, invocation.output
+
+    def time_csv(self, files, device, size):
+        r"""
+        Time to convert a file into a unitpackage.
+        """
+        self._convert(files, device, size)
+
+    def peakmem_csv(self, files, device, size):
+        r"""
+        Peak memory (RSS) when converting a file into a unitpackage.
+        """
+        self._convert(files, device, size)
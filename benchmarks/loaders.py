@@ -0,0 +1,112 @@
+r"""
+Benchmarks of the loaders on synthetic files.
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+from .synthetic import sizes, synthetic_file
+
+
+def _loader(device, filename):
+    r"""
+    Return a loader for the file ``filename`` recorded with ``device``.
+    """
+    from echemdbconverters.baseloader import BaseLoader
+
+    if device == "csv":
+        return BaseLoader(filename)
+
+    return BaseLoader.create(device)(filename)
+
+
+class Loaders:
+    r"""
+    Benchmarks creating a dataframe with `BaseLoader.df` from
+    plain CSV, EC-Lab MPT and Gamry DTA files.
+    """
+
+    params = (["csv", "eclab", "gamry"], sizes())
+    param_names = ["device", "size"]
+    timeout = 3600
+
+    def setup_cache(self):
+        r"""
+        Create the synthetic files once for all benchmarks.
+        """
+        return {
+            (device, size): synthetic_file(device, size)
+            for device in self.params[0]
+            for size in self.params[1]
+        }
+
+    def time_df(self, files, device, size):
+        r"""
+        Time to create a dataframe of the entire file.
+        """
+        _loader(device, files[device, size]).df
+
+    def peakmem_df(self, files, device, size):
+        r"""
+        Peak memory (RSS) when creating a dataframe of the entire file.
+        """
+        _loader(device, files[device, size]).df
+
+    def time_first_row(self, files, device, size):
+        r"""
+        Time until the first row of the data has been parsed.
+        """
+        next(_loader(device, files[device, size]).chunks(chunksize=1))
+
+    def time_header(self, files, device, size):
+        r"""
+        Time to determine the column names, the delimiter and the decimal separator.
+        """
+        loader = _loader(device, files[device, size])
+        loader.column_header_names
+        loader.decimal
+
+    def track_rows_per_second(self, files, device, size):
+        r"""
+        Number of rows parsed per second when creating a dataframe.
+        """
+        import time
+
+        start = time.perf_counter()
+        rows = len(_loader(device, files[device, size]).df)
+        return rows / (time.perf_counter() - start)
+
+    track_rows_per_second.unit = "rows/s"
+
+    def track_megabytes_per_second(self, files, device, size):
+        r"""
+        Megabytes of the file parsed per second when creating a dataframe.
+        """
+        import os
+        import time
+
+        start = time.perf_counter()
+        _loader(device, files[device, size]).df
+        return (
+            os.path.getsize(files[device, size])
+            / 2**20
+            / (time.perf_counter() - start)
+        )
+
+    track_megabytes_per_second.unit = "MB/s"
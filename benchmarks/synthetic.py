@@ -0,0 +1,361 @@
+r"""
+Generators for synthetic files of the formats supported by echemdb-converters.
+
+The files mimic cyclic voltammograms recorded with a triangular potential
+sweep, i.e., the time is strictly increasing and the cycle number increases
+after each full sweep.
+
+EXAMPLES::
+
+    >>> import os, tempfile
+    >>> filename = os.path.join(tempfile.mkdtemp(), "data.mpt")
+    >>> eclab(filename, 2**16)
+    >>> os.path.getsize(filename) >= 2**16
+    True
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+import os
+
+BLOCK_ROWS = 100000
+r"""
+The number of rows generated at once.
+"""
+
+POINTS_PER_CYCLE = 2000
+r"""
+The number of rows of a single cycle of the triangular potential sweep.
+"""
+
+ECLAB_HEADER = """EC-Lab ASCII FILE
+Nb header lines : {header_lines}
+
+Cyclic Voltammetry
+
+Run on channel : 1 (SN 14323)
+User : Benchmark
+Electrode connection : CE to ground
+Potential control : Ewe
+Device : VSP-300 (SN 0936)
+EC-Lab for windows v11.41 (software)
+Electrode material : Pt
+Electrolyte : HClO4 (0.1M)
+Reference electrode : RHE
+Electrode surface area : 0,001 cm²
+Text export
+   Mode : Standard
+   Time format : Elapsed
+Ei (V)              0,850
+dE/dt               50,000
+dE/dt unit          mV/s
+E1 (V)              0,050
+I Range             100 µA
+
+"""
+
+GAMRY_HEADER = """EXPLAIN
+TAG\tCV
+TITLE\tLABEL\tCyclic Voltammetry\tTest &Identifier
+DATE\tLABEL\t20.4.2023\tDate
+PSTAT\tPSTAT\tREF600-25039\tPotentiostat
+SCANRATE\tQUANT\t5,00000E+001\t&Scan Rate (mV/s)
+AREA\tQUANT\t1,00000E+000\tElectrode &Area (cm^2)
+CURVE\tTABLE\t{rows}
+"""
+
+
+def parse_size(size):
+    r"""
+    Return the number of bytes described by ``size`` such as ``"16MB"``.
+
+    EXAMPLES::
+
+        >>> parse_size("16MB")
+        16777216
+        >>> parse_size("2GB")
+        2147483648
+        >>> parse_size("512")
+        512
+
+    """
+    size = size.strip().upper()
+
+    for suffix, factor in [("KB", 2**10), ("MB", 2**20), ("GB", 2**30)]:
+        if size.endswith(suffix):
+            return int(float(size[: -len(suffix)]) * factor)
+
+    return int(size)
+
+
+def sizes():
+    r"""
+    Return the sizes of the synthetic files configured with the environment
+    variable ``ECHEMDBCONVERTERS_BENCHMARK_SIZES``.
+
+    EXAMPLES::
+
+        >>> sizes()
+        ['1MB', '16MB']
+
+    """
+    return [
+        size.strip()
+        for size in os.environ.get(
+            "ECHEMDBCONVERTERS_BENCHMARK_SIZES", "1MB,16MB"
+        ).split(",")
+        if size.strip()
+    ]
+
+
+def _block(start, rows):
+    r"""
+    Return a dataframe of ``rows`` rows of a cyclic voltammogram starting at
+    row ``start``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    index = np.arange(start, start + rows)
+    phase = (index % POINTS_PER_CYCLE) / POINTS_PER_CYCLE
+    potential = 0.05 + 0.8 * (1 - np.abs(2 * phase - 1))
+    current = 1e-3 * np.sin(2 * np.pi * phase) + 1e-5 * np.cos(index)
+
+    return pd.DataFrame(
+        {
+            "index": index,
+            "time": 86.7 + 0.02 * index,
+            "control": potential,
+            "potential": potential - 2.5e-4,
+            "current": current,
+            "cycle": 1 + index // POINTS_PER_CYCLE,
+            "charge": np.cumsum(current) * 0.02,
+            "power": potential * current,
+        }
+    )
+
+
+def _write(filename, size, header, block):
+    r"""
+    Write ``header`` followed by blocks of rows created by ``block`` to
+    ``filename`` until the file has at least ``size`` bytes.
+    """
+    with open(filename, "w", encoding="utf-8", newline="\n") as file:
+        file.write(header)
+
+        rows = 0
+        while file.tell() < size:
+            file.write(block(_block(rows, BLOCK_ROWS)))
+            rows += BLOCK_ROWS
+
+
+def eclab(filename, size):
+    r"""
+    Write a synthetic EC-Lab MPT file with at least ``size`` bytes to ``filename``.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.eclabloader import ECLabLoader
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.mpt")
+        >>> eclab(filename, 2**16)
+        >>> ECLabLoader(filename).df.columns[:4].tolist()
+        ['mode', 'ox/red', 'error', 'control changes']
+
+    """
+    columns = "\t".join(
+        [
+            "mode",
+            "ox/red",
+            "error",
+            "control changes",
+            "counter inc.",
+            "time/s",
+            "control/V",
+            "Ewe/V",
+            "<I>/mA",
+            "cycle number",
+            "(Q-Qo)/C",
+            "I Range",
+            "P/W",
+        ]
+    )
+    header = ECLAB_HEADER.format(header_lines=ECLAB_HEADER.count("\n") + 1)
+
+    def block(df):
+        df = df.assign(
+            mode=2,
+            oxred=(df["current"] > 0).astype(int),
+            error=0,
+            changes=1,
+            counter=0,
+            irange=41,
+        )
+        return df[
+            [
+                "mode",
+                "oxred",
+                "error",
+                "changes",
+                "counter",
+                "time",
+                "control",
+                "potential",
+                "current",
+                "cycle",
+                "charge",
+                "irange",
+                "power",
+            ]
+        ].to_csv(
+            sep="\t",
+            decimal=",",
+            float_format="%.7E",
+            header=False,
+            index=False,
+            lineterminator="\n",
+        )
+
+    _write(filename, size, header + columns + "\n", block)
+
+
+def gamry(filename, size):
+    r"""
+    Write a synthetic Gamry DTA file with at least ``size`` bytes to ``filename``.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.gamryloader import GamryLoader
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.DTA")
+        >>> gamry(filename, 2**16)
+        >>> GamryLoader(filename).df.columns[:3].tolist()
+        ['Pt / #', 'T / s', 'Vf / V vs. Ref.']
+
+    """
+    header = (
+        GAMRY_HEADER.format(rows=0)
+        + "\tPt\tT\tVf\tIm\tVu\tSig\tAch\tIERange\tOver\tCycle\tTemp\n"
+        + "\t#\ts\tV vs. Ref.\tA\tV\tV\tV\t#\tbits\t#\tdeg C\n"
+    )
+
+    def block(df):
+        df = df.assign(
+            empty="",
+            vu=0.0,
+            ach=1e-4,
+            ierange=9,
+            over="..........a",
+            temperature=-327.75,
+        )
+        return df[
+            [
+                "empty",
+                "index",
+                "time",
+                "potential",
+                "current",
+                "vu",
+                "control",
+                "ach",
+                "ierange",
+                "over",
+                "cycle",
+                "temperature",
+            ]
+        ].to_csv(
+            sep="\t",
+            decimal=",",
+            float_format="%.5E",
+            header=False,
+            index=False,
+            lineterminator="\n",
+        )
+
+    _write(filename, size, header, block)
+
+
+def csv(filename, size):
+    r"""
+    Write a synthetic CSV file with a single column header line
+    with at least ``size`` bytes to ``filename``.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.baseloader import BaseLoader
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+        >>> csv(filename, 2**16)
+        >>> BaseLoader(filename).df.columns.tolist()
+        ['t', 'E', 'j', 'cycle']
+
+    """
+
+    def block(df):
+        return df[["time", "potential", "current", "cycle"]].to_csv(
+            header=False, index=False, lineterminator="\n"
+        )
+
+    _write(filename, size, "t,E,j,cycle\n", block)
+
+
+generators = {"csv": csv, "eclab": eclab, "gamry": gamry}
+r"""
+The generators of synthetic files for each device.
+"""
+
+suffixes = {"csv": ".csv", "eclab": ".mpt", "gamry": ".DTA"}
+r"""
+The file name suffixes of the synthetic files for each device.
+"""
+
+
+def synthetic_file(device, size):
+    r"""
+    Return the path of a synthetic file for ``device`` with at least ``size``
+    bytes (such as ``"16MB"``).
+
+    The files are created in the directory set by the environment variable
+    ``ECHEMDBCONVERTERS_BENCHMARK_DATA`` (or a temporary directory) and reused
+    by later benchmark runs.
+
+    EXAMPLES::
+
+        >>> import os
+        >>> os.path.exists(synthetic_file("csv", "64KB"))
+        True
+
+    """
+    import tempfile
+
+    directory = os.environ.get(
+        "ECHEMDBCONVERTERS_BENCHMARK_DATA",
+        os.path.join(tempfile.gettempdir(), "echemdbconverters-benchmarks"),
+    )
+    os.makedirs(directory, exist_ok=True)
+
+    filename = os.path.join(directory, f"{device}-{size}{suffixes[device]}")
+
+    if not os.path.exists(filename):
+        generators[device](filename + ".part", parse_size(size))
+        os.replace(filename + ".part", filename)
+
+    return filename
@@ -0,0 +1,183 @@
+r"""
+Conversion of files from :mod:`asyncio` applications.
+
+Loading and converting files reads from disk and parses the data, which
+blocks the event loop. The coroutines in this module run this work in an
+executor instead, i.e., in a pool of threads by default or in the
+``executor`` provided, and limit the number of concurrent conversions.
+
+EXAMPLES::
+
+    >>> import asyncio, os, tempfile
+    >>> from echemdbconverters.test.cli import TemporaryData
+    >>> with TemporaryData("eclab_cv.mpt", "eclab_ca.mpt") as directory:
+    ...     outdir = tempfile.mkdtemp()
+    ...     entries = asyncio.run(convert_files([os.path.join(directory, "eclab_cv.mpt"),
+    ...         os.path.join(directory, "eclab_ca.mpt")], device="eclab", outdir=outdir, concurrency=2))
+    ...     sorted(os.listdir(outdir))
+    ['eclab_ca.csv', 'eclab_ca.json', 'eclab_cv.csv', 'eclab_cv.json']
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+import asyncio
+
+
+async def convert_file(
+    filename,
+    device=None,
+    outdir=".",
+    metadata=None,
+    executor=None,
+    semaphore=None,
+    **kwargs,
+):  # pylint: disable=too-many-arguments
+    r"""
+    Convert the file ``filename`` recorded with ``device`` into a unitpackage
+    with ``metadata`` written to ``outdir`` without blocking the event loop
+    and return the created entry.
+
+    The conversion runs in ``executor`` (the default executor of the event
+    loop if ``None``). Since the created entry cannot be transferred between
+    processes, the executor must run in the same process, e.g., a
+    :class:`concurrent.futures.ThreadPoolExecutor`; the data can still be
+    parsed with several worker processes with the ``processes`` keyword
+    argument. When a ``semaphore`` is provided, the conversion
+    waits until it can acquire the semaphore, which limits the number of
+    conversions running at the same time. The ``kwargs`` are passed on to
+    :func:`echemdbconverters.conversion.convert_file`; note that callbacks
+    such as ``progress`` are invoked from the thread of the executor.
+
+    EXAMPLES::
+
+        >>> import asyncio, os, tempfile
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("unit.csv") as directory:
+        ...     entry = asyncio.run(convert_file(os.path.join(directory, "unit.csv"), outdir=tempfile.mkdtemp(),
+        ...         metadata={"figure description": {"fields": [{"name": "t", "unit": "s"}]}}))
+        >>> entry.field_unit("t")
+        's'
+
+    """
+    from functools import partial
+
+    from echemdbconverters import conversion
+
+    loop = asyncio.get_running_loop()
+
+    convert = partial(
+        conversion.convert_file,
+        filename,
+        device=device,
+        outdir=outdir,
+        metadata=metadata,
+        **kwargs,
+    )
+
+    # nullcontext() only supports "async with" since Python 3.10.
+    if semaphore is None:
+        return await loop.run_in_executor(executor, convert)
+
+    async with semaphore:
+        return await loop.run_in_executor(executor, convert)
+
+
+async def convert_files(
+    filenames,
+    device=None,
+    outdir=".",
+    metadata=None,
+    concurrency=4,
+    executor=None,
+    **kwargs,
+):  # pylint: disable=too-many-arguments
+    r"""
+    Convert the files ``filenames`` recorded with ``device`` into unitpackages
+    with ``metadata`` written to ``outdir`` and return the created entries.
+
+    At most ``concurrency`` files are converted at the same time in
+    ``executor``, see :func:`convert_file`.
+
+    EXAMPLES::
+
+        >>> import asyncio, os, tempfile
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("default.csv", "unit.csv") as directory:
+        ...     entries = asyncio.run(convert_files([os.path.join(directory, "default.csv"),
+        ...         os.path.join(directory, "unit.csv")], outdir=tempfile.mkdtemp(), concurrency=1))
+        >>> [entry.identifier for entry in entries]
+        ['default', 'unit']
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    return await asyncio.gather(
+        *(
+            convert_file(
+                filename,
+                device=device,
+                outdir=outdir,
+                metadata=metadata,
+                executor=executor,
+                semaphore=semaphore,
+                **kwargs,
+            )
+            for filename in filenames
+        )
+    )
+
+
+async def aiter_chunks(loader, chunksize=100000, executor=None):
+    r"""
+    Return an asynchronous iterator over pandas dataframes with at most
+    ``chunksize`` rows of the data of ``loader``, see
+    :meth:`echemdbconverters.baseloader.BaseLoader.chunks`.
+
+    Each chunk is read and parsed in ``executor`` (the default executor of
+    the event loop if ``None``). Since the chunks are read from a single open
+    file, the executor must run in the same process, e.g., a
+    :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    EXAMPLES::
+
+        >>> import asyncio
+        >>> from io import StringIO
+        >>> from echemdbconverters.baseloader import BaseLoader
+        >>> csv = BaseLoader(StringIO("a,b\n0,0\n1,1\n2,2"))
+        >>> async def lengths():
+        ...     return [len(chunk) async for chunk in aiter_chunks(csv, chunksize=2)]
+        >>> asyncio.run(lengths())
+        [2, 1]
+
+    """
+    loop = asyncio.get_running_loop()
+
+    chunks = loader.chunks(chunksize)
+    end = object()
+
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, chunks, end)
+            if chunk is end:
+                return
+            yield chunk
+    finally:
+        # Close the file of the chunks when the iteration is aborted.
+        await loop.run_in_executor(executor, chunks.close)
@@ -48,11 +48,49 @@ TODO:: Add example
 
 
 import logging
+from functools import cached_property, wraps
 
 logger = logging.getLogger("loader")
 
 
-class BaseLoader:
+def _profiled(stage):
+    r"""
+    Return a decorator which records calls to a method of a loader as
+    ``stage`` with the profiler of the loader and reports the start of
+    the stage to the progress callback of the loader.
+
+    EXAMPLES::
+
+        >>> from io import StringIO
+        >>> from echemdbconverters.profiling import Profiler
+        >>> class Loader(BaseLoader):
+        ...     @_profiled("lines")
+        ...     def lines(self):
+        ...         return len(self.file.readlines())
+        >>> profiler = Profiler()
+        >>> Loader(StringIO("a\n0"), profiler=profiler).lines()
+        2
+        >>> profiler.records[-1]["stage"]
+        'lines'
+
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def profiled(self, *args, **kwargs):
+            from echemdbconverters.profiling import profile
+
+            self._report(stage)  # pylint: disable=protected-access
+
+            with profile(self.profiler, stage):
+                return method(self, *args, **kwargs)
+
+        return profiled
+
+    return decorator
+
+
+class BaseLoader:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     r"""
     Loads a CSV, where the first line must contain the column (field) names
     and the following lines comma separated values.
@@ -94,6 +132,60 @@ class BaseLoader:
         0     2       0    0.1       0          0
         1     2       1    1.4       5          1
 
+    Instead of a file object, the path of a file can be provided. Such files
+    can be compressed with gzip, xz or zstd. The file is only read and decompressed
+    as far as needed, e.g., the header is read without decompressing the entire file::
+
+        >>> import gzip, os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), 'data.csv.gz')
+        >>> with gzip.open(filename, 'wt') as file:
+        ...     _ = file.write('''a,b
+        ... 0,0
+        ... 1,1''')
+        >>> csv = BaseLoader(filename)
+        >>> csv.column_header_names
+        ['a', 'b']
+        >>> csv.df
+           a  b
+        0  0  0
+        1  1  1
+
+    """
+
+    sample_lines = 100
+    r"""
+    The maximum number of data lines from which :meth:`delimiter` and
+    :meth:`decimal` are determined.
+    """
+
+    sample_bytes = 65536
+    r"""
+    The number of bytes at the beginning of the file from which
+    the :meth:`encoding` is determined.
+    """
+
+    progress_interval = 2**22
+    r"""
+    The number of bytes parsed between reports to the ``progress`` callback.
+    """
+
+    line_index_interval = 1000
+    r"""
+    The number of data lines between the offsets recorded in the
+    :meth:`line_index`.
+    """
+
+    memory_per_byte = 6
+    r"""
+    The approximate number of bytes of memory needed to convert each byte
+    of a file when its entire data is held in memory, see
+    :func:`echemdbconverters.batch.estimate_memory`.
+    """
+
+    cycle_column = None
+    r"""
+    The name of the column containing the cycle number of a measurement
+    such as a cyclic voltammogram, see :meth:`cycles`.
     """
 
     def __init__(
@@ -103,12 +195,156 @@ class BaseLoader:
         column_header_lines=None,
         decimal=None,
         delimiters=None,
+        encoding=None,
+        profiler=None,
+        progress=None,
+        sidecar=None,
+        cache=None,
     ):  # pylint: disable=dangerous-default-value
-        self._file = file.read()
+        import os
+
+        if isinstance(file, (str, os.PathLike)):
+            # The file is only read when its content is needed.
+            self._path = file
+            self._file = None
+        else:
+            self._path = None
+            self._file = file.read()
+
+            if isinstance(self._file, str):
+                # Text streams have already been decoded, so any other
+                # encoding would mangle the re-encoded content.
+                self._file = self._file.encode("utf-8")
+                encoding = "utf-8"
+
+        self._encoding = encoding
         self._header_lines = header_lines
         self._column_header_lines = column_header_lines
         self._decimal = decimal
         self.delimiters = delimiters or ["\t", ";", ","]
+        self.profiler = profiler
+        self.progress = progress
+
+        # The offset and number of rows parsed by poll().
+        self._tail = None
+
+        self.sidecar = None
+        if sidecar:
+            if self._path is None:
+                raise ValueError("A sidecar index requires the path of a file.")
+
+            self.sidecar = f"{self._path}.index.json" if sidecar is True else sidecar
+
+            from echemdbconverters.sidecar import read_sidecar
+
+            self.__dict__.update(
+                read_sidecar(self.sidecar, self._path, self._sidecar_options)
+            )
+
+        self.cache = None
+        if cache:
+            from echemdbconverters.cache import default_directory
+
+            self.cache = default_directory() if cache is True else cache
+
+    _dependents = {
+        "encoding": ["_data_encoding", "header_lines", "_cache_key"],
+        "_data_encoding": ["_data_sample"],
+        "header_lines": ["column_header_names", "_data_sample", "line_index"],
+        "_data_sample": ["delimiter", "decimal"],
+        "delimiter": ["column_header_names", "decimal", "line_index", "_cache_key"],
+        "decimal": ["line_index", "_cache_key"],
+        "column_header_names": ["column_header_fields", "line_index"],
+        "line_index": ["cycle_index", "_cache_key"],
+    }
+    r"""
+    The cached properties which are determined from each cached property,
+    see :meth:`invalidate`. Subclasses only list their additional dependents.
+    """
+
+    def invalidate(self, *names):
+        r"""
+        Discard the cached values of the properties ``names`` such as
+        :meth:`delimiter` or :meth:`decimal`, which are otherwise only
+        determined once for each loader, and of all the cached properties
+        determined from them, such as the :meth:`column_header_names`.
+        Without ``names``, all cached values are discarded.
+
+        This is required when a parameter of the loader is changed
+        after some of the properties have been determined.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a;b,c
+            ... 0;1,5
+            ... 1;2,5''')
+            >>> csv = BaseLoader(file)
+            >>> csv.column_header_names
+            ['a', 'b,c']
+            >>> csv.decimal
+            ','
+
+            >>> csv.delimiters = [","]
+            >>> csv.column_header_names
+            ['a', 'b,c']
+
+            >>> csv.invalidate('delimiter')
+            >>> csv.column_header_names
+            ['a;b', 'c']
+            >>> csv.decimal
+            '.'
+            >>> csv.df
+               a;b  c
+            0  0;1  5
+            1  1;2  5
+
+        The delimiter is detected only once when creating a dataframe and
+        not at all when creating it again::
+
+            >>> from unittest.mock import patch
+            >>> import clevercsv
+            >>> detect = clevercsv.detect.Detector.detect
+            >>> file = StringIO('''a\tb
+            ... 0\t0,1
+            ... 1\t1,2''')
+            >>> csv = BaseLoader(file)
+            >>> with patch.object(clevercsv.detect.Detector, "detect", autospec=True, side_effect=detect) as detector:
+            ...     _ = csv.df
+            ...     _ = csv.df
+            >>> detector.call_count
+            1
+
+        After invalidating all cached values, the delimiter is detected again::
+
+            >>> csv.invalidate()
+            >>> with patch.object(clevercsv.detect.Detector, "detect", autospec=True, side_effect=detect) as detector:
+            ...     _ = csv.df
+            >>> detector.call_count
+            1
+
+        """
+        if not names:
+            names = [
+                name
+                for cls in type(self).__mro__
+                for (name, value) in vars(cls).items()
+                if isinstance(value, cached_property)
+            ]
+
+        names = set(names)
+        pending = list(names)
+
+        while pending:
+            name = pending.pop()
+            for cls in type(self).__mro__:
+                for dependent in vars(cls).get("_dependents", {}).get(name, []):
+                    if dependent not in names:
+                        names.add(dependent)
+                        pending.append(dependent)
+
+        for name in names:
+            self.__dict__.pop(name, None)
 
     @property
     def file(self):
@@ -127,316 +363,2610 @@ class BaseLoader:
         """
         from io import StringIO
 
-        return StringIO(self._file)
+        if self._file is None:
+            from echemdbconverters.profiling import profile
+
+            with profile(self.profiler, "read") as record:
+                with self._open_binary() as file:
+                    self._file = file.read()
+                record["bytes"] = len(self._file)
+
+        with self._open() as file:
+            return StringIO(file.read())
+
+    _sidecar_properties = [
+        "encoding",
+        "_data_encoding",
+        "header_lines",
+        "column_header_names",
+        "delimiter",
+        "decimal",
+        "line_index",
+    ]
+    r"""
+    The properties recorded in a sidecar index, see :meth:`write_sidecar`.
+    """
+
+    _sidecar_indexes = ["cycle_index"]
+    r"""
+    The indexes of rows recorded in a sidecar index once they have been
+    created, see :meth:`write_sidecar`.
+    """
 
-    @staticmethod
-    def create(device=None):
+    @property
+    def _sidecar_options(self):
         r"""
-        Calls a specific `loader` based on a given device.
+        The options of this loader which a sidecar index depends on.
 
         EXAMPLES::
 
             >>> from io import StringIO
-            >>> file = StringIO('''EC-Lab ASCII FILE
-            ... Nb header lines : 6
-            ...
-            ... Device metadata : some metadata
+            >>> BaseLoader(StringIO("a,b\n0,0"))._sidecar_options
+            {'loader': 'BaseLoader', 'header_lines': None, 'column_header_lines': None, 'decimal': None, 'delimiters': ['\t', ';', ','], 'encoding': 'utf-8', 'line_index_interval': 1000, 'cycle_column': None}
+
+        """
+        return {
+            "loader": type(self).__name__,
+            "header_lines": self._header_lines,
+            "column_header_lines": self._column_header_lines,
+            "decimal": self._decimal,
+            "delimiters": self.delimiters,
+            "encoding": self._encoding,
+            "line_index_interval": self.line_index_interval,
+            "cycle_column": self.cycle_column,
+        }
+
+    def write_sidecar(self):
+        r"""
+        Write the properties of the file, such as the number of header lines,
+        the delimiter, the decimal separator, the column names, the
+        :meth:`line_index`, and the :meth:`cycle_index` (if it has been created)
+        to the sidecar index of this loader.
+
+        The sidecar index is updated automatically when the :meth:`line_index`
+        or the :meth:`cycle_index` are created. When the file is loaded again
+        with the same ``sidecar``, these properties are not determined again
+        as long as the file has not been modified, see :mod:`echemdbconverters.sidecar`.
+
+        EXAMPLES::
+
+            >>> import os, tempfile
+            >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t,E,cycle\n0,0.1,1\n1,0.2,2\n")
+            >>> class CycleLoader(BaseLoader):
+            ...     cycle_column = "cycle"
+            >>> csv = CycleLoader(filename, sidecar=filename + ".idx")
+            >>> csv.cycle_index
+            {1: (0, 1), 2: (1, 2)}
+
+            >>> csv = CycleLoader(filename, sidecar=filename + ".idx")
+            >>> "cycle_index" in csv.__dict__
+            True
+
+        Since the sidecar index depends on the options of the loader, it is
+        ignored when the options change::
+
+            >>> csv = CycleLoader(filename, sidecar=filename + ".idx", decimal=".")
+            >>> "cycle_index" in csv.__dict__
+            False
+
+        TESTS:
+
+        Sidecar indexes require the path of a file::
+
+            >>> from io import StringIO
+            >>> BaseLoader(StringIO("a,b"), sidecar=True)
+            Traceback (most recent call last):
             ...
-            ... mode\ttime/s\tEwe/V\t<I>/mA\tcontrol/V
-            ... 2\t0\t0.1\t0\t0
-            ... 2\t1\t1.4\t5\t1
-            ... ''')
-            >>> csv = BaseLoader.create('eclab')(file)
-            >>> csv.df
-               mode  time/s  Ewe/V  <I>/mA  control/V
-            0     2       0    0.1       0          0
-            1     2       1    1.4       5          1
+            ValueError: A sidecar index requires the path of a file.
 
         """
-        if device == "eclab":
-            from echemdbconverters.eclabloader import ECLabLoader
+        from echemdbconverters.sidecar import write_sidecar
 
-            return ECLabLoader
+        properties = {name: getattr(self, name) for name in self._sidecar_properties}
 
-        if device == "gamry":
-            from echemdbconverters.gamryloader import GamryLoader
+        for name in self._sidecar_indexes:
+            if name in self.__dict__:
+                properties[name] = self.__dict__[name]
 
-            return GamryLoader
+        write_sidecar(self.sidecar, self._path, self._sidecar_options, properties)
 
-        raise KeyError(f"Device wth name '{device}' is unknown to the loader'.")
+    def _update_sidecar(self, name, value):
+        r"""
+        Record ``value`` as the property ``name`` and update the sidecar index
+        if this loader has one. Returns ``value``.
 
-    @property
-    def header_lines(self):
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0"))
+            >>> csv._update_sidecar("line_index", {})
+            {}
+
+        """
+        self.__dict__[name] = value
+
+        if self.sidecar:
+            self.write_sidecar()
+
+        return value
+
+    @cached_property
+    def _total_bytes(self):
         r"""
-        The number of header lines in a CSV excluding the line with the column names.
+        The size of the (decompressed) file in bytes or ``None`` if it is
+        not known without decompressing the file.
 
-        EXAMPLES:
+        EXAMPLES::
 
-        Files for the base loader do not have a header::
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0"))
+            >>> csv._total_bytes
+            7
+
+        """
+        if self._file is not None:
+            return len(self._file)
+
+        from echemdbconverters.compression import compression
+
+        if compression(self._path):
+            return None
+
+        import os
+
+        return os.path.getsize(self._path)
+
+    def _report(
+        self, stage, bytes=None, rows=None
+    ):  # pylint: disable=redefined-builtin
+        r"""
+        Report the progress of ``stage`` to the ``progress`` callback.
+
+        EXAMPLES::
 
             >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file)
-            >>> csv.header_lines
-            0
+            >>> events = []
+            >>> csv = BaseLoader(StringIO("a,b\n0,0"), progress=events.append)
+            >>> csv._report("parse", bytes=4)
+            >>> events
+            [{'stage': 'parse', 'bytes': 4, 'total_bytes': 7, 'rows': None}]
 
-        Implementation in a specific device loader::
+        """
+        if self.progress is None:
+            return
 
-            >>> file = StringIO('''EC-Lab ASCII FILE
-            ... Nb header lines : 6
-            ...
-            ... Device metadata : some metadata
-            ...
-            ... mode\ttime/s\tEwe/V\t<I>/mA\tcontrol/V
-            ... 2\t0\t0,1\t0\t0
-            ... 2\t1\t1,4\t5\t1
-            ... ''')
-            >>> csv = BaseLoader.create('eclab')(file)
-            >>> csv.header_lines
-            5
+        from echemdbconverters.progress import event
+
+        self.progress(
+            event(stage, bytes=bytes, total_bytes=self._total_bytes, rows=rows)
+        )
+
+    def _progress_stream(self, data, stage):
+        r"""
+        Return the binary file object ``data`` wrapped such that
+        reading from it reports the progress of ``stage``.
+
+        EXAMPLES::
+
+            >>> from io import BytesIO
+            >>> events = []
+            >>> csv = BaseLoader(BytesIO(b"a,b\n0,0"), progress=events.append)
+            >>> csv.progress_interval = 1
+            >>> with csv._progress_stream(csv._data_stream(), "parse") as data:
+            ...     data.read()
+            b'0,0'
+            >>> events[-1]
+            {'stage': 'parse', 'bytes': 7, 'total_bytes': 7, 'rows': None}
 
         """
-        return self._header_lines or 0
+        if self.progress is None:
+            return data
 
-    @property
-    def header(self):
+        from io import BufferedReader
+
+        from echemdbconverters.progress import ProgressReader
+
+        return BufferedReader(
+            ProgressReader(
+                data,
+                lambda position: self._report(stage, bytes=position),
+                interval=self.progress_interval,
+            )
+        )
+
+    def _open_binary(self):
         r"""
-        The header of the CSV (excluding column names).
+        Return a binary file object of the loaded file, which is read lazily
+        (and decompressed) when the loader was created from a path.
 
         EXAMPLES::
 
             >>> from io import StringIO
             >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
+            ... 0,0''')
             >>> csv = BaseLoader(file)
-            >>> type(csv.header)
-            <class '_io.StringIO'>
+            >>> with csv._open_binary() as file:
+            ...     file.readline()
+            b'a,b\n'
+
+        """
+        if self._file is None:
+            from echemdbconverters.compression import open_file
+
+            return open_file(self._path)
+
+        from io import BytesIO
+
+        return BytesIO(self._file)
+
+    def _open(self):
+        r"""
+        Return a text file object of the loaded file decoded with the
+        detected :meth:`encoding`.
 
         EXAMPLES::
 
             >>> from io import StringIO
             >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
+            ... 0,0''')
             >>> csv = BaseLoader(file)
+            >>> with csv._open() as file:
+            ...     file.readline()
+            'a,b\n'
+
+        """
+        from io import TextIOWrapper
+
+        return TextIOWrapper(self._open_binary(), encoding=self.encoding)
+
+    @cached_property
+    @_profiled("encoding")
+    def encoding(self):
+        r"""
+        The encoding of the file determined from the first
+        :attr:`sample_bytes` bytes of the file, unless it was
+        specified explicitly when creating the loader.
+
+        Vendor software often writes files encoded with Windows-1252
+        instead of UTF-8. Only encodings which are compatible with
+        ASCII are detected, namely UTF-8, Windows-1252 and Latin-1.
+
+        EXAMPLES:
+
+        Files read from a text stream are already decoded::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO('''a,b
+            ... 0,0'''))
+            >>> csv.encoding
+            'utf-8'
+
+        An encoding specified for such files is ignored::
+
+            >>> csv = BaseLoader(StringIO('''I/µA,T/°C
+            ... 0,0'''), encoding="cp1252")
+            >>> csv.encoding
+            'utf-8'
+            >>> csv.column_header_names
+            ['I/µA', 'T/°C']
+
+        Files containing units such as ``µA`` and ``cm²`` written with Windows-1252::
+
+            >>> from io import BytesIO
+            >>> file = BytesIO('''Electrode surface area : 0,001 cm²
+            ... I/µA,E/V
+            ... 0,0'''.encode('cp1252'))
+            >>> csv = BaseLoader(file, header_lines=1)
+            >>> csv.encoding
+            'cp1252'
             >>> csv.header.readlines()
-            []
+            ['Electrode surface area : 0,001 cm²\n']
+            >>> csv.column_header_names
+            ['I/µA', 'E/V']
 
         """
-        from io import StringIO
+        if self._encoding:
+            return self._encoding
 
-        return StringIO(
-            "".join(line for line in self.file.readlines()[: self.header_lines])
-        )
+        with self._open_binary() as file:
+            return self._detect_encoding(file.read(self.sample_bytes))
 
-    @property
-    def metadata(self):  # pylint: disable=abstract-method
-        r"""A dict containing the metadata of the file found in its header.
+    @staticmethod
+    def _detect_encoding(data):
+        r"""
+        Return the encoding of the bytes ``data``, the beginning of a file.
 
         EXAMPLES::
 
-            >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file)
-            >>> csv.metadata
-            Traceback (most recent call last):
-            ...
-            NotImplementedError
+            >>> BaseLoader._detect_encoding('I/µA'.encode('utf-8'))
+            'utf-8'
+
+            >>> BaseLoader._detect_encoding('I/µA'.encode('cp1252'))
+            'cp1252'
+
+            >>> BaseLoader._detect_encoding(b'\xef\xbb\xbfI/mA')
+            'utf-8-sig'
+
+        Bytes not defined in Windows-1252::
+
+            >>> BaseLoader._detect_encoding(b'\x81')
+            'latin-1'
+
+        A multibyte character which is truncated at the end of the data::
+
+            >>> BaseLoader._detect_encoding('I/µA'.encode('utf-8')[:3])
+            'utf-8'
 
         """
-        raise NotImplementedError
+        import codecs
 
-    @property
-    def column_header_lines(self):
+        if data.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+
+        for encoding in ["utf-8", "cp1252"]:
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(data, final=False)
+            except UnicodeDecodeError:
+                continue
+
+            return encoding
+
+        return "latin-1"
+
+    @cached_property
+    def _data_encoding(self):
         r"""
-        The number of lines containing the descriptive information of the data
-        for each column.
+        The encoding with which the data of the file is parsed.
+
+        Since the data usually only contains ASCII characters, it is parsed
+        as UTF-8, which pandas parses directly from bytes.
+
+        EXAMPLES::
+
+            >>> from io import BytesIO
+            >>> file = BytesIO('''I/µA,E/V
+            ... 0,0'''.encode('cp1252'))
+            >>> csv = BaseLoader(file)
+            >>> csv._data_encoding
+            'utf-8'
+
+            >>> file = BytesIO('''I/µA,E/V
+            ... 0,µ'''.encode('cp1252'))
+            >>> csv = BaseLoader(file)
+            >>> csv._data_encoding
+            'cp1252'
+
+        """
+        if all(line.isascii() for line in self._data_sample):
+            return "utf-8"
+
+        return self.encoding
+
+    def _lines(self):
+        r"""
+        Return an iterator over the lines of the file.
+
+        Only the consumed lines are read from the file, i.e., the file is not
+        read entirely when only its header is of interest.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0''')
+            >>> csv = BaseLoader(file)
+            >>> list(csv._lines())
+            ['a,b\n', '0,0']
+
+        """
+        with self._open() as file:
+            yield from file
+
+    def _data_stream(self):
+        r"""
+        Return a binary file object positioned at the first line of the data.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0''')
+            >>> csv = BaseLoader(file)
+            >>> with csv._data_stream() as data:
+            ...     data.read()
+            b'0,0'
+
+        """
+        file = self._open_binary()
+
+        for _ in range(self.header_lines + self.column_header_lines):
+            file.readline()
+
+        return file
+
+    @property
+    def _data_end(self):
+        r"""
+        The offset at which the data ends in the (decompressed) file or
+        ``None`` if the data extends to the end of the file.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> BaseLoader(StringIO("a,b\n0,0"))._data_end is None
+            True
+
+        """
+        return None
+
+    @staticmethod
+    def create(device=None):
+        r"""
+        Calls a specific `loader` based on a given device.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 6
+            ...
+            ... Device metadata : some metadata
+            ...
+            ... mode\ttime/s\tEwe/V\t<I>/mA\tcontrol/V
+            ... 2\t0\t0.1\t0\t0
+            ... 2\t1\t1.4\t5\t1
+            ... ''')
+            >>> csv = BaseLoader.create('eclab')(file)
+            >>> csv.df
+               mode  time/s  Ewe/V  <I>/mA  control/V
+            0     2       0    0.1       0          0
+            1     2       1    1.4       5          1
+
+        The device can also be a YAML or TOML file describing the layout of the
+        files, see :mod:`echemdbconverters.specloader`::
+
+            >>> import os, tempfile
+            >>> spec = os.path.join(tempfile.mkdtemp(), "device.yaml")
+            >>> with open(spec, "w") as file:
+            ...     _ = file.write("header: {lines: 1}")
+            >>> csv = BaseLoader.create(spec)(StringIO("Some header\na,b\n0,0"))
+            >>> csv.df
+               a  b
+            0  0  0
+
+        """
+        if device and device.endswith((".yaml", ".yml", ".toml")):
+            from echemdbconverters.specloader import load_spec
+
+            return load_spec(device)
+
+        if device == "eclab":
+            from echemdbconverters.eclabloader import ECLabLoader
+
+            return ECLabLoader
+
+        if device == "gamry":
+            from echemdbconverters.gamryloader import GamryLoader
+
+            return GamryLoader
+
+        raise KeyError(f"Device wth name '{device}' is unknown to the loader'.")
+
+    @cached_property
+    @_profiled("header")
+    def header_lines(self):
+        r"""
+        The number of header lines in a CSV excluding the line with the column names.
+
+        EXAMPLES:
+
+        Files for the base loader do not have a header::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.header_lines
+            0
+
+        Implementation in a specific device loader::
+
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 6
+            ...
+            ... Device metadata : some metadata
+            ...
+            ... mode\ttime/s\tEwe/V\t<I>/mA\tcontrol/V
+            ... 2\t0\t0,1\t0\t0
+            ... 2\t1\t1,4\t5\t1
+            ... ''')
+            >>> csv = BaseLoader.create('eclab')(file)
+            >>> csv.header_lines
+            5
+
+        """
+        return self._header_lines or 0
+
+    @property
+    def header(self):
+        r"""
+        The header of the CSV (excluding column names).
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> type(csv.header)
+            <class '_io.StringIO'>
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.header.readlines()
+            []
+
+        """
+        from io import StringIO
+        from itertools import islice
+
+        return StringIO("".join(islice(self._lines(), self.header_lines)))
+
+    @property
+    def metadata(self):  # pylint: disable=abstract-method
+        r"""A dict containing the metadata of the file found in its header.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.metadata
+            Traceback (most recent call last):
+            ...
+            NotImplementedError
+
+        """
+        raise NotImplementedError
+
+    @property
+    def column_header_lines(self):
+        r"""
+        The number of lines containing the descriptive information of the data
+        for each column.
+
+        EXAMPLES:
+
+        A file with a single column header line::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.column_header_lines
+            1
+
+        A file with a two column header lines::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... x,y
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file, column_header_lines=2)
+            >>> csv.column_header_lines
+            2
+
+        """
+        return self._column_header_lines or 1
+
+    @property
+    def column_headers(self):
+        r"""
+        The lines in the file containing the descriptive information of the data
+        for each column.
+
+        EXAMPLES:
+
+        A file with a single column header line::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.column_headers.readlines()
+            ['a,b\n']
+
+        A file with two column header lines, which is sometimes, for example,
+        used for storing units to the values::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''T,v
+            ... K,m/s
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file, column_header_lines=2)
+            >>> csv.column_headers.readlines()
+            ['T,v\n', 'K,m/s\n']
+
+        """
+        from io import StringIO
+        from itertools import islice
+
+        return StringIO(
+            "".join(
+                islice(
+                    self._lines(),
+                    self.header_lines,
+                    self.header_lines + self.column_header_lines,
+                )
+            )
+        )
+
+    @cached_property
+    def column_header_names(self):
+        r"""
+        A list of column header names constructed from the lines
+        containing the column head names.
+
+        EXAMPLES:
+
+        A file with a single column header line::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.column_header_names
+            ['a', 'b']
+
+        For a file containing two or more column header lines,
+        we create a single name for each column including the information
+        from the following lines and separating those with a ``/``.::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''T,v
+            ... K,m/s
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file, column_header_lines=2)
+            >>> csv.column_header_names
+            ['T / K', 'v / m/s']
+
+        """
+
+        headers = [
+            line.strip().split(self.delimiter)
+            for line in self.column_headers.getvalue().splitlines()
+        ]
+
+        # If there's only one line, return it as is
+        if len(headers) == 1:
+            return headers[0]
+
+        # If there are multiple lines, combine them column-wise
+        return [" / ".join(items) for items in zip(*headers)]
+
+    @cached_property
+    def column_header_fields(self):
+        r"""
+        A list of dicts describing each column with its ``name``, ``unit``
+        and ``reference`` as well as the ``original`` column name
+        found in :meth:`column_header_names`.
+
+        The fields are derived from the :meth:`column_header_names` so that
+        the header is not parsed again. The result is cached for the
+        lifetime of the loader.
+
+        EXAMPLES:
+
+        A file with a single column header line does not provide units::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.column_header_fields
+            [{'name': 'a', 'unit': None, 'reference': None, 'original': 'a'}, {'name': 'b', 'unit': None, 'reference': None, 'original': 'b'}]
+
+        For a file with two column header lines the second line contains the units.
+        A reference given as ``<unit> vs. <reference>`` is split off the unit::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''T,E
+            ... K,V vs. RHE
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file, column_header_lines=2)
+            >>> csv.column_header_fields
+            [{'name': 'T', 'unit': 'K', 'reference': None, 'original': 'T / K'}, {'name': 'E', 'unit': 'V', 'reference': 'RHE', 'original': 'E / V vs. RHE'}]
+
+        The original names are the names of the columns in :meth:`df`::
+
+            >>> [field['original'] for field in csv.column_header_fields] == list(csv.df.columns)
+            True
+
+        """
+        # Recover the items of the column header lines from the combined names.
+        return [
+            self._parse_column_header(
+                tuple(name.split(" / ", self.column_header_lines - 1))
+            )
+            for name in self.column_header_names
+        ]
+
+    @classmethod
+    def _parse_column_header(cls, items):
+        r"""
+        Return a dict describing a column from the ``items`` found in the
+        column header lines for that column.
+
+        The first item is the name of the column, the second item its unit
+        (optionally followed by ``vs. <reference>``). Additional items are only
+        retained in the ``original`` name.
+
+        EXAMPLES::
+
+            >>> BaseLoader._parse_column_header(('Vf', 'V vs. Ref.'))
+            {'name': 'Vf', 'unit': 'V', 'reference': 'Ref.', 'original': 'Vf / V vs. Ref.'}
+
+            >>> BaseLoader._parse_column_header(('Temp', 'deg C'))
+            {'name': 'Temp', 'unit': 'deg C', 'reference': None, 'original': 'Temp / deg C'}
+
+            >>> BaseLoader._parse_column_header(('t',))
+            {'name': 't', 'unit': None, 'reference': None, 'original': 't'}
+
+        """
+        import re
+
+        unit = items[1].strip() if len(items) > 1 else ""
+        reference = None
+
+        match = re.match(r"^(?P<unit>.*?)\s*\bvs\.?\s+(?P<reference>.+)$", unit)
+        if match:
+            unit = match.group("unit")
+            reference = match.group("reference").strip()
+
+        return {
+            "name": items[0].strip(),
+            "unit": unit or None,
+            "reference": reference,
+            "original": " / ".join(items),
+        }
+
+    @property
+    def data(self):
+        r"""
+        A file like object with the data of the CSV without header lines.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> type(csv.data)
+            <class '_io.StringIO'>
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.data.readlines()
+            ['0,0\n', '1,1']
+
+        """
+        from io import StringIO, TextIOWrapper
+
+        with TextIOWrapper(self._data_stream(), encoding=self.encoding) as data:
+            return StringIO(data.read())
+
+    @property
+    def df(self):
+        r"""
+        A pandas dataframe of the data in the CSV.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.df
+               a  b
+            0  0  0
+            1  1  1
+
+        """
+        return self.read()
+
+    def read(self, processes=1):
+        r"""
+        Return a pandas dataframe of the data in the CSV.
+
+        When ``processes`` is larger than one, the data section is split at
+        line boundaries into as many parts, which are parsed concurrently in
+        separate worker processes and then joined in order. When ``processes``
+        is ``None``, all available cores are used. The result is identical to
+        :meth:`df` but this is only faster for large files.
+
+        Each column is parsed at once (as with pandas' ``low_memory=False``)
+        so that its type does not depend on how the data is split.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1
+            ... 2,2
+            ... 3,3''')
+            >>> csv = BaseLoader(file)
+            >>> csv.read(processes=2)
+               a  b
+            0  0  0
+            1  1  1
+            2  2  2
+            3  3  3
+
+        TESTS:
+
+        Columns which are numeric in some parts of the file but not in others
+        are parsed as in a serial parse::
+
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1.5
+            ... 2,2
+            ... 3,x''')
+            >>> csv = BaseLoader(file)
+            >>> csv.read(processes=2).equals(csv.df)
+            True
+            >>> csv.read(processes=2)["b"].tolist()
+            ['0', '1.5', '2', 'x']
+
+        The number of processes must be positive::
+
+            >>> csv.read(processes=0)
+            Traceback (most recent call last):
+            ...
+            ValueError: The number of processes must be positive but got 0.
+
+        Gamry files where each data line starts with a delimiter::
+
+            >>> file = StringIO('''EXPLAIN
+            ... CURVE\tTABLE\t3
+            ... \tPt\tT
+            ... \t#\ts
+            ... \t0\t0,06
+            ... \t1\t0,12
+            ... \t2\t0,18
+            ... ''')
+            >>> csv = BaseLoader.create('gamry')(file)
+            >>> csv.read(processes=3).equals(csv.df)
+            True
+
+        Data containing non-ASCII characters beyond the lines from which the
+        encoding of the data is determined::
+
+            >>> from io import BytesIO
+            >>> file = BytesIO('''I/µA,comment
+            ... 0,a
+            ... 1,µ'''.encode('cp1252'))
+            >>> csv = BaseLoader(file)
+            >>> csv.sample_lines = 1
+            >>> csv.read()
+               I/µA comment
+            0     0       a
+            1     1       µ
+            >>> import pandas as pd
+            >>> pd.concat(csv.chunks(chunksize=1)).equals(csv.read())
+            True
+
+        """
+        if self.cache:
+            arrays = self._cached_arrays()
+            if arrays is not None:
+                import numpy as np
+                import pandas as pd
+
+                # Wrap the memory-mapped arrays without copying the data.
+                return pd.DataFrame(
+                    {column: np.asarray(array) for (column, array) in arrays.items()},
+                    copy=False,
+                )
+
+        if processes is not None and processes < 1:
+            raise ValueError(
+                f"The number of processes must be positive but got {processes}."
+            )
+
+        from echemdbconverters.profiling import profile
+
+        options = {**self._read_csv_options, "low_memory": False}
+
+        with profile(self.profiler, "parse") as record:
+            try:
+                df = self._read(processes, options, record)
+            except UnicodeDecodeError:
+                if options["encoding"] == self.encoding:
+                    raise
+
+                # The data contains non-ASCII characters that were not in the sample.
+                df = self._read(
+                    processes, {**options, "encoding": self.encoding}, record
+                )
+
+        if self.cache:
+            from echemdbconverters.cache import write_cache
+
+            write_cache(self.cache, self._cache_key, df)
+
+        return df
+
+    @cached_property
+    def _cache_key(self):
+        r"""
+        The key of the data of this loader in the :mod:`~echemdbconverters.cache`.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> BaseLoader(StringIO("a,b\n0,0"))._cache_key
+            '...'
+
+        """
+        from echemdbconverters.cache import cache_key
+
+        with self._open_binary() as file:
+            return cache_key(file, self._sidecar_options)
+
+    def _cached_arrays(self):
+        r"""
+        Return the columns of the data of this loader stored in the
+        :mod:`~echemdbconverters.cache` or ``None`` if the data is not cached.
+
+        EXAMPLES::
+
+            >>> import os, tempfile
+            >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("a,b\n0,0.5\n")
+            >>> csv = BaseLoader(filename, cache=os.path.join(os.path.dirname(filename), "cache"))
+            >>> csv._cached_arrays() is None
+            True
+            >>> _ = csv.df
+            >>> csv._cached_arrays()
+            {'a': memmap([0]), 'b': memmap([0.5])}
+
+        """
+        from echemdbconverters.cache import read_cache
+        from echemdbconverters.profiling import profile
+
+        with profile(self.profiler, "cache"):
+            return read_cache(self.cache, self._cache_key)
+
+    def _read(self, processes, options, record):
+        r"""
+        Return a pandas dataframe of the data in the CSV parsed
+        with ``processes`` and the ``options`` passed on to pandas.
+
+        The number of bytes parsed is written to the profiler ``record``.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0''')
+            >>> csv = BaseLoader(file)
+            >>> record = {}
+            >>> csv._read(1, csv._read_csv_options, record)
+               a  b
+            0  0  0
+            >>> record
+            {'bytes': 3}
+
+        """
+        if processes == 1:
+            with self._progress_stream(self._data_stream(), "parse") as data:
+                start = data.tell()
+                df = _read_csv(data, options)
+                record["bytes"] = data.tell() - start
+                self._report("parse", bytes=data.tell(), rows=len(df))
+                return df
+
+        import os
+
+        parts, ranges = self._parts(os.cpu_count() if processes is None else processes)
+        record["bytes"] = sum(stop - start for (start, stop) in ranges)
+
+        chunks = []
+        for (_, stop), chunk in zip(ranges, _read_csv_parallel(parts, options)):
+            chunks.append(chunk)
+            self._report("parse", bytes=stop, rows=sum(len(chunk) for chunk in chunks))
+
+        # When a column is parsed as strings in some parts of the file,
+        # pandas would have parsed all its values as strings in a serial parse.
+        # We parse such columns again as strings in all parts.
+        mixed = [
+            name
+            for name in chunks[0].columns
+            if len({chunk[name].dtype.kind for chunk in chunks}) > 1
+            and any(chunk[name].dtype.kind == "O" for chunk in chunks)
+        ]
+        if mixed:
+            chunks = list(
+                _read_csv_parallel(
+                    parts, {**options, "dtype": {name: str for name in mixed}}
+                )
+            )
+
+        import pandas as pd
+
+        return pd.concat(chunks, ignore_index=True)
+
+    def _parts(self, processes):
+        r"""
+        Return the parts of the data to be parsed by ``processes`` worker
+        processes and the ranges of bytes of the (decompressed) file they
+        cover, see :func:`_read_csv`.
+
+        Each part of a file is a range ``(path, start, stop)`` so that the
+        worker reads it from the file itself. Decompressed data and the data
+        of file objects cannot be read from an offset, so their parts are
+        the bytes of the data.
+
+        EXAMPLES::
+
+            >>> import os, tempfile
+            >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("a,b\n0,0\n1,1\n")
+            >>> parts, ranges = BaseLoader(filename)._parts(2)
+            >>> parts == [(filename, 4, 8), (filename, 8, 12)]
+            True
+            >>> ranges
+            [(4, 8), (8, 12)]
+
+            >>> from io import StringIO
+            >>> BaseLoader(StringIO("a,b\n0,0\n1,1\n"))._parts(2)
+            ([b'0,0\n', b'1,1\n'], [(4, 8), (8, 12)])
+
+        TESTS:
+
+        Files without data::
+
+            >>> BaseLoader(StringIO("a,b\n"))._parts(2)
+            ([b''], [(4, 4)])
+
+        """
+        import os
+
+        from echemdbconverters.compression import compression
+
+        if self._file is None and not compression(self._path):
+            with self._data_stream() as data:
+                start = data.tell()
+            stop = self._data_end
+            if stop is None:
+                stop = os.path.getsize(self._path)
+
+            with open(self._path, "rb") as file:
+                ranges = self._file_ranges(file, start, stop, processes) or [
+                    (start, stop)
+                ]
+
+            return [(self._path, start, stop) for (start, stop) in ranges], ranges
+
+        with self._data_stream() as data:
+            offset = data.tell()
+            data = data.read()
+
+        ranges = self._line_ranges(data, processes) or [(0, len(data))]
+
+        return [data[start:stop] for (start, stop) in ranges], [
+            (offset + start, offset + stop) for (start, stop) in ranges
+        ]
+
+    def chunks(self, chunksize=100000, columns=None):
+        r"""
+        Return an iterator over dataframes of at most ``chunksize`` rows of
+        the data in the CSV.
+
+        The data is parsed while it is being read so that
+        only a single chunk is held in memory. The progress is
+        reported after each chunk. When ``columns`` are given, only these
+        columns are parsed.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1
+            ... 2,2''')
+            >>> csv = BaseLoader(file)
+            >>> for chunk in csv.chunks(chunksize=2):
+            ...     print(chunk)
+               a  b
+            0  0  0
+            1  1  1
+               a  b
+            2  2  2
+
+            >>> for chunk in csv.chunks(chunksize=2, columns=["b"]):
+            ...     print(chunk)
+               b
+            0  0
+            1  1
+               b
+            2  2
+
+        """
+        import pandas as pd
+
+        options = self._read_csv_options
+        if columns is not None:
+            options = {**options, "usecols": columns}
+        rows = 0
+
+        while True:
+            try:
+                with self._data_stream() as data:
+                    for chunk in pd.read_csv(
+                        data, chunksize=chunksize, skiprows=rows, **options
+                    ):
+                        chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+                        rows += len(chunk)
+                        self._report("parse", bytes=data.tell(), rows=rows)
+                        yield chunk
+                return
+            except UnicodeDecodeError:
+                if options["encoding"] == self.encoding:
+                    raise
+
+                # The data contains non-ASCII characters that were not in the
+                # sample. We continue with the remaining rows.
+                options = {**options, "encoding": self.encoding}
+
+    def aiter_chunks(self, chunksize=100000, executor=None):
+        r"""
+        Return an asynchronous iterator over dataframes of at most
+        ``chunksize`` rows of the data in the CSV, which are read and parsed in
+        ``executor`` without blocking the event loop, see
+        :func:`echemdbconverters.asynchronous.aiter_chunks`.
+
+        EXAMPLES::
+
+            >>> import asyncio
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1
+            ... 2,2''')
+            >>> csv = BaseLoader(file)
+            >>> async def show():
+            ...     async for chunk in csv.aiter_chunks(chunksize=2):
+            ...         print(chunk)
+            >>> asyncio.run(show())
+               a  b
+            0  0  0
+            1  1  1
+               a  b
+            2  2  2
+
+        """
+        from echemdbconverters.asynchronous import aiter_chunks
+
+        return aiter_chunks(self, chunksize=chunksize, executor=executor)
+
+    @cached_property
+    @_profiled("index")
+    def line_index(self):
+        r"""
+        An index of the data lines of the file.
+
+        The index records the number of ``rows`` of data and the byte
+        ``offsets`` of every :attr:`line_index_interval`-th data line
+        in the (decompressed) file. It is created by a single pass over
+        the file, which only searches for line breaks without parsing
+        the data. Blank lines are not rows since they are skipped by
+        pandas.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1
+            ... 2,2''')
+            >>> csv = BaseLoader(file)
+            >>> csv.line_index_interval = 2
+            >>> csv.line_index
+            {'interval': 2, 'offsets': [4, 12], 'rows': 3}
+
+        TESTS:
+
+        Files ending with a line break and files without data::
+
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n1,1\n"))
+            >>> csv.line_index_interval = 2
+            >>> csv.line_index
+            {'interval': 2, 'offsets': [4], 'rows': 2}
+
+            >>> BaseLoader(StringIO("a,b\n")).line_index
+            {'interval': 1000, 'offsets': [], 'rows': 0}
+
+        Blank lines in the data::
+
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n\n1,1\n\n\n2,2\n\n"))
+            >>> csv.line_index_interval = 2
+            >>> csv.line_index
+            {'interval': 2, 'offsets': [4, 15], 'rows': 3}
+
+        """
+        import numpy as np
+
+        interval = self.line_index_interval
+
+        with self._data_stream() as data:
+            position = data.tell()
+            offsets = []
+            rows = 0
+
+            while block := data.read(2**20):
+                # Complete the last line of the block.
+                block += data.readline()
+
+                starts, _ = _data_lines(np.frombuffer(block, dtype=np.uint8))
+                offsets.extend(
+                    (position + starts[-rows % interval :: interval]).tolist()
+                )
+                rows += len(starts)
+                position += len(block)
+
+        return self._update_sidecar(
+            "line_index",
+            {
+                "interval": interval,
+                "offsets": offsets,
+                "rows": rows,
+            },
+        )
+
+    def select(self, rows=None, where=None):
+        r"""
+        Return a pandas dataframe of the ``rows`` ``(start, stop)`` of the data
+        in the CSV whose values in the column ``where[0]`` are between
+        ``where[1]`` and ``where[2]`` (inclusive.)
+
+        Only the selected part of the file is parsed. The first row of a
+        range of ``rows`` is found with the :meth:`line_index`. The range of
+        values is found with a binary search over the lines recorded in the
+        :meth:`line_index`, assuming that the values in the column are
+        non-decreasing, such as the time of a measurement. When the values in
+        the recorded lines or in the selected range turn out not to be
+        non-decreasing, all rows of the data are parsed in :meth:`chunks`
+        and filtered.
+
+        The index of the dataframe are the numbers of the selected rows.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''t,E
+            ... 0,0.1
+            ... 1,0.2
+            ... 2,0.3
+            ... 3,0.2
+            ... 4,0.1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.line_index_interval = 2
+            >>> csv.select(rows=(1, 3))
+               t    E
+            1  1  0.2
+            2  2  0.3
+
+            >>> csv.select(where=("t", 1.5, 3))
+               t    E
+            2  2  0.3
+            3  3  0.2
+
+        Columns which are not monotonic are filtered entirely::
+
+            >>> csv.select(where=("E", 0.15, 0.25))
+               t    E
+            1  1  0.2
+            3  3  0.2
+
+        Both selections can be combined::
+
+            >>> csv.select(rows=(2, 5), where=("E", 0.15, 0.25))
+               t    E
+            3  3  0.2
+
+        TESTS:
+
+        Ranges beyond the data::
+
+            >>> csv.select(rows=(4, 10))
+               t    E
+            4  4  0.1
+            >>> csv.select(rows=(7, 10))
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+            >>> csv.select(where=("t", 7, 10))
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+
+        Selection agrees with filtering the entire data::
+
+            >>> import os
+            >>> from echemdbconverters.eclabloader import ECLabLoader
+            >>> from echemdbconverters.test.cli import TemporaryData
+            >>> with TemporaryData("eclab_ca.mpt") as directory:
+            ...     csv = ECLabLoader(os.path.join(directory, "eclab_ca.mpt"))
+            ...     csv.line_index_interval = 3
+            ...     df = csv.df
+            ...     selected = csv.select(where=("time/s", 1, 2)), csv.select(rows=(10, 20))
+            >>> selected[0].equals(df[df["time/s"].between(1, 2)])
+            True
+            >>> selected[1].equals(df[10:20])
+            True
+
+        """
+        from echemdbconverters.profiling import profile
+
+        options = self._read_csv_options
+
+        with profile(self.profiler, "parse"):
+            try:
+                df = self._select(rows, where, options)
+            except UnicodeDecodeError:
+                if options["encoding"] == self.encoding:
+                    raise
+
+                # The data contains non-ASCII characters that were not in the sample.
+                df = self._select(rows, where, {**options, "encoding": self.encoding})
+
+        self._report("parse", rows=len(df))
+
+        return df
+
+    def _select(self, rows, where, options):
+        r"""
+        Return the dataframe of :meth:`select` parsed with the ``options``
+        passed on to pandas.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n1,1"))
+            >>> csv._select((1, 2), None, csv._read_csv_options)
+               a  b
+            1  1  1
+
+        """
+        if rows is None:
+            if where is None:
+                import pandas as pd
+
+                df = self._read(1, options, {})
+                df.index = pd.RangeIndex(0, len(df))
+                return df
+
+            return self._select_where(*where, options)
+
+        df = self._select_rows(*rows, options)
+
+        if where is not None:
+            column, lo, hi = where
+            df = df[df[column].between(lo, hi)]
+
+        return df
+
+    def _select_rows(self, start, stop, options):
+        r"""
+        Return a dataframe of the rows ``start`` to ``stop`` parsed with
+        the ``options`` passed on to pandas.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n1,1\n2,2"))
+            >>> csv.line_index_interval = 2
+            >>> csv._select_rows(1, 3, csv._read_csv_options)
+               a  b
+            1  1  1
+            2  2  2
+
+        TESTS:
+
+        Blank lines in the data are not rows::
+
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n\n1,1\n\n2,2\n3,3"))
+            >>> csv.line_index_interval = 3
+            >>> csv._select_rows(1, 3, csv._read_csv_options)
+               a  b
+            1  1  1
+            2  2  2
+            >>> csv._select_rows(3, 4, csv._read_csv_options)
+               a  b
+            3  3  3
+
+        """
+        import pandas as pd
+
+        index = self.line_index
+        start = max(start, 0)
+        stop = min(stop, index["rows"])
+
+        if start >= stop:
+            return pd.DataFrame(columns=options["names"])
+
+        block = start // index["interval"]
+
+        with self._open_binary() as data:
+            from echemdbconverters.compression import seek
+
+            seek(data, index["offsets"][block])
+            # Rows are counted with nrows since skiprows counts blank lines.
+            skip = start - block * index["interval"]
+            df = pd.read_csv(
+                data,
+                nrows=stop - start + skip,
+                **options,
+            ).iloc[skip:]
+
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    def _select_where(self, column, lo, hi, options):
+        r"""
+        Return a dataframe of the rows whose values in ``column`` are between
+        ``lo`` and ``hi`` parsed with the ``options`` passed on to pandas.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n1,1\n2,2"))
+            >>> csv.line_index_interval = 1
+            >>> csv._select_where("a", 1, 1, csv._read_csv_options)
+               a  b
+            1  1  1
+
+        """
+        import numpy as np
+        import pandas as pd
+
+        interval = self.line_index["interval"]
+        values = self._line_index_sample(options)[column].to_numpy()
+
+        # The rows from the last recorded line with a value below lo
+        # to the first recorded line with a value above hi.
+        start = max(int(np.searchsorted(values, lo, side="left")) - 1, 0)
+        stop = int(np.searchsorted(values, hi, side="right"))
+
+        df = self._select_rows(start * interval, stop * interval, options)
+
+        if not (
+            pd.Series(values).is_monotonic_increasing
+            and df[column].is_monotonic_increasing
+        ):
+            logger.debug(
+                f"Values of {column} are not monotonic. Filtering all rows of the data."
+            )
+            df = pd.concat(
+                chunk[chunk[column].between(lo, hi)] for chunk in self.chunks()
+            )
+
+        return df[df[column].between(lo, hi)]
+
+    def _line_index_sample(self, options):
+        r"""
+        Return a dataframe of the lines recorded in the :meth:`line_index`
+        parsed with the ``options`` passed on to pandas.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0\n1,1\n2,2"))
+            >>> csv.line_index_interval = 2
+            >>> csv._line_index_sample(csv._read_csv_options)
+               a  b
+            0  0  0
+            1  2  2
+
+        """
+        from echemdbconverters.compression import seek
+
+        lines = []
+
+        with self._open_binary() as data:
+            for offset in self.line_index["offsets"]:
+                lines.append(seek(data, offset).readline().rstrip(b"\r\n"))
+
+        return _read_csv(b"\n".join(lines), options)
+
+    def poll(self):
+        r"""
+        Return a pandas dataframe of the rows which have been appended to the
+        file since the last call to this method.
+
+        This is meant to follow files which are still being written, e.g.,
+        while a measurement is running. Only the complete lines appended to
+        the file are parsed, a partially written last line is parsed by a
+        later call once it has been completed. The index of the dataframe are
+        the numbers of the rows in the data.
+
+        EXAMPLES::
+
+            >>> import os, tempfile
+            >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t,E\n0,0.1\n1,0.")
+            >>> csv = BaseLoader(filename)
+            >>> csv.poll()
+               t    E
+            0  0  0.1
+
+            >>> with open(filename, "a") as file:
+            ...     _ = file.write("2\n2,0.3\n")
+            >>> csv.poll()
+               t    E
+            1  1  0.2
+            2  2  0.3
+
+            >>> csv.poll()
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+
+        TESTS:
+
+        Files without any complete data line yet::
+
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t,E\n0,0")
+            >>> csv = BaseLoader(filename)
+            >>> csv.poll()
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+
+        The decimal separator is only determined once data has been written::
+
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t;E\n")
+            >>> csv = BaseLoader(filename)
+            >>> csv.poll()
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+            >>> with open(filename, "a") as file:
+            ...     _ = file.write("0;0,1\n")
+            >>> csv.poll()
+               t    E
+            0  0  0.1
+
+        Files which have been truncated are parsed again from the start::
+
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t;E\n")
+            >>> csv.poll()
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+
+        Files which are not given by a path cannot be followed::
+
+            >>> from io import StringIO
+            >>> BaseLoader(StringIO("a,b\n0,0")).poll()
+            Traceback (most recent call last):
+            ...
+            ValueError: Only files given by a path can be followed.
+
+        Compressed files cannot be followed::
+
+            >>> import gzip
+            >>> with gzip.open(filename + ".gz", "wb") as file:
+            ...     _ = file.write(b"t,E\n0,0.1\n")
+            >>> BaseLoader(filename + ".gz").poll()
+            Traceback (most recent call last):
+            ...
+            ValueError: Compressed files cannot be followed. Decompress ... first.
+
+        Lines following the end of the data are not parsed once they have
+        been written::
+
+            >>> from echemdbconverters.specloader import compile_spec
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t,E\n0,0.1\n")
+            >>> csv = compile_spec({"end": "^#"})(filename)
+            >>> csv.poll()
+               t    E
+            0  0  0.1
+            >>> with open(filename, "a") as file:
+            ...     _ = file.write("1,0.2\n# end\nduration,2\n")
+            >>> csv.poll()
+               t    E
+            1  1  0.2
+            >>> csv.poll()
+            Empty DataFrame
+            Columns: [t, E]
+            Index: []
+
+        """
+        import pandas as pd
+
+        from echemdbconverters.compression import compression
+
+        if self._path is None:
+            raise ValueError("Only files given by a path can be followed.")
+
+        if compression(self._path) is not None:
+            raise ValueError(
+                f"Compressed files cannot be followed. Decompress {self._path} first."
+            )
+
+        if self._data_end is None:
+            # The end of the data might have been written since it was last searched.
+            self.__dict__.pop("_data_end", None)
+
+        if self._tail is None:
+            with self._data_stream() as data:
+                self._tail = {"offset": data.tell(), "rows": 0}
+
+        with self._open_binary() as file:
+            file.seek(0, 2)
+            if file.tell() < self._tail["offset"]:
+                logger.warning(
+                    f"{self._path} has been truncated. Parsing the file from the start."
+                )
+                self._tail = None
+                self.__dict__.pop("_data_end", None)
+                return self.poll()
+
+            file.seek(self._tail["offset"])
+
+            if self._data_end is None:
+                data = file.read()
+            else:
+                data = file.read(max(self._data_end - self._tail["offset"], 0))
+
+        # Ignore a partially written last line.
+        data = data[: data.rfind(b"\n") + 1]
+
+        if not data.strip():
+            return pd.DataFrame(columns=self.column_header_names)
+
+        if "_data_sample" in self.__dict__ and not self._data_sample:
+            # The sample was taken before any data had been written.
+            self.invalidate("_data_sample", "_data_encoding", "decimal")
+
+        options = self._read_csv_options
+
+        try:
+            df = _read_csv(data, options)
+        except UnicodeDecodeError:
+            df = _read_csv(data, {**options, "encoding": self.encoding})
+
+        rows = self._tail["rows"]
+        df.index = pd.RangeIndex(rows, rows + len(df))
+
+        self._tail = {
+            "offset": self._tail["offset"] + len(data),
+            "rows": rows + len(df),
+        }
+
+        return df
+
+    def follow(self, interval=1, timeout=None):
+        r"""
+        Return an iterator over pandas dataframes of the rows appended to
+        the file while it is being written, see :meth:`poll`.
+
+        The file is checked for new rows every ``interval`` seconds. The
+        iteration ends when no rows have been appended for ``timeout`` seconds.
+
+        EXAMPLES::
+
+            >>> import os, tempfile
+            >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+            >>> with open(filename, "w") as file:
+            ...     _ = file.write("t,E\n0,0.1\n1,0.2\n")
+            >>> csv = BaseLoader(filename)
+            >>> for df in csv.follow(interval=0.01, timeout=0.05):
+            ...     print(df)
+               t    E
+            0  0  0.1
+            1  1  0.2
+
+        """
+        import time
+
+        last = time.monotonic()
+
+        while True:
+            df = self.poll()
+
+            if len(df):
+                last = time.monotonic()
+                yield df
+            elif timeout is not None and time.monotonic() - last >= timeout:
+                return
+
+            time.sleep(interval)
+
+    @_profiled("validate")
+    def validate(self, blocksize=2**24):  # pylint: disable=too-many-locals
+        r"""
+        Return a summary of the problems found in the data of the CSV.
+
+        The data is checked for rows whose number of fields does not match
+        the column header, non-numeric cells in numeric columns, missing
+        values, and infinite values (e.g., values too large for a float).
+        The data is checked in blocks of about ``blocksize`` bytes, using
+        vectorized operations on each block, so that only a single block is
+        held in memory. Delimiters enclosed in quotes are not supported.
+
+        The summary contains the number of ``rows`` and, for each kind of
+        problem found, the affected rows (numbered as the rows of :meth:`df`)
+        in a compact form.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''t,E,j
+            ... 0,0,0
+            ... 1,1
+            ... 2,2,2,2
+            ... 3,x,3
+            ... 4,,4
+            ... 5,1e999,5
+            ... 6,6,6
+            ... 7,7,7''')
+            >>> csv = BaseLoader(file)
+            >>> csv.validate()
+            {'rows': 8, 'fields': '1-2', 'non-numeric': {'E': '3'}, 'missing': {'E': '4'}, 'infinite': {'E': '5'}}
+
+        Data without problems::
+
+            >>> file = StringIO(r'''t,E
+            ... 0,0
+            ... 1,1''')
+            >>> BaseLoader(file).validate()
+            {'rows': 2}
+
+        TESTS:
+
+        Rows are numbered across blocks and blank lines are ignored as in :meth:`df`::
+
+            >>> file = StringIO("t,E\n" + "0,0\n" * 10 + "\n" + "1,x\n" + "2,2,2\n" * 3)
+            >>> BaseLoader(file, delimiters=[","]).validate(blocksize=8)
+            {'rows': 14, 'fields': '11-13', 'non-numeric': {'E': '10'}}
+
+        Columns which do not contain numbers are not checked for non-numeric cells::
+
+            >>> file = StringIO(r'''t,flags
+            ... 0,a
+            ... 1,b''')
+            >>> BaseLoader(file).validate()
+            {'rows': 2}
+
+        Files with a decimal comma::
+
+            >>> file = StringIO(r'''t;E
+            ... 0,1;0,5
+            ... 1,1;x
+            ... 2,1;0,7''')
+            >>> BaseLoader(file).validate()
+            {'rows': 3, 'non-numeric': {'E': '1'}}
+
+        """
+        import numpy as np
+
+        options = self._read_csv_options
+        delimiter = options["delimiter"].encode(options["encoding"])
+
+        # The data lines should contain as many delimiters as the column header.
+        expected = (
+            self.column_headers.getvalue().splitlines()[0].count(options["delimiter"])
+        )
+
+        rows = 0
+        problems = {"fields": [], "non-numeric": {}, "missing": {}, "infinite": {}}
+        numeric = {}
+
+        with self._data_stream() as data:
+            while True:
+                block = data.read(blocksize)
+                if not block:
+                    break
+                # Complete the last line of the block.
+                block += data.readline()
+
+                buffer = np.frombuffer(block, dtype=np.uint8)
+                starts, ends = _data_lines(buffer)
+
+                delimiters = np.flatnonzero(buffer == delimiter[0])
+                bad = (
+                    np.searchsorted(delimiters, ends)
+                    - np.searchsorted(delimiters, starts)
+                    != expected
+                )
+
+                numbers = rows + np.arange(len(starts))
+                rows += len(starts)
+
+                problems["fields"].append(numbers[bad])
+
+                if bad.any():
+                    # Remove the malformed lines before parsing the block.
+                    marks = np.zeros(len(buffer) + 1, dtype=np.int8)
+                    marks[starts[bad]] += 1
+                    marks[np.minimum(ends[bad] + 1, len(buffer))] -= 1
+                    block = buffer[np.cumsum(marks[:-1]) == 0].tobytes()
+                    numbers = numbers[~bad]
+
+                if not numbers.size:
+                    continue
+
+                try:
+                    df = _read_csv(block, options)
+                except UnicodeDecodeError:
+                    options = {**options, "encoding": self.encoding}
+                    df = _read_csv(block, options)
+
+                self._validate_values(df, numbers, numeric, problems)
+
+        summary = {"rows": rows}
+
+        fields = _format_rows(np.concatenate(problems.pop("fields") or [[]]))
+        if fields:
+            summary["fields"] = fields
+
+        for problem, columns in problems.items():
+            columns = {
+                column: _format_rows(np.concatenate(numbers))
+                for (column, numbers) in columns.items()
+            }
+            columns = {column: rows for (column, rows) in columns.items() if rows}
+            if columns:
+                summary[problem] = columns
+
+        return summary
+
+    def _validate_values(self, df, numbers, numeric, problems):
+        r"""
+        Record the ``numbers`` of the rows of ``df`` with non-numeric,
+        missing, or infinite values in ``problems``.
+
+        Whether a column is ``numeric`` is decided in the first block in which
+        it occurs; a column is numeric if at least half of its cells are numbers.
+
+        EXAMPLES::
+
+            >>> import numpy as np
+            >>> import pandas as pd
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("a,b\n0,0"))
+            >>> problems = {"non-numeric": {}, "missing": {}, "infinite": {}}
+            >>> csv._validate_values(pd.DataFrame({"a": ["1", "x", None]}), np.array([10, 11, 12]), {}, problems)
+            >>> problems
+            {'non-numeric': {'a': [array([11])]}, 'missing': {'a': [array([12])]}, 'infinite': {'a': [array([], dtype=int64)]}}
+
+        """
+        import numpy as np
+        import pandas as pd
+
+        if len(df) != len(numbers):
+            # The rows could not be matched to the lines, e.g., because of quoted newlines.
+            numbers = numbers[0] + np.arange(len(df))
+
+        for column in df.columns:
+            values = df[column]
+            invalid = np.zeros(len(values), dtype=bool)
+
+            if pd.api.types.is_numeric_dtype(values):
+                numeric.setdefault(column, True)
+                values = values.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                strings = values.astype("string")
+                if self.decimal != ".":
+                    strings = strings.str.replace(self.decimal, ".", regex=False)
+                converted = pd.to_numeric(strings, errors="coerce").to_numpy(
+                    dtype=float, na_value=np.nan
+                )
+                invalid = values.notna().to_numpy() & np.isnan(converted)
+
+                if invalid.any():
+                    # Numbers too large for a float are not converted by pandas.
+                    overflow = np.flatnonzero(invalid)[
+                        strings[invalid]
+                        .str.fullmatch(r"\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*")
+                        .to_numpy(dtype=bool, na_value=False)
+                    ]
+                    converted[overflow] = np.inf
+                    invalid[overflow] = False
+
+                if column not in numeric:
+                    numeric[column] = invalid.mean() <= 0.5
+
+                values = converted
+
+            if not numeric[column]:
+                continue
+
+            for problem, rows in [
+                ("non-numeric", invalid),
+                ("missing", np.isnan(values) & ~invalid),
+                ("infinite", np.isinf(values)),
+            ]:
+                problems[problem].setdefault(column, []).append(numbers[rows])
+
+    def arrays(self, columns=None):
+        r"""
+        Return a dict mapping the names of the numeric ``columns`` (all numeric
+        columns if ``None``) to contiguous NumPy arrays of their data.
+
+        The data is parsed once with :meth:`df` and the arrays are views of
+        the parsed data, i.e., the data is not copied again.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''t,E,flag
+            ... 0,0.1,a
+            ... 1,0.2,b''')
+            >>> csv = BaseLoader(file)
+            >>> arrays = csv.arrays()
+            >>> arrays
+            {'t': array([0, 1]), 'E': array([0.1, 0.2])}
+            >>> arrays["E"].flags["C_CONTIGUOUS"]
+            True
+            >>> arrays["E"].flags["OWNDATA"]
+            False
+
+        """
+        if self.cache:
+            arrays = self._cached_arrays()
+            if arrays is not None:
+                return {column: arrays[column] for column in columns or arrays}
+
+        df = self.df
+
+        return {
+            column: df[column].to_numpy()
+            for column in self._numeric_columns(df, columns)
+        }
+
+    def structured_array(self, columns=None, filename=None, chunksize=100000):
+        r"""
+        Return a NumPy structured array with the data of the numeric ``columns``
+        (all numeric columns if ``None``).
+
+        When a ``filename`` is given, the data is written to this ``.npy`` file
+        in chunks of ``chunksize`` rows without holding the entire data in
+        memory, and a memory-mapped array of the file is returned. The file
+        can be loaded later with :func:`numpy.load`.
+
+        The type of each column is determined from the first chunk of the data.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''t,E,flag
+            ... 0,0.1,a
+            ... 1,0.2,b''')
+            >>> csv = BaseLoader(file)
+            >>> csv.structured_array()
+            array([(0, 0.1), (1, 0.2)], dtype=[('t', '<i8'), ('E', '<f8')])
+
+        The data can be written to a memory-mapped file::
+
+            >>> import os, tempfile
+            >>> filename = os.path.join(tempfile.mkdtemp(), "data.npy")
+            >>> array = csv.structured_array(filename=filename, chunksize=1)
+            >>> type(array)
+            <class 'numpy.memmap'>
+            >>> array["E"]
+            memmap([0.1, 0.2])
+
+            >>> import numpy as np
+            >>> np.load(filename)
+            array([(0, 0.1), (1, 0.2)], dtype=[('t', '<i8'), ('E', '<f8')])
+
+        TESTS:
+
+        Columns whose type changes after the first chunk::
+
+            >>> file = StringIO(r'''t,E
+            ... 0,0
+            ... 1,0.5''')
+            >>> BaseLoader(file).structured_array(filename=filename, chunksize=1)
+            Traceback (most recent call last):
+            ...
+            ValueError: Column E contains values that are not of type int64 found in the first rows.
+
+        """
+        import numpy as np
+
+        if filename is None:
+            df = self.df
+            columns = self._numeric_columns(df, columns)
+
+            array = np.empty(
+                len(df), dtype=[(column, df[column].dtype) for column in columns]
+            )
+            for column in columns:
+                array[column] = df[column].to_numpy()
+
+            return array
+
+        dtype = None
+        rows = 0
+
+        with open(filename, "wb") as file:
+            for chunk in self.chunks(chunksize=chunksize):
+                if dtype is None:
+                    columns = self._numeric_columns(chunk, columns)
+                    dtype = np.dtype(
+                        [(column, chunk[column].dtype) for column in columns]
+                    )
+                    # Reserve space for the header of the largest possible array.
+                    header = len(_npy_header(dtype, np.iinfo(np.int64).max))
+                    file.write(b"\0" * header)
+
+                array = np.empty(len(chunk), dtype=dtype)
+                for column in columns:
+                    values = chunk[column].to_numpy()
+                    array[column] = values
+                    if not np.array_equal(array[column], values, equal_nan=True):
+                        raise ValueError(
+                            f"Column {column} contains values that are not of type {dtype[column]} found in the first rows."
+                        )
+
+                file.write(array.tobytes())
+                rows += len(chunk)
+
+            if dtype is None:
+                raise ValueError("Cannot create a structured array without data.")
+
+            file.seek(0)
+            file.write(_npy_header(dtype, rows, header))
+
+        return np.load(filename, mmap_mode="r+")
+
+    @classmethod
+    def _numeric_columns(cls, df, columns=None):
+        r"""
+        Return the names of the numeric ``columns`` of ``df`` (all numeric
+        columns if ``None``).
+
+        EXAMPLES::
+
+            >>> import pandas as pd
+            >>> df = pd.DataFrame({"t": [0], "E": [0.1], "flag": ["a"]})
+            >>> BaseLoader._numeric_columns(df)
+            ['t', 'E']
+            >>> BaseLoader._numeric_columns(df, ["E", "flag"])
+            Traceback (most recent call last):
+            ...
+            ValueError: Column flag is not numeric.
+
+        """
+        import pandas as pd
+
+        if columns is None:
+            return [
+                column
+                for column in df.columns
+                if pd.api.types.is_numeric_dtype(df[column])
+            ]
+
+        for column in columns:
+            if not pd.api.types.is_numeric_dtype(df[column]):
+                raise ValueError(f"Column {column} is not numeric.")
+
+        return list(columns)
+
+    def decimate(self, every=None, buckets=None, columns=None, chunksize=100000):
+        r"""
+        Return a pandas dataframe of a representative subset of the rows of
+        the data in the CSV.
+
+        With ``every``, every ``every``-th row is kept. With ``buckets``, the
+        rows are split into at most ``buckets`` buckets of consecutive rows and
+        the rows with the minimum and the maximum value of each of the numeric
+        ``columns`` (all numeric columns by default) in each bucket are kept,
+        so that the extrema of the data are preserved in a plot. Since the
+        number of rows is not known before parsing, the buckets all have the
+        smallest power of two as their size for which there are at most
+        ``buckets`` buckets, i.e., there are more than ``buckets / 2`` buckets.
+
+        The data is parsed once in :meth:`chunks` of ``chunksize`` rows so
+        that only a single chunk and the rows kept are held in memory.
+        The index of the dataframe are the numbers of the rows kept.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''t,E
+            ... 0,0.1
+            ... 1,0.5
+            ... 2,0.3
+            ... 3,0.2
+            ... 4,0.4
+            ... 5,0.1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.decimate(every=2)
+               t    E
+            0  0  0.1
+            2  2  0.3
+            4  4  0.4
+
+            >>> csv.decimate(buckets=2, columns=["E"])
+               t    E
+            0  0  0.1
+            1  1  0.5
+            4  4  0.4
+            5  5  0.1
+
+        TESTS:
+
+        Buckets which are split across chunks::
+
+            >>> csv.decimate(buckets=2, columns=["E"], chunksize=2).equals(csv.decimate(buckets=2, columns=["E"]))
+            True
+            >>> csv.decimate(buckets=3, columns=["E"], chunksize=1)
+               t    E
+            0  0  0.1
+            1  1  0.5
+            2  2  0.3
+            3  3  0.2
+            4  4  0.4
+            5  5  0.1
+
+        The data is only read once::
+
+            >>> from unittest.mock import patch
+            >>> with patch.object(BaseLoader, "_data_stream", autospec=True, side_effect=BaseLoader._data_stream) as stream:
+            ...     _ = BaseLoader(StringIO("a,b\n0,0\n1,1")).decimate(buckets=1)
+            >>> stream.call_count
+            1
+
+        Files without data::
+
+            >>> BaseLoader(StringIO("a,b\n")).decimate(every=2)
+            Empty DataFrame
+            Columns: [a, b]
+            Index: []
+
+        Exactly one method of decimation must be selected::
+
+            >>> csv.decimate()
+            Traceback (most recent call last):
+            ...
+            ValueError: Either every or buckets must be provided.
+
+        """
+        import pandas as pd
+
+        from echemdbconverters.profiling import profile
+
+        if (every is None) == (buckets is None):
+            raise ValueError("Either every or buckets must be provided.")
+
+        with profile(self.profiler, "parse"):
+            if every is not None:
+                frames = [
+                    chunk[chunk.index % every == 0]
+                    for chunk in self.chunks(chunksize=chunksize)
+                ]
+            else:
+                size = 1
+                rows = 0
+                kept = None
+
+                for chunk in self.chunks(chunksize=chunksize):
+                    rows += len(chunk)
+                    while -(-rows // size) > buckets:
+                        size *= 2
+
+                    # The extrema of a bucket are among the extrema of its
+                    # parts, so buckets are merged by determining the extrema
+                    # of the rows kept so far again.
+                    kept = self._extrema(
+                        chunk if kept is None else pd.concat([kept, chunk]),
+                        size,
+                        columns,
+                    )
+
+                frames = [] if kept is None else [kept]
+
+        if not frames:
+            return pd.DataFrame(columns=self.column_header_names)
+
+        return pd.concat(frames)
+
+    def _cycle_column(self):
+        r"""
+        Return the name of the column containing the cycle numbers.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = BaseLoader(StringIO("t,cycle\n0,1"))
+            >>> csv._cycle_column()
+            Traceback (most recent call last):
+            ...
+            ValueError: No column containing cycle numbers has been set with cycle_column.
+
+            >>> csv.cycle_column = "cycles"
+            >>> csv._cycle_column()
+            Traceback (most recent call last):
+            ...
+            KeyError: "The data has no column 'cycles' containing cycle numbers."
+
+        """
+        if self.cycle_column is None:
+            raise ValueError(
+                "No column containing cycle numbers has been set with cycle_column."
+            )
+
+        if self.cycle_column not in self.column_header_names:
+            raise KeyError(
+                f"The data has no column '{self.cycle_column}' containing cycle numbers."
+            )
+
+        return self.cycle_column
+
+    def cycles(self, chunksize=100000):
+        r"""
+        Return an iterator over the cycle numbers and pandas dataframes of the
+        rows of each cycle of the data in the CSV.
+
+        The cycle numbers are read from the :attr:`cycle_column`. The data is
+        parsed in :meth:`chunks` in a single pass so that only the rows of a
+        single cycle are held in memory. The index of the dataframes are the
+        numbers of the rows in the data.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''t,E,cycle
+            ... 0,0.1,1
+            ... 1,0.2,1
+            ... 2,0.1,2
+            ... 3,0.2,2
+            ... 4,0.1,3''')
+            >>> csv = BaseLoader(file)
+            >>> csv.cycle_column = "cycle"
+            >>> for cycle, df in csv.cycles():
+            ...     print(cycle)
+            ...     print(df)
+            1
+               t    E  cycle
+            0  0  0.1      1
+            1  1  0.2      1
+            2
+               t    E  cycle
+            2  2  0.1      2
+            3  3  0.2      2
+            3
+               t    E  cycle
+            4  4  0.1      3
+
+        TESTS:
+
+        Cycles which are split across chunks::
+
+            >>> [(cycle, len(df)) for (cycle, df) in csv.cycles(chunksize=3)]
+            [(1, 2), (2, 2), (3, 1)]
+
+        """
+        import numpy as np
+        import pandas as pd
+
+        column = self._cycle_column()
+
+        cycle = None
+        rows = []
+
+        for chunk in self.chunks(chunksize=chunksize):
+            values = chunk[column].to_numpy()
+            boundaries = [
+                0,
+                *(np.flatnonzero(values[1:] != values[:-1]) + 1).tolist(),
+                len(chunk),
+            ]
+
+            for start, stop in zip(boundaries, boundaries[1:]):
+                if rows and values[start] != cycle:
+                    yield _cycle_number(cycle), pd.concat(rows)
+                    rows = []
+
+                cycle = values[start]
+                rows.append(chunk.iloc[start:stop])
+
+        if rows:
+            yield _cycle_number(cycle), pd.concat(rows)
+
+    @cached_property
+    @_profiled("cycles")
+    def cycle_index(self):
+        r"""
+        The rows ``(start, stop)`` of each cycle of the data in the CSV,
+        see :meth:`cycles`.
 
-        EXAMPLES:
+        With this index, a single :meth:`cycle` can be parsed without
+        parsing the other cycles.
 
-        A file with a single column header line::
+        EXAMPLES::
 
             >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
+            >>> file = StringIO(r'''t,E,cycle
+            ... 0,0.1,1
+            ... 1,0.2,1
+            ... 2,0.1,2''')
             >>> csv = BaseLoader(file)
-            >>> csv.column_header_lines
-            1
+            >>> csv.cycle_column = "cycle"
+            >>> csv.cycle_index
+            {1: (0, 2), 2: (2, 3)}
 
-        A file with a two column header lines::
+        TESTS:
 
-            >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... x,y
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file, column_header_lines=2)
-            >>> csv.column_header_lines
-            2
+        Cycles must consist of consecutive rows::
+
+            >>> file = StringIO(r'''t,E,cycle
+            ... 0,0.1,1
+            ... 1,0.2,2
+            ... 2,0.1,1''')
+            >>> csv = BaseLoader(file)
+            >>> csv.cycle_column = "cycle"
+            >>> csv.cycle_index
+            Traceback (most recent call last):
+            ...
+            ValueError: Cycle 1 continues in row 2 after the rows of other cycles.
 
         """
-        return self._column_header_lines or 1
+        import numpy as np
 
-    @property
-    def column_headers(self):
-        r"""
-        The lines in the file containing the descriptive information of the data
-        for each column.
+        column = self._cycle_column()
 
-        EXAMPLES:
+        index = {}
+        cycle = None
+        rows = 0
 
-        A file with a single column header line::
+        for chunk in self.chunks():
+            values = chunk[column].to_numpy()
+            starts = [0, *(np.flatnonzero(values[1:] != values[:-1]) + 1).tolist()]
 
-            >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file)
-            >>> csv.column_headers.readlines()
-            ['a,b\n']
+            for start in starts:
+                if values[start] != cycle:
+                    if cycle is not None:
+                        number = _cycle_number(cycle)
+                        index[number] = (index[number][0], int(chunk.index[start]))
 
-        A file with two column header lines, which is sometimes, for example,
-        used for storing units to the values::
+                    cycle = values[start]
+                    number = _cycle_number(cycle)
 
-            >>> from io import StringIO
-            >>> file = StringIO(r'''T,v
-            ... K,m/s
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file, column_header_lines=2)
-            >>> csv.column_headers.readlines()
-            ['T,v\n', 'K,m/s\n']
+                    if number in index:
+                        raise ValueError(
+                            f"Cycle {number} continues in row {int(chunk.index[start])} after the rows of other cycles."
+                        )
 
-        """
-        from io import StringIO
+                    index[number] = (int(chunk.index[start]), None)
 
-        return StringIO(
-            "".join(
-                line
-                for line in self.file.readlines()[
-                    self.header_lines : self.header_lines + self.column_header_lines
-                ]
-            )
-        )
+            rows = int(chunk.index[-1]) + 1
 
-    @property
-    def column_header_names(self):
+        if cycle is not None:
+            number = _cycle_number(cycle)
+            index[number] = (index[number][0], rows)
+
+        return self._update_sidecar("cycle_index", index)
+
+    def cycle(self, number):
         r"""
-        A list of column header names constructed from the lines
-        containing the column head names.
+        Return a pandas dataframe of the rows of the cycle ``number``
+        of the data in the CSV.
 
-        EXAMPLES:
+        Only the rows of the cycle are parsed once the :meth:`cycle_index`
+        has been created.
 
-        A file with a single column header line::
+        EXAMPLES::
 
             >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
+            >>> file = StringIO(r'''t,E,cycle
+            ... 0,0.1,1
+            ... 1,0.2,1
+            ... 2,0.1,2''')
             >>> csv = BaseLoader(file)
-            >>> csv.column_header_names
-            ['a', 'b']
+            >>> csv.cycle_column = "cycle"
+            >>> csv.cycle(2)
+               t    E  cycle
+            2  2  0.1      2
 
-        For a file containing two or more column header lines,
-        we create a single name for each column including the information
-        from the following lines and separating those with a ``/``.::
+        """
+        return self.select(rows=self.cycle_index[number])
 
-            >>> from io import StringIO
-            >>> file = StringIO(r'''T,v
-            ... K,m/s
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file, column_header_lines=2)
-            >>> csv.column_header_names
-            ['T / K', 'v / m/s']
+    @staticmethod
+    def _extrema(df, size, columns=None):
+        r"""
+        Return the rows of ``df`` with the minimum and maximum value of each of
+        the ``columns`` in buckets of ``size`` rows.
+
+        EXAMPLES::
+
+            >>> import pandas as pd
+            >>> df = pd.DataFrame({"a": [0, 3, 1, 2], "b": ["w", "x", "y", "z"]})
+            >>> BaseLoader._extrema(df, 4)
+               a  b
+            0  0  w
+            1  3  x
+
+        Missing values are ignored and buckets without any value are skipped::
+
+            >>> df = pd.DataFrame({"a": [0, None, None, None, 2, 1], "b": [None, None, 1, 2, 3, 0]})
+            >>> BaseLoader._extrema(df, 2)
+                 a    b
+            0  0.0  NaN
+            2  NaN  1.0
+            3  NaN  2.0
+            4  2.0  3.0
+            5  1.0  0.0
+            >>> BaseLoader._extrema(df, 2, columns=["a"])
+                 a    b
+            0  0.0  NaN
+            4  2.0  3.0
+            5  1.0  0.0
 
         """
+        import numpy as np
 
-        headers = [
-            line.strip().split(self.delimiter)
-            for line in self.column_headers.getvalue().splitlines()
-        ]
+        if columns is None:
+            columns = df.select_dtypes("number").columns
 
-        # If there's only one line, return it as is
-        if len(headers) == 1:
-            return headers[0]
+        rows = [np.empty(0, dtype=df.index.dtype)]
 
-        # If there are multiple lines, combine them column-wise
-        return [" / ".join(items) for items in zip(*headers)]
+        for column in columns:
+            values = df[column].dropna()
+            grouped = values.groupby(values.index // size)
+            rows.extend([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()])
+
+        return df.loc[np.unique(np.concatenate(rows))]
 
     @property
-    def data(self):
+    def _read_csv_options(self):
         r"""
-        A file like object with the data of the CSV without header lines.
+        The options passed to pandas to parse the data of the CSV.
 
         EXAMPLES::
 
             >>> from io import StringIO
             >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file)
-            >>> type(csv.data)
-            <class '_io.StringIO'>
-
-            >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
+            ... 0,0''')
             >>> csv = BaseLoader(file)
-            >>> csv.data.readlines()
-            ['0,0\n', '1,1']
+            >>> csv._read_csv_options
+            {'delimiter': ',', 'decimal': '.', 'names': ['a', 'b'], 'encoding': 'utf-8'}
 
         """
-        from io import StringIO
+        return {
+            "delimiter": self.delimiter,
+            "decimal": self.decimal,
+            "names": self.column_header_names,
+            "encoding": self._data_encoding,
+        }
 
-        return StringIO(
-            "".join(
-                line
-                for line in self.file.readlines()[
-                    self.header_lines + self.column_header_lines :
-                ]
-            )
-        )
+    @staticmethod
+    def _file_ranges(file, start, stop, parts):
+        r"""
+        Return at most ``parts`` ranges of roughly the same size covering the
+        bytes ``start`` to ``stop`` of the binary ``file``, each ending at a
+        line boundary.
 
-    @property
-    def df(self):
+        Only the lines at the boundaries of the ranges are read.
+
+        EXAMPLES::
+
+            >>> from io import BytesIO
+            >>> file = BytesIO(b"a,b\n0,0\n1,1\n2,2\n3,3\n")
+            >>> BaseLoader._file_ranges(file, 4, 20, 2)
+            [(4, 12), (12, 20)]
+
+            >>> BaseLoader._file_ranges(file, 4, 11, 4)
+            [(4, 8), (8, 11)]
+
+            >>> BaseLoader._file_ranges(file, 4, 4, 4)
+            []
+
+        """
+        boundaries = [start]
+
+        for part in range(1, parts):
+            file.seek(max(boundaries[-1], start + (stop - start) * part // parts - 1))
+            file.readline()
+            boundary = file.tell()
+            if boundary <= boundaries[-1] or boundary >= stop:
+                break
+            boundaries.append(boundary)
+
+        boundaries.append(stop)
+
+        return [
+            (start, stop)
+            for (start, stop) in zip(boundaries, boundaries[1:])
+            if start < stop
+        ]
+
+    @staticmethod
+    def _line_ranges(data, parts):
         r"""
-        A pandas dataframe of the data in the CSV.
+        Return at most ``parts`` ranges of roughly the same size
+        covering ``data``, each ending at a line boundary.
 
         EXAMPLES::
 
-            >>> from io import StringIO
-            >>> file = StringIO(r'''a,b
-            ... 0,0
-            ... 1,1''')
-            >>> csv = BaseLoader(file)
-            >>> csv.df
-               a  b
-            0  0  0
-            1  1  1
+            >>> BaseLoader._line_ranges("0,0\n1,1\n2,2\n3,3\n", 2)
+            [(0, 8), (8, 16)]
+
+            >>> BaseLoader._line_ranges("0,0\n1,1", 4)
+            [(0, 4), (4, 7)]
+
+            >>> BaseLoader._line_ranges("", 4)
+            []
+
+            >>> BaseLoader._line_ranges(b"0,0\n1,1\n2,2\n3,3\n", 2)
+            [(0, 8), (8, 16)]
 
         """
-        import pandas as pd
+        newline = b"\n" if isinstance(data, bytes) else "\n"
+        boundaries = [0]
+
+        for part in range(1, parts):
+            boundary = (
+                data.find(newline, max(boundaries[-1], len(data) * part // parts - 1))
+                + 1
+            )
+            if boundary <= boundaries[-1]:
+                break
+            boundaries.append(boundary)
 
-        return pd.read_csv(
-            self.data,
-            delimiter=self.delimiter,
-            decimal=self.decimal,
-            names=self.column_header_names,
-        ).reset_index(drop=True)
+        boundaries.append(len(data))
 
-    @property
+        return [
+            (start, stop)
+            for (start, stop) in zip(boundaries, boundaries[1:])
+            if start < stop
+        ]
+
+    @cached_property
+    @_profiled("delimiter")
     def delimiter(self):
         r"""
         The delimiter in the CSV, which is extracted from
-        the first two lines of the CSV data.
+        the column header lines and the :meth:`_data_sample`.
 
         A CSV containing integers::
 
@@ -522,34 +3052,28 @@ class BaseLoader:
             '\t'
 
         """
-        # TODO:: Validate that the number of delimiters in the data lines
-        # matches those in the column header line.
-        # This will otherwise likely lead to erroneous loading of pandas dataframes
-        # and requires setting the column names specifically.
+        # Data lines whose number of delimiters does not match the column
+        # header line are reported by validate().
         if len(self.delimiters) == 1:
             return self.delimiters[0]
 
-        if not len(self.delimiters) == 0:
-            from io import StringIO
+        import clevercsv
 
-            import clevercsv
+        sample = self.column_headers.getvalue() + "".join(self._data_sample)
 
-            for delimiter in self.delimiters:
-                combined = StringIO(
-                    self.column_headers.getvalue() + self.data.getvalue()
-                )
-                combined.seek(0)
-                delimiter_ = (
-                    clevercsv.detect.Detector()
-                    .detect(combined.read(), delimiters=[delimiter])
-                    .delimiter
-                )
-                if delimiter_:
-                    return delimiter_
+        for delimiter in self.delimiters:
+            delimiter_ = (
+                clevercsv.detect.Detector()
+                .detect(sample, delimiters=[delimiter])
+                .delimiter
+            )
+            if delimiter_:
+                return delimiter_
 
-        return clevercsv.detect.Detector().detect(combined.read()).delimiter
+        return clevercsv.detect.Detector().detect(sample).delimiter
 
-    @property
+    @cached_property
+    @_profiled("decimal")
     def decimal(self):
         r"""
         The decimal separator in the floats in the CSV data.
@@ -606,6 +3130,18 @@ class BaseLoader:
             >>> csv.decimal
             '.'
 
+        The decimal separator is determined from several lines of the data.
+        Hence it is found even if the first lines contain only integers::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''a\tb
+            ... 0\t0
+            ... 1\t1,5
+            ... 2\t2,5''')
+            >>> csv = BaseLoader(file)
+            >>> csv.decimal
+            ','
+
         A TSV containing integers and floats using `,` as decimal separator
         with a single header line::
 
@@ -660,21 +3196,62 @@ class BaseLoader:
         if self._decimal:
             return self._decimal
 
-        data = self.data.readlines()[0].strip().split(self.delimiter)
+        votes = {".": 0, ",": 0}
 
-        has_dot = any("." in item for item in data if self._validate_digit(item, "."))
-        has_comma = any("," in item for item in data if self._validate_digit(item, ","))
+        for line in self._data_sample:
+            data = line.strip().split(self.delimiter)
 
-        if has_dot and has_comma:
-            raise ValueError(
-                "Decimal separator could not be determined. Found both ',' and '.' in numeric values in a single data line."
+            has_dot = any(
+                "." in item for item in data if self._validate_digit(item, ".")
             )
+            has_comma = any(
+                "," in item for item in data if self._validate_digit(item, ",")
+            )
+
+            if has_dot and has_comma:
+                raise ValueError(
+                    "Decimal separator could not be determined. Found both ',' and '.' in numeric values in a single data line."
+                )
+
+            votes["."] += has_dot
+            votes[","] += has_comma
 
-        if has_comma:
+        if votes[","] > votes["."]:
             return ","
 
         return "."
 
+    @cached_property
+    def _data_sample(self):
+        r"""
+        A list of the first :attr:`sample_lines` lines of the data
+        from which :meth:`delimiter` and :meth:`decimal` are determined.
+
+        The lines are read without splitting the entire file into lines.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO(r'''a,b
+            ... 0,0
+            ... 1,1
+            ... 2,2''')
+            >>> csv = BaseLoader(file)
+            >>> csv.sample_lines = 2
+            >>> csv._data_sample
+            ['0,0\n', '1,1\n']
+
+        """
+        from itertools import islice
+
+        return list(
+            islice(
+                self._lines(),
+                self.header_lines + self.column_header_lines,
+                self.header_lines + self.column_header_lines + self.sample_lines,
+            )
+        )
+
     @classmethod
     def _validate_digit(cls, item, character):
         """
@@ -706,3 +3283,198 @@ class BaseLoader:
             return True
         except ValueError:
             return False
+
+
+def _cycle_number(value):
+    r"""
+    Return the cycle number ``value`` as an integer if it is integral.
+
+    EXAMPLES::
+
+        >>> _cycle_number(1.0)
+        1
+        >>> _cycle_number(1.5)
+        1.5
+
+    """
+    if float(value).is_integer():
+        return int(value)
+
+    return value.item() if hasattr(value, "item") else value
+
+
+def _npy_header(dtype, rows, size=None):
+    r"""
+    Return the header of a ``.npy`` file of a one-dimensional array of
+    ``rows`` with ``dtype``, padded to ``size`` bytes if given.
+
+    EXAMPLES::
+
+        >>> import numpy as np
+        >>> header = _npy_header(np.dtype("<f8"), 3)
+        >>> len(header)
+        128
+
+    The header is the same as the header written by NumPy::
+
+        >>> from io import BytesIO
+        >>> file = BytesIO()
+        >>> np.save(file, np.zeros(3))
+        >>> file.getvalue()[:128] == header
+        True
+
+    """
+    import struct
+
+    import numpy as np
+
+    header = (
+        f"{{'descr': {np.lib.format.dtype_to_descr(dtype)!r}, "
+        f"'fortran_order': False, 'shape': ({rows},), }}"
+    )
+
+    # The magic string, the version, the length of the header, and the header
+    # terminated by a newline must be aligned to 64 bytes.
+    if size is None:
+        size = -(-(len(header) + 11) // 64) * 64
+
+    return (
+        b"\x93NUMPY\x01\x00"
+        + struct.pack("<H", size - 10)
+        + header.ljust(size - 11).encode("latin1")
+        + b"\n"
+    )
+
+
+def _data_lines(buffer):
+    r"""
+    Return the offsets of the starts and ends of the lines in ``buffer``, a
+    NumPy array of the bytes of complete lines, ignoring blank lines which
+    are also skipped by pandas.
+
+    EXAMPLES::
+
+        >>> import numpy as np
+        >>> _data_lines(np.frombuffer(b"0,0\n\n1,1\r\n\r\n2,2", dtype=np.uint8))
+        (array([ 0,  5, 12]), array([ 3,  9, 15]))
+
+    """
+    import numpy as np
+
+    ends = np.flatnonzero(buffer == ord("\n"))
+    if len(buffer) and buffer[-1] != ord("\n"):
+        ends = np.append(ends, len(buffer))
+    starts = np.concatenate([[0], ends[:-1] + 1]).astype(ends.dtype)
+
+    lengths = ends - starts
+    carriage = lengths > 0
+    carriage[carriage] = buffer[ends[carriage] - 1] == ord("\r")
+    lines = lengths - carriage > 0
+
+    return starts[lines], ends[lines]
+
+
+def _format_rows(rows, limit=10):
+    r"""
+    Return a compact description of the numbers of ``rows``, where
+    consecutive rows are combined into ranges and at most ``limit``
+    ranges are listed.
+
+    EXAMPLES::
+
+        >>> import numpy as np
+        >>> _format_rows(np.array([1, 2, 3, 7, 9, 10]))
+        '1-3, 7, 9-10'
+        >>> _format_rows(np.arange(0, 40, 2), limit=3)
+        '0, 2, 4, ... (20 rows)'
+        >>> _format_rows(np.array([], dtype=int))
+        ''
+
+    """
+    import numpy as np
+
+    rows = np.unique(rows)
+
+    if not rows.size:
+        return ""
+
+    breaks = np.flatnonzero(np.diff(rows) != 1)
+    starts = rows[np.concatenate([[0], breaks + 1])]
+    stops = rows[np.concatenate([breaks, [len(rows) - 1]])]
+
+    ranges = [
+        str(start) if start == stop else f"{start}-{stop}"
+        for (start, stop) in zip(starts[:limit], stops[:limit])
+    ]
+
+    if len(starts) > limit:
+        ranges.append(f"... ({len(rows)} rows)")
+
+    return ", ".join(ranges)
+
+
+def _read_csv(data, options):
+    r"""
+    Return a dataframe parsed from the CSV ``data`` (a string, bytes, a file
+    object, or a range ``(path, start, stop)`` of the bytes of a file) with
+    the ``options`` passed on to pandas.
+
+    This is a module level function so that it can be run in worker processes.
+
+    EXAMPLES::
+
+        >>> _read_csv("0,1\n2,3\n", {"names": ["a", "b"]})
+           a  b
+        0  0  1
+        1  2  3
+
+    A range of a file is read by the function itself::
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+        >>> with open(filename, "wb") as file:
+        ...     _ = file.write(b"a,b\n0,1\n2,3\n")
+        >>> _read_csv((filename, 8, 12), {"names": ["a", "b"]})
+           a  b
+        0  2  3
+
+    """
+    from io import BytesIO, StringIO
+
+    import pandas as pd
+
+    if isinstance(data, str):
+        data = StringIO(data)
+    elif isinstance(data, bytes):
+        data = BytesIO(data)
+    elif isinstance(data, tuple):
+        path, start, stop = data
+        with open(path, "rb") as file:
+            file.seek(start)
+            data = BytesIO(file.read(stop - start))
+
+    return pd.read_csv(data, **options).reset_index(drop=True)
+
+
+def _read_csv_parallel(parts, options):
+    r"""
+    Return an iterator over the dataframes parsed concurrently from the
+    ``parts`` of a CSV in order, see :func:`_read_csv`.
+
+    EXAMPLES::
+
+        >>> chunks = list(_read_csv_parallel([b"0,1\n", b"2,3\n"], {"names": ["a", "b"]}))
+        >>> chunks[1]
+           a  b
+        0  2  3
+
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import repeat
+
+    if len(parts) == 1:
+        yield _read_csv(parts[0], options)
+        return
+
+    with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+        yield from executor.map(_read_csv, parts, repeat(options))
@@ -0,0 +1,355 @@
+r"""
+Conversion of batches of files with bounded memory.
+
+The memory required to convert a file is estimated from its size and the
+loader for its device. The files are then converted in worker processes,
+largest first, such that the estimated memory of the conversions running
+at the same time does not exceed a budget. Files which are too large for the
+budget and conversions which run out of memory are converted in chunks, see
+:func:`echemdbconverters.conversion.convert_file_streaming`.
+
+EXAMPLES::
+
+    >>> import os, tempfile
+    >>> from echemdbconverters.test.cli import TemporaryData
+    >>> outdir = tempfile.mkdtemp()
+    >>> with TemporaryData("eclab_cv.mpt", "eclab_ca.mpt") as directory:
+    ...     filenames = [os.path.join(directory, name) for name in ["eclab_cv.mpt", "eclab_ca.mpt"]]
+    ...     modes = convert_files(filenames, device="eclab", outdir=outdir, memory=2**30, workers=2)
+    >>> list(modes.values())
+    ['memory', 'memory']
+    >>> sorted(os.listdir(outdir))
+    ['eclab_ca.csv', 'eclab_ca.json', 'eclab_cv.csv', 'eclab_cv.json']
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+import logging
+
+logger = logging.getLogger("echemdb-converters")
+
+OVERHEAD = 96 * 2**20
+r"""
+The approximate memory in bytes of a worker process converting a file,
+without the memory needed for the data of the file.
+"""
+
+STREAMING = 128 * 2**20
+r"""
+The approximate memory in bytes needed for the data when converting a file
+in chunks.
+"""
+
+COMPRESSION_RATIO = 5
+r"""
+The assumed ratio of the size of the decompressed and the compressed file
+when estimating the memory needed to convert a compressed file.
+"""
+
+
+def estimate_memory(filename, device=None, streaming=False):
+    r"""
+    Return an estimate of the memory in bytes needed to convert the file
+    ``filename`` recorded with ``device``.
+
+    The estimate is based on the size of the file and the
+    :attr:`~echemdbconverters.baseloader.BaseLoader.memory_per_byte` of
+    the loader. When ``streaming``, the data is converted in chunks, so the
+    memory needed is bounded independently of the size of the file.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+        >>> with open(filename, "wb") as file:
+        ...     _ = file.write(b"t,E\n" + b"0,0\n" * 2**20)
+        >>> estimate_memory(filename) // 2**20
+        120
+        >>> estimate_memory(filename, streaming=True) // 2**20
+        120
+
+    Large files need at most a fixed amount of memory when streaming::
+
+        >>> with open(filename, "wb") as file:
+        ...     _ = file.write(b"t,E\n" + b"0,0\n" * 2**25)
+        >>> estimate_memory(filename) // 2**20
+        864
+        >>> estimate_memory(filename, streaming=True) // 2**20
+        224
+
+    The size of compressed files is not known before decompressing them.
+    Such files are assumed to have a size of :data:`COMPRESSION_RATIO` times
+    the compressed size::
+
+        >>> import gzip
+        >>> with gzip.open(filename, "wb") as file:
+        ...     _ = file.write(b"t,E\n" + b"0,0\n" * 2**20)
+        >>> estimate_memory(filename) // 2**20
+        96
+
+    """
+    import os
+
+    from echemdbconverters.baseloader import BaseLoader
+    from echemdbconverters.compression import compression
+
+    size = os.path.getsize(filename)
+
+    if compression(filename) is not None:
+        size *= COMPRESSION_RATIO
+
+    loader = BaseLoader.create(device) if device else BaseLoader
+    data = loader.memory_per_byte * size
+
+    if streaming:
+        data = min(data, STREAMING)
+
+    return OVERHEAD + data
+
+
+def convert_files(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    filenames,
+    device=None,
+    outdir=".",
+    metadata=None,
+    memory=None,
+    workers=None,
+    chunksize=100000,
+):
+    r"""
+    Convert the files ``filenames`` recorded with ``device`` into unitpackages
+    written to ``outdir`` with at most ``workers`` worker processes (one per
+    core if ``None``) and return how each file has been converted.
+
+    The ``metadata`` is a dict mapping each of the ``filenames`` to its
+    metadata; files not contained in the dict are converted without metadata.
+
+    The files are converted largest first. A file is only converted when
+    the memory estimated with :func:`estimate_memory` for it and for the
+    conversions already running does not exceed ``memory`` bytes (unlimited
+    if ``None``). Files which do not fit into the ``memory`` are converted
+    in chunks of ``chunksize`` rows. When a conversion runs out of memory, it
+    is repeated in chunks. When a worker is killed, e.g., by the
+    operating system when running out of memory, the largest conversion
+    held in memory is repeated in chunks and the other conversions running
+    at that time are repeated unchanged.
+
+    Returns a dict mapping each of the ``filenames`` to ``"memory"`` or
+    ``"streaming"`` depending on whether the data was held in memory entirely
+    or converted in chunks.
+
+    EXAMPLES:
+
+    Files are converted in chunks when the estimated memory exceeds the budget::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("eclab_cv.mpt") as directory:
+        ...     convert_files([os.path.join(directory, "eclab_cv.mpt")], device="eclab",
+        ...         outdir=tempfile.mkdtemp(), memory=2**20)
+        {'...eclab_cv.mpt': 'streaming'}
+
+    Conversions that run out of memory are repeated in chunks::
+
+        >>> from unittest.mock import patch
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> def convert(filename, device, outdir, metadata, chunksize):
+        ...     if chunksize is None:
+        ...         raise MemoryError()
+        >>> with TemporaryData("eclab_cv.mpt") as directory:
+        ...     with patch("echemdbconverters.batch._convert", convert), patch("echemdbconverters.batch._executor", ThreadPoolExecutor):
+        ...         convert_files([os.path.join(directory, "eclab_cv.mpt")], device="eclab", outdir=tempfile.mkdtemp())
+        {'...eclab_cv.mpt': 'streaming'}
+
+    """
+    import os
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    metadata = metadata or {}
+    workers = workers or os.cpu_count()
+
+    jobs = []
+    for filename in filenames:
+        job = {
+            "filename": filename,
+            "memory": estimate_memory(filename, device),
+            "streaming": False,
+        }
+
+        if memory is not None and job["memory"] > memory:
+            job["memory"] = estimate_memory(filename, device, streaming=True)
+            job["streaming"] = True
+
+        jobs.append(job)
+
+    pending = sorted(jobs, key=lambda job: job["memory"], reverse=True)
+    running = {}
+    modes = {}
+
+    pool = _executor(workers)
+    try:
+        while pending or running:
+            for job in list(pending):
+                if len(running) >= workers:
+                    break
+
+                used = sum(other["memory"] for other in running.values())
+
+                # Run at least one job, even if it exceeds the memory.
+                if running and memory is not None and used + job["memory"] > memory:
+                    continue
+
+                pending.remove(job)
+                future = pool.submit(
+                    _convert,
+                    job["filename"],
+                    device,
+                    outdir,
+                    metadata.get(job["filename"]),
+                    chunksize if job["streaming"] else None,
+                )
+                running[future] = job
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            if any(
+                isinstance(future.exception(), BrokenProcessPool) for future in done
+            ):
+                # A worker has been killed, presumably by the operating system
+                # when running out of memory. This breaks all the workers.
+                done, _ = wait(running)
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _executor(workers)
+
+            broken = []
+            for future in done:
+                job = running.pop(future)
+
+                if isinstance(future.exception(), BrokenProcessPool):
+                    broken.append(job)
+                elif isinstance(future.exception(), MemoryError):
+                    _retry_streaming(job, device, future.exception())
+                    pending.append(job)
+                else:
+                    future.result()
+                    modes[job["filename"]] = (
+                        "streaming" if job["streaming"] else "memory"
+                    )
+
+            if broken:
+                # We cannot tell which conversion killed the worker. We assume
+                # that it was the largest conversion held in memory and repeat
+                # the other conversions unchanged.
+                culprits = [job for job in broken if not job["streaming"]]
+                if not culprits:
+                    raise BrokenProcessPool(
+                        f"A worker converting {', '.join(job['filename'] for job in broken)} terminated abruptly."
+                    )
+                _retry_streaming(
+                    max(culprits, key=lambda job: job["memory"]),
+                    device,
+                    BrokenProcessPool("A worker terminated abruptly."),
+                )
+                pending.extend(broken)
+
+            pending.sort(key=lambda job: job["memory"], reverse=True)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    return {filename: modes[filename] for filename in filenames}
+
+
+def _retry_streaming(job, device, error):
+    r"""
+    Update the conversion ``job`` which failed with ``error`` to be repeated in chunks.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("eclab_cv.mpt") as directory:
+        ...     job = {"filename": os.path.join(directory, "eclab_cv.mpt"), "memory": 0, "streaming": False}
+        ...     _retry_streaming(job, "eclab", MemoryError())
+        >>> job["streaming"]
+        True
+
+    A conversion in chunks that fails cannot be repeated::
+
+        >>> _retry_streaming(job, "eclab", MemoryError())
+        Traceback (most recent call last):
+        ...
+        MemoryError
+
+    """
+    if job["streaming"]:
+        raise error
+
+    logger.warning(
+        f"Converting {job['filename']} failed: {error!r}. Converting in chunks instead."
+    )
+    job["memory"] = estimate_memory(job["filename"], device, streaming=True)
+    job["streaming"] = True
+
+
+def _executor(workers):
+    r"""
+    Return a pool of ``workers`` processes converting files.
+
+    EXAMPLES::
+
+        >>> with _executor(1) as pool:
+        ...     pool.submit(sum, [1, 2]).result()
+        3
+
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(workers)
+
+
+def _convert(filename, device, outdir, metadata, chunksize):
+    r"""
+    Convert the file ``filename`` in a worker process, in chunks of
+    ``chunksize`` rows unless ``chunksize`` is ``None``.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> outdir = tempfile.mkdtemp()
+        >>> with TemporaryData("default.csv") as directory:
+        ...     _convert(os.path.join(directory, "default.csv"), None, outdir, None, 2)
+        >>> sorted(os.listdir(outdir))
+        ['default.csv', 'default.json']
+
+    """
+    from echemdbconverters.conversion import convert_file, convert_file_streaming
+
+    if chunksize is None:
+        convert_file(filename, device=device, outdir=outdir, metadata=metadata)
+    else:
+        convert_file_streaming(
+            filename,
+            device=device,
+            outdir=outdir,
+            metadata=metadata,
+            chunksize=chunksize,
+        )
@@ -0,0 +1,357 @@
+r"""
+A persistent cache of the parsed data of files.
+
+Parsing the text of a large file is much slower than reading the same data
+in a binary format. When a loader is created with a ``cache`` directory,
+the numeric data it parses is stored in that directory as ``.npy`` files,
+one per column. When the same file is loaded again with the same options,
+the data is memory-mapped from the cache instead of being parsed again.
+
+The entries of the cache are keyed by a hash of the content of the file and
+the options of the loader, so a modified file is parsed again. When the
+cache grows beyond :data:`SIZE`, the least recently used entries are removed.
+
+EXAMPLES::
+
+    >>> import os, tempfile
+    >>> from echemdbconverters.baseloader import BaseLoader
+    >>> directory = tempfile.mkdtemp()
+    >>> filename = os.path.join(directory, "data.csv")
+    >>> with open(filename, "w") as file:
+    ...     _ = file.write("t,E\n0,0.1\n1,0.2\n")
+    >>> cache = os.path.join(directory, "cache")
+    >>> BaseLoader(filename, cache=cache).df
+       t    E
+    0  0  0.1
+    1  1  0.2
+    >>> [entry["columns"] for entry in entries(cache)]
+    [['t', 'E']]
+
+When the file is loaded again, the data is read from the cache::
+
+    >>> from unittest.mock import patch
+    >>> with patch("echemdbconverters.baseloader._read_csv") as read_csv:
+    ...     df = BaseLoader(filename, cache=cache).df
+    >>> read_csv.call_count
+    0
+    >>> df
+       t    E
+    0  0  0.1
+    1  1  0.2
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+import logging
+
+logger = logging.getLogger("echemdb-converters")
+
+VERSION = 1
+r"""
+The version of the format of cache entries. Entries written with another
+version are not used.
+"""
+
+SIZE = 2**30
+r"""
+The default maximal total size in bytes of the entries of a cache.
+"""
+
+
+def default_directory():
+    r"""
+    Return the cache directory used when a loader is created with ``cache=True``.
+
+    This is the directory given by the environment variable
+    ``ECHEMDB_CONVERTERS_CACHE`` or ``echemdb-converters`` in the user's
+    cache directory otherwise.
+
+    EXAMPLES::
+
+        >>> import os
+        >>> from unittest.mock import patch
+        >>> with patch.dict(os.environ, {"ECHEMDB_CONVERTERS_CACHE": "/tmp/cache"}):
+        ...     default_directory()
+        '/tmp/cache'
+        >>> with patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/user"}):
+        ...     _ = os.environ.pop("ECHEMDB_CONVERTERS_CACHE", None)
+        ...     default_directory()
+        '/tmp/user/echemdb-converters'
+
+    """
+    import os
+
+    if "ECHEMDB_CONVERTERS_CACHE" in os.environ:
+        return os.environ["ECHEMDB_CONVERTERS_CACHE"]
+
+    return os.path.join(
+        os.environ.get(
+            "XDG_CACHE_HOME", os.path.expanduser(os.path.join("~", ".cache"))
+        ),
+        "echemdb-converters",
+    )
+
+
+def cache_key(file, options):
+    r"""
+    Return the key of the cache entry for the content of the binary stream
+    ``file`` loaded with ``options``.
+
+    EXAMPLES::
+
+        >>> from io import BytesIO
+        >>> cache_key(BytesIO(b"a,b\n0,0\n"), {"loader": "BaseLoader"})
+        '...'
+        >>> cache_key(BytesIO(b"a,b\n0,0\n"), {}) == cache_key(BytesIO(b"a,b\n0,1\n"), {})
+        False
+        >>> cache_key(BytesIO(b"a,b\n0,0\n"), {}) == cache_key(BytesIO(b"a,b\n0,0\n"), {"decimal": ","})
+        False
+
+    """
+    import hashlib
+    import json
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps([VERSION, options], sort_keys=True).encode("utf-8"))
+
+    while block := file.read(2**20):
+        digest.update(block)
+
+    return digest.hexdigest()
+
+
+def read_cache(directory, key):
+    r"""
+    Return the columns of the cache entry ``key`` in ``directory`` as a dict
+    mapping column names to memory-mapped arrays.
+
+    Returns ``None`` when there is no such entry. The arrays can be modified
+    without modifying the cache.
+
+    EXAMPLES::
+
+        >>> import tempfile
+        >>> import pandas as pd
+        >>> directory = tempfile.mkdtemp()
+        >>> read_cache(directory, "key") is None
+        True
+        >>> write_cache(directory, "key", pd.DataFrame({"t": [0, 1], "E": [0.1, 0.2]}))
+        True
+        >>> read_cache(directory, "key")
+        {'t': memmap([0, 1]), 'E': memmap([0.1, 0.2])}
+
+    """
+    import json
+    import os
+
+    import numpy as np
+
+    entry = os.path.join(directory, key)
+
+    try:
+        with open(os.path.join(entry, "columns.json"), encoding="utf-8") as file:
+            columns = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring invalid cache entry {entry}: {e}")
+        return None
+
+    # Record the access for the eviction of the least recently used entries.
+    os.utime(os.path.join(entry, "columns.json"))
+
+    return {
+        column: np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="c")
+        for (i, column) in enumerate(columns)
+    }
+
+
+def write_cache(directory, key, df, size=SIZE):
+    r"""
+    Store the data of ``df`` as the cache entry ``key`` in ``directory`` and
+    remove the least recently used entries such that the cache does not
+    exceed ``size`` bytes.
+
+    Returns whether the data has been stored. Only dataframes whose columns
+    are all numeric are stored.
+
+    EXAMPLES::
+
+        >>> import tempfile
+        >>> import pandas as pd
+        >>> directory = tempfile.mkdtemp()
+        >>> write_cache(directory, "key", pd.DataFrame({"t": [0, 1], "E": [0.1, 0.2]}))
+        True
+        >>> write_cache(directory, "other", pd.DataFrame({"t": [0, 1], "comment": ["a", "b"]}))
+        False
+        >>> [entry["key"] for entry in entries(directory)]
+        ['key']
+
+    """
+    import json
+    import os
+    import shutil
+    import tempfile
+
+    import numpy as np
+    import pandas as pd
+
+    if not all(pd.api.types.is_numeric_dtype(df[column]) for column in df.columns):
+        logger.debug(f"Not caching data with non-numeric columns as {key}.")
+        return False
+
+    os.makedirs(directory, exist_ok=True)
+
+    # Write the entry to a temporary directory first so that concurrent
+    # readers never see a partial entry.
+    staging = tempfile.mkdtemp(dir=directory, prefix=f".{key}.")
+    try:
+        for i, column in enumerate(df.columns):
+            np.save(os.path.join(staging, f"{i}.npy"), df[column].to_numpy())
+
+        with open(os.path.join(staging, "columns.json"), "w", encoding="utf-8") as file:
+            json.dump([str(column) for column in df.columns], file)
+
+        os.replace(staging, os.path.join(directory, key))
+    except OSError:
+        # The entry has been created concurrently or cannot be written.
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+
+    evict(directory, size)
+
+    return True
+
+
+def entries(directory):
+    r"""
+    Return the entries of the cache in ``directory``, most recently used first.
+
+    Each entry is described by a dict with its ``key``, its ``columns``, its
+    ``size`` in bytes, and the time it was last ``accessed``.
+
+    EXAMPLES::
+
+        >>> import tempfile
+        >>> import pandas as pd
+        >>> directory = tempfile.mkdtemp()
+        >>> entries(directory)
+        []
+        >>> write_cache(directory, "key", pd.DataFrame({"t": [0, 1]}))
+        True
+        >>> entries(directory)
+        [{'key': 'key', 'columns': ['t'], 'size': ..., 'accessed': ...}]
+
+    TESTS:
+
+        >>> entries(directory + "-missing")
+        []
+
+    """
+    import json
+    import os
+
+    if not os.path.isdir(directory):
+        return []
+
+    described = []
+
+    for key in os.listdir(directory):
+        if key.startswith("."):
+            # An entry that is still being written.
+            continue
+
+        entry = os.path.join(directory, key)
+        try:
+            with open(os.path.join(entry, "columns.json"), encoding="utf-8") as file:
+                columns = json.load(file)
+            described.append(
+                {
+                    "key": key,
+                    "columns": columns,
+                    "size": sum(
+                        os.path.getsize(os.path.join(entry, name))
+                        for name in os.listdir(entry)
+                    ),
+                    "accessed": os.path.getmtime(os.path.join(entry, "columns.json")),
+                }
+            )
+        except (OSError, ValueError):
+            # Not an entry of the cache or an entry that is being written or removed.
+            continue
+
+    return sorted(described, key=lambda entry: entry["accessed"], reverse=True)
+
+
+def evict(directory, size=SIZE):
+    r"""
+    Remove the least recently used entries of the cache in ``directory``
+    until the entries take at most ``size`` bytes and return the keys of the
+    removed entries.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> import pandas as pd
+        >>> directory = tempfile.mkdtemp()
+        >>> write_cache(directory, "old", pd.DataFrame({"t": range(1000)}))
+        True
+        >>> write_cache(directory, "new", pd.DataFrame({"t": range(1000)}))
+        True
+        >>> os.utime(os.path.join(directory, "old", "columns.json"), (0, 0))
+        >>> evict(directory, 10000)
+        ['old']
+        >>> evict(directory, 0)
+        ['new']
+
+    """
+    import os
+    import shutil
+
+    removed = []
+    total = 0
+
+    for entry in entries(directory):
+        total += entry["size"]
+        if total > size:
+            shutil.rmtree(os.path.join(directory, entry["key"]), ignore_errors=True)
+            removed.append(entry["key"])
+
+    return removed
+
+
+def clear(directory):
+    r"""
+    Remove all entries of the cache in ``directory`` and return their keys.
+
+    EXAMPLES::
+
+        >>> import tempfile
+        >>> import pandas as pd
+        >>> directory = tempfile.mkdtemp()
+        >>> write_cache(directory, "key", pd.DataFrame({"t": [0, 1]}))
+        True
+        >>> clear(directory)
+        ['key']
+        >>> entries(directory)
+        []
+
+    """
+    return evict(directory, -1)
@@ -443,6 +443,8 @@ biologic_fields = [
     {"name": "z cycle", "description": "z cycle"},
 ]
 
+biologic_fields_by_name = {field["name"]: field for field in biologic_fields}
+
 biologic_fields_alt_names = {
     "<I>/mA": "I",
     "I/mA": "I",
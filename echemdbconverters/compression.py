@@ -0,0 +1,225 @@
+r"""
+Transparent access to compressed files.
+
+Raw data files are often archived compressed with gzip, xz, or zstd.
+Such files are decompressed while they are being read, i.e.,
+the decompressed content is never written to disk and reading only
+the first lines of a file only decompresses the beginning of the file.
+
+EXAMPLES::
+
+    >>> import gzip, os, tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> filename = os.path.join(directory, 'data.csv.gz')
+    >>> with gzip.open(filename, 'wb') as file:
+    ...     _ = file.write(b'a,b\n0,0\n1,1\n')
+    >>> with open_file(filename) as file:
+    ...     file.readline()
+    b'a,b\n'
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+magic_numbers = {
+    "gzip": b"\x1f\x8b",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+r"""
+The leading bytes identifying the supported compression formats.
+"""
+
+suffixes = {
+    "gzip": ".gz",
+    "xz": ".xz",
+    "zstd": ".zst",
+}
+r"""
+The file name suffixes of the supported compression formats.
+"""
+
+
+def compression(filename):
+    r"""
+    Return the compression format of the file ``filename`` determined from
+    its leading bytes or ``None`` for uncompressed files.
+
+    EXAMPLES::
+
+        >>> import lzma, os, tempfile
+        >>> directory = tempfile.mkdtemp()
+        >>> filename = os.path.join(directory, 'data.csv.xz')
+        >>> with lzma.open(filename, 'wb') as file:
+        ...     _ = file.write(b'a,b\n0,0\n')
+        >>> compression(filename)
+        'xz'
+
+        >>> filename = os.path.join(directory, 'data.csv')
+        >>> with open(filename, 'wb') as file:
+        ...     _ = file.write(b'a,b\n0,0\n')
+        >>> compression(filename) is None
+        True
+
+    """
+    with open(filename, "rb") as file:
+        head = file.read(max(len(magic) for magic in magic_numbers.values()))
+
+    for name, magic in magic_numbers.items():
+        if head.startswith(magic):
+            return name
+
+    return None
+
+
+def open_file(filename):
+    r"""
+    Return a binary file object of the file ``filename``, which is
+    decompressed while it is being read.
+
+    EXAMPLES::
+
+        >>> import lzma, os, tempfile
+        >>> directory = tempfile.mkdtemp()
+        >>> filename = os.path.join(directory, 'data.csv.xz')
+        >>> with lzma.open(filename, 'wb') as file:
+        ...     _ = file.write(b'a,b\n0,0\n')
+        >>> with open_file(filename) as file:
+        ...     file.read()
+        b'a,b\n0,0\n'
+
+    Files compressed with zstd require the optional zstandard package::
+
+        >>> import zstandard
+        >>> filename = os.path.join(directory, 'data.csv.zst')
+        >>> with open(filename, 'wb') as file:
+        ...     _ = file.write(zstandard.ZstdCompressor().compress(b'a,b\n0,0\n'))
+        >>> with open_file(filename) as file:
+        ...     file.readline()
+        b'a,b\n'
+
+    """
+    kind = compression(filename)
+
+    if kind == "gzip":
+        import gzip
+
+        return gzip.open(filename, "rb")
+
+    if kind == "xz":
+        import lzma
+
+        return lzma.open(filename, "rb")
+
+    if kind == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                f"Reading the zstd compressed file '{filename}' requires the zstandard package."
+            ) from e
+
+        import io
+
+        return io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(
+                open(filename, "rb"),  # pylint: disable=consider-using-with
+                closefd=True,
+            )
+        )
+
+    return open(filename, "rb")  # pylint: disable=consider-using-with
+
+
+def seek(file, offset):
+    r"""
+    Move the binary ``file`` to the absolute ``offset`` and return it.
+
+    Streams which are not seekable, such as zstd compressed files, are read
+    and discarded up to the ``offset`` instead, which must not precede the
+    current position.
+
+    EXAMPLES::
+
+        >>> import io
+        >>> file = io.BufferedReader(io.BytesIO(b"a,b\n0,0\n1,1\n"))
+        >>> seek(file, 4).readline()
+        b'0,0\n'
+
+    Files compressed with zstd are not seekable::
+
+        >>> import zstandard
+        >>> data = zstandard.ZstdCompressor().compress(b"a,b\n0,0\n1,1\n")
+        >>> file = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)))
+        >>> file.seekable()
+        False
+        >>> seek(file, 4).readline()
+        b'0,0\n'
+        >>> seek(file, 8).readline()
+        b'1,1\n'
+        >>> seek(file, 0)
+        Traceback (most recent call last):
+        ...
+        io.UnsupportedOperation: Cannot seek backwards from 12 to 0 in a stream which is not seekable.
+
+    """
+    if file.seekable():
+        file.seek(offset)
+        return file
+
+    position = file.tell()
+
+    if offset < position:
+        import io
+
+        raise io.UnsupportedOperation(
+            f"Cannot seek backwards from {position} to {offset} in a stream which is not seekable."
+        )
+
+    while position < offset:
+        block = file.read(min(offset - position, 2**20))
+        if not block:
+            break
+        position += len(block)
+
+    return file
+
+
+def strip_suffix(filename):
+    r"""
+    Return the path ``filename`` without the suffix of a compression format.
+
+    EXAMPLES::
+
+        >>> strip_suffix('data/eclab_cv.mpt.gz').name
+        'eclab_cv.mpt'
+
+        >>> strip_suffix('data/eclab_cv.mpt').name
+        'eclab_cv.mpt'
+
+    """
+    from pathlib import Path
+
+    filename = Path(filename)
+
+    if filename.suffix in suffixes.values():
+        return filename.with_suffix("")
+
+    return filename
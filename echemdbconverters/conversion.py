@@ -0,0 +1,454 @@
+r"""
+Conversion of files into unitpackages.
+
+EXAMPLES::
+
+    >>> import os, tempfile
+    >>> from echemdbconverters.test.cli import TemporaryData
+    >>> with TemporaryData("eclab_cv.mpt") as directory:
+    ...     outdir = tempfile.mkdtemp()
+    ...     entry = convert_file(os.path.join(directory, "eclab_cv.mpt"), device="eclab", outdir=outdir)
+    ...     sorted(os.listdir(outdir))
+    ['eclab_cv.csv', 'eclab_cv.json']
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+import logging
+
+logger = logging.getLogger("echemdb-converters")
+
+
+def create_loader(filename, device=None, **kwargs):
+    r"""
+    Return a loader for the file ``filename`` recorded with ``device``.
+
+    The ``kwargs`` are passed on to the loader.
+
+    EXAMPLES::
+
+        >>> import os
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("default.csv") as directory:
+        ...     create_loader(os.path.join(directory, "default.csv")).df
+           t  E  j
+        0  0  0  0
+        1  1  1  1
+        2  2  2  2
+
+    """
+    from echemdbconverters.baseloader import BaseLoader
+
+    if device:
+        return BaseLoader.create(device)(filename, **kwargs)
+
+    return BaseLoader(filename, **kwargs)
+
+
+def convert_file(  # pylint: disable=too-many-arguments,too-many-locals
+    filename,
+    device=None,
+    outdir=".",
+    metadata=None,
+    processes=1,
+    profiler=None,
+    progress=None,
+    rows=None,
+    where=None,
+    every=None,
+    buckets=None,
+):
+    r"""
+    Convert the file ``filename`` recorded with ``device`` into a unitpackage
+    with ``metadata`` written to ``outdir`` and return the created entry.
+
+    The data is parsed with ``processes`` worker processes
+    (all available cores if ``None``). Only the ``rows`` and the values
+    ``where`` are converted when provided, see :meth:`BaseLoader.select`.
+    The data is decimated to ``every``-th row or to the extrema in a number
+    of ``buckets`` when provided, see :meth:`BaseLoader.decimate`. The stages of the conversion are
+    recorded with ``profiler`` and reported to the ``progress`` callback,
+    see :mod:`echemdbconverters.progress`.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.profiling import Profiler
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> profiler = Profiler()
+        >>> with TemporaryData("unit.csv") as directory:
+        ...     entry = convert_file(os.path.join(directory, "unit.csv"), outdir=tempfile.mkdtemp(),
+        ...         metadata={"figure description": {"fields": [{"name": "t", "unit": "s"}]}}, profiler=profiler)
+        >>> entry.field_unit("t")
+        's'
+        >>> [record["stage"] for record in profiler.records]
+        ['header', 'encoding', 'delimiter', 'decimal', 'parse', 'from_df', 'save']
+
+    The progress of the conversion can be followed with a callback::
+
+        >>> events = []
+        >>> with TemporaryData("unit.csv") as directory:
+        ...     entry = convert_file(os.path.join(directory, "unit.csv"), outdir=tempfile.mkdtemp(),
+        ...         progress=events.append)
+        >>> [event["stage"] for event in events[-3:]]
+        ['parse', 'from_df', 'save']
+
+    A range of the data can be selected::
+
+        >>> with TemporaryData("eclab_ca.mpt") as directory:
+        ...     entry = convert_file(os.path.join(directory, "eclab_ca.mpt"), device="eclab",
+        ...         outdir=tempfile.mkdtemp(), where=("time/s", 1, 2))
+        >>> entry.df["time/s"].between(1, 2).all()
+        True
+
+    The data can be decimated::
+
+        >>> with TemporaryData("eclab_ca.mpt") as directory:
+        ...     entry = convert_file(os.path.join(directory, "eclab_ca.mpt"), device="eclab",
+        ...         outdir=tempfile.mkdtemp(), every=10)
+        >>> len(entry.df)
+        4
+
+    """
+    from unitpackage.entry import Entry
+
+    from echemdbconverters.compression import strip_suffix
+    from echemdbconverters.profiling import profile
+
+    loader = create_loader(filename, device, profiler=profiler, progress=progress)
+
+    if every is not None or buckets is not None:
+        df = loader.decimate(every=every, buckets=buckets)
+    elif rows is not None or where is not None:
+        df = loader.select(rows=rows, where=where)
+    else:
+        df = loader.read(processes=processes)
+
+    loader._report("from_df")  # pylint: disable=protected-access
+    with profile(profiler, "from_df"):
+        entry = Entry.from_df(
+            df=df,
+            basename=strip_suffix(filename).stem,
+            metadata=metadata,
+            fields=_fields(metadata),
+        )
+
+    loader._report("save")  # pylint: disable=protected-access
+    with profile(profiler, "save"):
+        entry.save(outdir=outdir)
+
+    return entry
+
+
+def convert_cycles(  # pylint: disable=too-many-locals
+    filename,
+    device=None,
+    outdir=".",
+    metadata=None,
+    column=None,
+    profiler=None,
+    progress=None,
+):
+    r"""
+    Convert each cycle of the file ``filename`` recorded with ``device``
+    into a separate unitpackage with ``metadata`` written to ``outdir`` and
+    return the identifiers of the created unitpackages.
+
+    The cycles are determined from the cycle numbers in ``column`` or,
+    if not provided, in the :attr:`BaseLoader.cycle_column` of the loader.
+    The file is parsed in a single pass and only the data of a single cycle
+    is held in memory, see :meth:`BaseLoader.cycles`.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> outdir = tempfile.mkdtemp()
+        >>> filename = os.path.join(tempfile.mkdtemp(), "cv.csv")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("t,E,cycle\n0,0.1,1\n1,0.2,1\n2,0.1,2\n")
+        >>> convert_cycles(filename, outdir=outdir, column="cycle")
+        ['cv_cycle_1', 'cv_cycle_2']
+        >>> sorted(os.listdir(outdir))
+        ['cv_cycle_1.csv', 'cv_cycle_1.json', 'cv_cycle_2.csv', 'cv_cycle_2.json']
+
+    """
+    from unitpackage.entry import Entry
+
+    from echemdbconverters.compression import strip_suffix
+    from echemdbconverters.profiling import profile
+
+    loader = create_loader(filename, device, profiler=profiler, progress=progress)
+
+    if column:
+        loader.cycle_column = column
+
+    basename = strip_suffix(filename).stem
+    identifiers = []
+
+    for cycle, df in loader.cycles():
+        with profile(profiler, "from_df"):
+            entry = Entry.from_df(
+                df=df,
+                basename=f"{basename}_cycle_{cycle}",
+                metadata=metadata,
+                fields=_fields(metadata),
+            )
+
+        with profile(profiler, "save"):
+            entry.save(outdir=outdir)
+
+        identifiers.append(entry.identifier)
+
+    return identifiers
+
+
+def convert_file_streaming(  # pylint: disable=too-many-locals
+    filename,
+    device=None,
+    outdir=".",
+    metadata=None,
+    chunksize=100000,
+    profiler=None,
+    progress=None,
+):
+    r"""
+    Convert the file ``filename`` recorded with ``device`` into a unitpackage
+    with ``metadata`` written to ``outdir`` and return the identifier of the
+    unitpackage.
+
+    In contrast to :func:`convert_file`, the data is never held in memory
+    entirely. It is parsed in chunks of ``chunksize`` rows, which are written
+    to the output CSV immediately. The memory required is, therefore,
+    independent of the size of the file.
+
+    The descriptor is the one of an entry created from a sample of the data
+    which has the data types of all the data, see :func:`_write_chunks`,
+    i.e., the same descriptor as created by :func:`convert_file`.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> outdir = tempfile.mkdtemp()
+        >>> with TemporaryData("eclab_cv.mpt") as directory:
+        ...     convert_file_streaming(os.path.join(directory, "eclab_cv.mpt"), device="eclab",
+        ...         outdir=outdir, chunksize=10)
+        'eclab_cv'
+        >>> sorted(os.listdir(outdir))
+        ['eclab_cv.csv', 'eclab_cv.json']
+
+    The output is the same as when the entire file is converted at once::
+
+        >>> import json
+        >>> import pandas as pd
+        >>> expected = tempfile.mkdtemp()
+        >>> with TemporaryData("eclab_cv.mpt") as directory:
+        ...     entry = convert_file(os.path.join(directory, "eclab_cv.mpt"), device="eclab",
+        ...         outdir=expected)
+        >>> pd.read_csv(os.path.join(outdir, "eclab_cv.csv")).equals(entry.df)
+        True
+        >>> with open(os.path.join(outdir, "eclab_cv.json")) as actual:
+        ...     with open(os.path.join(expected, "eclab_cv.json")) as expected:
+        ...         json.load(actual) == json.load(expected)
+        True
+
+    TESTS:
+
+    The output files are named like the normalized name of the resource::
+
+        >>> filename = os.path.join(tempfile.mkdtemp(), "Data.csv")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("a,b\n0,0\n")
+        >>> convert_file_streaming(filename, outdir=outdir)
+        'data'
+        >>> "data.json" in os.listdir(outdir)
+        True
+
+    Files without data::
+
+        >>> filename = os.path.join(tempfile.mkdtemp(), "empty.csv")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("a,b\n")
+        >>> convert_file_streaming(filename, outdir=outdir)
+        'empty'
+        >>> with open(os.path.join(outdir, "empty.csv")) as file:
+        ...     file.read()
+        'a,b\n'
+
+    """
+    import os
+    import shutil
+    import tempfile
+
+    from unitpackage.entry import Entry
+
+    from echemdbconverters.compression import strip_suffix
+    from echemdbconverters.profiling import profile
+
+    loader = create_loader(filename, device, profiler=profiler, progress=progress)
+
+    os.makedirs(outdir, exist_ok=True)
+
+    # The name of the output files is only known once the entry is created.
+    with profile(profiler, "write") as record:
+        with tempfile.NamedTemporaryFile(
+            dir=outdir, prefix=".", suffix=".csv", delete=False
+        ) as csv:
+            try:
+                sample = _write_chunks(
+                    csv, loader.chunks(chunksize=chunksize), loader.column_header_names
+                )
+            except BaseException:
+                csv.close()
+                os.unlink(csv.name)
+                raise
+            record["bytes"] = csv.tell()
+
+    loader._report("describe")  # pylint: disable=protected-access
+    with profile(profiler, "describe"):
+        entry = Entry.from_df(
+            df=sample,
+            basename=strip_suffix(filename).stem,
+            metadata=metadata,
+            fields=_fields(metadata),
+        )
+
+        # Only the descriptor of the sample is kept.
+        staging = tempfile.mkdtemp()
+        try:
+            entry.save(outdir=staging)
+            os.replace(
+                os.path.join(staging, entry.identifier + ".json"),
+                os.path.join(outdir, entry.identifier + ".json"),
+            )
+        finally:
+            shutil.rmtree(staging)
+
+        os.replace(csv.name, os.path.join(outdir, entry.identifier + ".csv"))
+
+    return entry.identifier
+
+
+def _write_chunks(csv, chunks, names, sample=1000):
+    r"""
+    Write the dataframes ``chunks`` with the columns ``names`` as CSV to the
+    binary file ``csv`` and return the first ``sample`` rows written with the
+    data types of all the data written.
+
+    EXAMPLES::
+
+        >>> from io import BytesIO
+        >>> import pandas as pd
+        >>> csv = BytesIO()
+        >>> chunks = [pd.DataFrame({"a": [0, 1]}), pd.DataFrame({"a": [2.5]})]
+        >>> _write_chunks(csv, chunks, ["a"], sample=1)
+             a
+        0  0.0
+        >>> csv.getvalue()
+        b'a\n0\n1\n2.5\n'
+
+    Without any chunks, only the column names are written::
+
+        >>> csv = BytesIO()
+        >>> _write_chunks(csv, [], ["a", "b"])
+        Empty DataFrame
+        Columns: [a, b]
+        Index: []
+        >>> csv.getvalue()
+        b'a,b\n'
+
+    """
+    import pandas as pd
+
+    head = []
+    rows = 0
+    dtypes = {}
+
+    for chunk in chunks:
+        csv.write(chunk.to_csv(index=False, header=not dtypes).encode("utf-8"))
+
+        if rows < sample:
+            head.append(chunk.iloc[: sample - rows].copy())
+            rows += len(head[-1])
+
+        for column, dtype in chunk.dtypes.items():
+            dtypes[column] = _common_dtype(dtypes.get(column, dtype), dtype)
+
+    if not dtypes:
+        df = pd.DataFrame(columns=names)
+        csv.write(df.to_csv(index=False).encode("utf-8"))
+        return df
+
+    return pd.concat(head).astype(dtypes)
+
+
+def _common_dtype(dtype, other):
+    r"""
+    Return the data type of a column parsed by pandas whose parts were
+    parsed with ``dtype`` and ``other``.
+
+    EXAMPLES::
+
+        >>> import numpy as np
+        >>> _common_dtype(np.dtype(int), np.dtype(float))
+        dtype('float64')
+        >>> _common_dtype(np.dtype(int), np.dtype(object))
+        dtype('O')
+        >>> _common_dtype(np.dtype(bool), np.dtype(int))
+        dtype('O')
+
+    """
+    import numpy as np
+    import pandas as pd
+
+    if dtype == other:
+        return dtype
+
+    def numeric(dtype):
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+            dtype
+        )
+
+    if numeric(dtype) and numeric(other):
+        return np.result_type(dtype, other)
+
+    return np.dtype(object)
+
+
+def _fields(metadata):
+    r"""
+    Return the description of the fields in the ``metadata`` or ``None``
+    if the metadata does not describe the fields.
+
+    EXAMPLES::
+
+        >>> _fields({"figure description": {"fields": [{"name": "t", "unit": "s"}]}})
+        [{'name': 't', 'unit': 's'}]
+        >>> _fields(None)
+
+    """
+    if not metadata:
+        return None
+
+    try:
+        return metadata["figure description"]["fields"]
+    except (KeyError, AttributeError):
+        logger.warning("No units to the fields provided in the metadata")
+        return None
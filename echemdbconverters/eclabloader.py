@@ -70,7 +70,12 @@ The file can also be loaded from the base loader::
 # ********************************************************************
 
 
-from echemdbconverters.baseloader import BaseLoader
+import logging
+from functools import cached_property
+
+from echemdbconverters.baseloader import BaseLoader, _profiled
+
+logger = logging.getLogger("echemdb-converters")
 
 
 class ECLabLoader(BaseLoader):
@@ -102,9 +107,35 @@ class ECLabLoader(BaseLoader):
         >>> csv.column_header_names
         ['mode', 'time/s', 'Ewe/V', '<I>/mA', 'control/V']
 
+    The data of cyclic voltammograms can be split into cycles::
+
+        >>> file = StringIO('''EC-Lab ASCII FILE
+        ... Nb header lines : 4
+        ...
+        ... time/s\tEwe/V\tcycle number
+        ... 0\t0.1\t1.000000000000000E+000
+        ... 1\t1.4\t2.000000000000000E+000
+        ... ''')
+        >>> csv = BaseLoader.create('eclab')(file)
+        >>> csv.cycle_index
+        {1: (0, 1), 2: (1, 2)}
+
     """
 
-    @property
+    cycle_column = "cycle number"
+
+    _sidecar_indexes = [*BaseLoader._sidecar_indexes, "segment_index"]
+
+    _dependents = {
+        "header_lines": ["metadata", "header_techniques"],
+        "column_header_names": ["segment_index"],
+        "line_index": ["segment_index"],
+        "header_techniques": ["metadata", "segments"],
+        "segment_index": ["segments"],
+    }
+
+    @cached_property
+    @_profiled("header")
     def header_lines(self):
         r"""
         The number of header lines of an EC-Lab MPT file without column names.
@@ -129,18 +160,758 @@ class ECLabLoader(BaseLoader):
             5
 
         """
-        matches = []
+        import re
 
-        for line in self.file.readlines():
-            import re
+        expression = re.compile(
+            r"(?P<headerlines>Nb header lines) *\: *(?P<value>-?\d+\.?\d*)",
+            re.IGNORECASE,
+        )
 
-            match = re.findall(
-                r"(?P<headerlines>Nb header lines) *\: *(?P<value>-?\d+\.?\d*)",
-                str(line),
-                re.IGNORECASE,
-            )
+        for line in self._lines():
+            match = expression.search(line)
+
+            if match:
+                return int(match.group("value")) - 1
+
+        raise KeyError(
+            "Could not find a line containing `Nb header lines` in the file."
+        )
+
+    techniques = {
+        "Cyclic Voltammetry": "CV",
+        "Chronoamperometry / Chronocoulometry": "CA",
+        "Chronopotentiometry": "CP",
+        "Linear Sweep Voltammetry": "LSV",
+        "Open Circuit Voltage": "OCV",
+        "Potentio Electrochemical Impedance Spectroscopy": "PEIS",
+        "Galvano Electrochemical Impedance Spectroscopy": "GEIS",
+    }
+    r"""
+    The measurement types of the techniques named in the header of EC-Lab MPT files.
+    """
+
+    @cached_property
+    def metadata(self):
+        r"""
+        A dict containing the metadata found in the header of the MPT file,
+        i.e., the measurement type, the potentiostat, the reference electrode,
+        the material and the geometric area of the working electrode.
+
+        Only the header of the file is read.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 10
+            ...
+            ... Cyclic Voltammetry
+            ...
+            ... Device : VSP-300 (SN 0936)
+            ... Electrode material :
+            ... Reference electrode : SCE Saturated Calomel Electrode (0,241 V)
+            ... Electrode surface area : 0,001 cm²
+            ... Ei (V)              0,850
+            ... mode\ttime/s\tEwe/V
+            ... 2\t0\t0.1
+            ... ''')
+            >>> ECLabLoader(file).metadata  # doctest: +NORMALIZE_WHITESPACE
+            {'data description': {'measurement type': 'CV'},
+             'electrochemical system': {'instrumentation': [{'type': 'potentiostat', 'supplier': 'BioLogic VSP-300'}],
+                                        'electrodes': {'reference electrode': {'type': 'SCE'},
+                                                       'working electrode': {'geometric electrolyte contact area': {'value': 0.001, 'unit': 'cm2'}}}}}
+
+        TESTS:
+
+        Headers without metadata::
+
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... mode\ttime/s\tEwe/V
+            ... 2\t0\t0.1
+            ... ''')
+            >>> ECLabLoader(file).metadata
+            {}
+
+        """
+        import re
+
+        from echemdbconverters.metadata import quantity
+
+        values = {}
+
+        # Skip the lines "EC-Lab ASCII FILE" and "Nb header lines".
+        for line in self.header.readlines()[2:]:
+            match = re.match(r"^(?P<key>[^:]*[^ :]) *: *(?P<value>.*)$", line.strip())
 
             if match:
-                matches.append(match)
+                values.setdefault(match["key"], match["value"])
+
+        metadata = {}
+
+        # The measurement types of linked techniques are part of the metadata of the segments.
+        if len(self.header_techniques) == 1:
+            technique = self.header_techniques[0]
+            metadata["data description"] = {
+                "measurement type": self.techniques.get(technique, technique)
+            }
+
+        system = {}
+
+        if values.get("Device"):
+            model = re.sub(r" *\(SN .*\)$", "", values["Device"])
+            system["instrumentation"] = [
+                {"type": "potentiostat", "supplier": f"BioLogic {model}"}
+            ]
+
+        electrodes = {}
+
+        if values.get("Reference electrode"):
+            electrodes["reference electrode"] = {
+                "type": values["Reference electrode"].split()[0]
+            }
+
+        working = {}
+
+        if values.get("Electrode material"):
+            working["material"] = values["Electrode material"]
+
+        area = re.match(
+            r"^(?P<value>[-+\d.,Ee]+) *(?P<unit>.*)$",
+            values.get("Electrode surface area", ""),
+        )
+        if area:
+            # Files written with a lossy encoding lose the superscript of cm².
+            working["geometric electrolyte contact area"] = quantity(
+                area["value"], area["unit"].replace("\ufffd", "2")
+            )
+
+        if working:
+            electrodes["working electrode"] = working
+
+        if electrodes:
+            system["electrodes"] = electrodes
+
+        if system:
+            metadata["electrochemical system"] = system
+
+        return metadata
+
+    @cached_property
+    def header_techniques(self):
+        r"""
+        The names of the techniques listed in the header of the MPT file in
+        the order in which they were run.
+
+        Only the header of the file is read.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 6
+            ...
+            ... Cyclic Voltammetry
+            ... Ei (V)              0,850
+            ... mode\ttime/s\tEwe/V
+            ... 2\t0\t0.1
+            ... ''')
+            >>> ECLabLoader(file).header_techniques
+            ['Cyclic Voltammetry']
+
+        Files of linked techniques list all the techniques::
+
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 12
+            ...
+            ... Linked techniques
+            ...
+            ... Number of linked techniques : 2
+            ...
+            ... Technique : 1
+            ... Open Circuit Voltage
+            ... Technique : 2
+            ... Cyclic Voltammetry
+            ... mode\ttime/s\tEwe/V
+            ... 3\t0\t0.1
+            ... ''')
+            >>> ECLabLoader(file).header_techniques
+            ['Open Circuit Voltage', 'Cyclic Voltammetry']
+
+        """
+        import re
+
+        # Skip the lines "EC-Lab ASCII FILE" and "Nb header lines".
+        lines = [line.strip() for line in self.header.readlines()[2:]]
+
+        linked = [
+            name
+            for (line, name) in zip(lines, lines[1:])
+            if re.match(r"^Technique *: *\d+$", line)
+        ]
+        if linked:
+            return linked
+
+        for line in lines:
+            if re.match(r"^[^:]*[^ :] *: *.*$", line):
+                break
+            if line:
+                # The name of the technique precedes the settings of the experiment.
+                return [line]
+
+        return []
+
+    @cached_property
+    def segment_index(self):
+        r"""
+        The rows ``(start, stop)`` of each segment of the data in the MPT file.
+
+        A new segment starts when the ``mode`` of the potentiostat changes,
+        e.g., from rest to potentiostatic control, or when the ``control
+        changes`` flag drops to zero, which marks the start of a technique.
+        The boundaries are found with vectorized operations on chunks of
+        these two columns, the other columns are not parsed. The index is
+        recorded in the sidecar index of the loader, see :meth:`write_sidecar`.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... mode\tcontrol changes\ttime/s\tEwe/V
+            ... 3\t0\t0\t0.1
+            ... 3\t1\t1\t0.1
+            ... 2\t0\t2\t0.2
+            ... 2\t1\t3\t0.3
+            ... 2\t0\t4\t0.3
+            ... ''')
+            >>> ECLabLoader(file).segment_index
+            {1: (0, 2), 2: (2, 4), 3: (4, 5)}
+
+        TESTS:
+
+        Boundaries between chunks are detected::
+
+            >>> file.seek(0)
+            0
+            >>> csv = ECLabLoader(file)
+            >>> from unittest.mock import patch
+            >>> with patch.object(ECLabLoader, "chunks", lambda self, columns: BaseLoader.chunks(self, chunksize=2, columns=columns)):
+            ...     csv.segment_index
+            {1: (0, 2), 2: (2, 4), 3: (4, 5)}
+
+        Only the columns ``mode`` and ``control changes`` are parsed::
+
+            >>> file.seek(0)
+            0
+            >>> with patch.object(ECLabLoader, "chunks", autospec=True, side_effect=BaseLoader.chunks) as chunks:
+            ...     ECLabLoader(file).segment_index
+            {1: (0, 2), 2: (2, 4), 3: (4, 5)}
+            >>> chunks.call_args.kwargs
+            {'columns': ['mode', 'control changes']}
+
+        Files without these columns consist of a single segment::
+
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... time/s\tEwe/V
+            ... 0\t0.1
+            ... 1\t0.2
+            ... ''')
+            >>> ECLabLoader(file).segment_index
+            {1: (0, 2)}
+
+        """
+        import numpy as np
+
+        columns = [
+            column
+            for column in self.column_header_names
+            if column in ["mode", "control changes"]
+        ]
+
+        if not columns:
+            rows = self.line_index["rows"]
+            return self._update_sidecar("segment_index", {1: (0, rows)} if rows else {})
+
+        starts = []
+        rows = 0
+        previous = None
+
+        for chunk in self.chunks(columns=columns):
+            # Compare with the last row of the previous chunk.
+            mode = chunk["mode"].to_numpy() if "mode" in chunk else np.zeros(len(chunk))
+            control = (
+                chunk["control changes"].to_numpy()
+                if "control changes" in chunk
+                else np.ones(len(chunk))
+            )
+
+            if previous is None:
+                starts.append(0)
+            else:
+                mode = np.concatenate([[previous[0]], mode])
+                control = np.concatenate([[previous[1]], control])
+
+            changes = np.flatnonzero((np.diff(mode) != 0) | (np.diff(control) < 0))
+            offset = rows + (1 if previous is None else 0)
+            starts.extend((changes + offset).tolist())
+
+            previous = (mode[-1], control[-1])
+            rows += len(chunk)
+
+        return self._update_sidecar(
+            "segment_index",
+            {
+                segment: (start, stop)
+                for (segment, (start, stop)) in enumerate(
+                    zip(starts, [*starts[1:], rows]), 1
+                )
+            },
+        )
+
+    @cached_property
+    def segments(self):
+        r"""
+        The segments of the data in the MPT file such as the data of each
+        technique in a file of linked techniques, see :meth:`segment_index`.
+
+        The data of a segment is only parsed when it is accessed. When the
+        number of segments matches the number of :meth:`header_techniques`,
+        each segment is attributed to a technique. The same holds when there
+        is only a single technique.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 12
+            ...
+            ... Linked techniques
+            ...
+            ... Number of linked techniques : 2
+            ...
+            ... Technique : 1
+            ... Open Circuit Voltage
+            ... Technique : 2
+            ... Cyclic Voltammetry
+            ... mode\tcontrol changes\ttime/s\tEwe/V
+            ... 3\t0\t0\t0.1
+            ... 3\t1\t1\t0.1
+            ... 2\t0\t2\t0.2
+            ... 2\t1\t3\t0.3
+            ... ''')
+            >>> csv = ECLabLoader(file)
+            >>> csv.segments
+            [ECLabSegment(1, rows=(0, 2), technique='Open Circuit Voltage'), ECLabSegment(2, rows=(2, 4), technique='Cyclic Voltammetry')]
+            >>> csv.segments[1].metadata
+            {'data description': {'measurement type': 'CV'}}
+            >>> csv.segments[1].df
+               mode  control changes  time/s  Ewe/V
+            2     2                0       2    0.2
+            3     2                1       3    0.3
+
+        """
+        index = self.segment_index
+        techniques = self.header_techniques
+
+        if len(techniques) == 1:
+            techniques = techniques * len(index)
+        elif len(techniques) != len(index):
+            logger.warning(
+                f"Found {len(index)} segments in the data but {len(techniques)} techniques in the header. Segments are not attributed to techniques."
+            )
+            techniques = [None] * len(index)
+
+        return [
+            ECLabSegment(self, segment, rows, technique)
+            for ((segment, rows), technique) in zip(index.items(), techniques)
+        ]
+
+    impedance_columns = {
+        "frequency": "freq/Hz",
+        "real": "Re(Z)/Ohm",
+        "imaginary": "-Im(Z)/Ohm",
+    }
+    r"""
+    The columns of EC-Lab MPT files from which :meth:`impedance` is built.
+    Note that EC-Lab records the negative imaginary part of the impedance.
+    """
+
+    @property
+    def is_impedance(self):
+        r"""
+        Whether the MPT file contains impedance spectra, see :meth:`impedance`.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> ECLabLoader(StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... freq/Hz\tRe(Z)/Ohm\t-Im(Z)/Ohm
+            ... 1000\t10\t1''')).is_impedance
+            True
+
+        """
+        return all(
+            column in self.column_header_names
+            for column in self.impedance_columns.values()
+        )
+
+    @_profiled("parse")
+    def impedance(self):
+        r"""
+        Return the impedance spectra in the MPT file of an electrochemical
+        impedance spectroscopy measurement such as PEIS or GEIS.
+
+        Only the columns with the frequency and the real and imaginary parts
+        of the impedance are parsed. The complex impedance is assembled in a
+        single array and the data is split into frequency sweeps, see
+        :class:`ImpedanceSpectra`.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = ECLabLoader(StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... freq/Hz\tRe(Z)/Ohm\t-Im(Z)/Ohm\ttime/s
+            ... 1,0E+003\t10,0\t1,0\t0
+            ... 1,0E+002\t11,0\t5,0\t1
+            ... 1,0E+003\t10,5\t1,5\t2
+            ... 1,0E+002\t11,5\t5,5\t3
+            ... '''))
+            >>> spectra = csv.impedance()
+            >>> spectra
+            ImpedanceSpectra(2 sweeps, 4 points)
+            >>> spectra.impedance
+            array([10. -1.j , 11. -5.j , 10.5-1.5j, 11.5-5.5j])
+            >>> frequency, impedance = spectra[1]
+            >>> frequency
+            array([1000.,  100.])
+
+        TESTS:
+
+        Files without impedance data::
+
+            >>> ECLabLoader(StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... time/s\tEwe/V
+            ... 0\t0.1''')).impedance()
+            Traceback (most recent call last):
+            ...
+            ValueError: The data contains no impedance spectra. Columns freq/Hz, Re(Z)/Ohm, -Im(Z)/Ohm are required.
+
+        """
+        import numpy as np
+
+        from echemdbconverters.baseloader import _read_csv
+
+        if not self.is_impedance:
+            raise ValueError(
+                f"The data contains no impedance spectra. Columns {', '.join(self.impedance_columns.values())} are required."
+            )
+
+        columns = self.impedance_columns
+        options = {
+            **self._read_csv_options,
+            "usecols": list(columns.values()),
+            "dtype": np.float64,
+        }
+
+        try:
+            with self._progress_stream(self._data_stream(), "parse") as data:
+                df = _read_csv(data, options)
+        except UnicodeDecodeError:
+            if options["encoding"] == self.encoding:
+                raise
+
+            # The data contains non-ASCII characters that were not in the sample.
+            with self._progress_stream(self._data_stream(), "parse") as data:
+                df = _read_csv(data, {**options, "encoding": self.encoding})
+
+        frequency = df[columns["frequency"]].to_numpy()
+
+        # Assemble the complex impedance in place without temporary complex arrays.
+        impedance = np.empty(len(df), dtype=np.complex128)
+        impedance.real = df[columns["real"]].to_numpy()
+        np.negative(df[columns["imaginary"]].to_numpy(), out=impedance.imag)
+
+        return ImpedanceSpectra(
+            frequency, impedance, ImpedanceSpectra.sweep_offsets(frequency)
+        )
+
+    @classmethod
+    def _parse_column_header(cls, items):
+        r"""
+        Return a dict describing a column of an EC-Lab MPT file.
+
+        EC-Lab column names contain the unit separated by a ``/``.
+        The units are taken from the known BioLogic fields in
+        :mod:`echemdbconverters.column_names`.
+
+        EXAMPLES::
+
+            >>> ECLabLoader._parse_column_header(('Ewe/V',))
+            {'name': 'Ewe', 'unit': 'V', 'reference': None, 'original': 'Ewe/V'}
+
+            >>> ECLabLoader._parse_column_header(('(Q-Qo)/mA.h',))
+            {'name': '(Q-Qo)', 'unit': 'mA h', 'reference': None, 'original': '(Q-Qo)/mA.h'}
+
+            >>> ECLabLoader._parse_column_header(('Q charge/discharge/mA.h',))
+            {'name': 'Q charge/discharge', 'unit': 'mA h', 'reference': None, 'original': 'Q charge/discharge/mA.h'}
+
+        Columns without a unit are not split::
+
+            >>> ECLabLoader._parse_column_header(('ox/red',))
+            {'name': 'ox/red', 'unit': None, 'reference': None, 'original': 'ox/red'}
+
+        Unknown columns are split at the last ``/``::
+
+            >>> ECLabLoader._parse_column_header(('Temperature/°C',))
+            {'name': 'Temperature', 'unit': '°C', 'reference': None, 'original': 'Temperature/°C'}
+
+        The fields of a loaded file::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 4
+            ...
+            ... mode\ttime/s\tEwe/V
+            ... 2\t0\t0.1
+            ... ''')
+            >>> ECLabLoader(file).column_header_fields
+            [{'name': 'mode', 'unit': None, 'reference': None, 'original': 'mode'}, {'name': 'time', 'unit': 's', 'reference': None, 'original': 'time/s'}, {'name': 'Ewe', 'unit': 'V', 'reference': None, 'original': 'Ewe/V'}]
+
+        """
+        from echemdbconverters.column_names import biologic_fields_by_name
+
+        original = " / ".join(items)
+
+        if original in biologic_fields_by_name:
+            unit = biologic_fields_by_name[original].get("unit")
+            if unit is None:
+                name = original
+            else:
+                # The unit spans as many "/" separated parts as it contains itself.
+                name = original.rsplit("/", unit.count("/") + 1)[0]
+        elif "/" in original:
+            name, unit = original.rsplit("/", 1)
+        else:
+            name, unit = original, None
+
+        return {"name": name, "unit": unit, "reference": None, "original": original}
+
+
+class ECLabSegment:
+    r"""
+    A segment of the data of an EC-Lab MPT file, see :meth:`ECLabLoader.segments`.
+
+    EXAMPLES::
+
+        >>> from io import StringIO
+        >>> file = StringIO('''EC-Lab ASCII FILE
+        ... Nb header lines : 6
+        ...
+        ... Chronoamperometry / Chronocoulometry
+        ... Ei (V)              0,500
+        ... mode\ttime/s\tEwe/V
+        ... 2\t0\t0.5
+        ... ''')
+        >>> segment = ECLabLoader(file).segments[0]
+        >>> segment.df
+           mode  time/s  Ewe/V
+        0     2       0    0.5
+        >>> segment.metadata
+        {'data description': {'measurement type': 'CA'}}
+
+    """
+
+    def __init__(self, loader, number, rows, technique=None):
+        self.loader = loader
+        self.number = number
+        self.rows = rows
+        self.technique = technique
+
+    @property
+    def metadata(self):
+        r"""
+        The metadata of the loader with the measurement type of the technique of this segment.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = ECLabLoader(StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... mode\ttime/s
+            ... 2\t0'''))
+            >>> ECLabSegment(csv, 1, (0, 1)).metadata
+            {}
+
+        """
+        from echemdbconverters.metadata import merge
+
+        metadata = self.loader.metadata
+
+        if self.technique is None:
+            return merge(metadata, {})
+
+        return merge(
+            metadata,
+            {
+                "data description": {
+                    "measurement type": self.loader.techniques.get(
+                        self.technique, self.technique
+                    )
+                }
+            },
+        )
+
+    @property
+    def df(self):
+        r"""
+        A pandas dataframe of the rows of this segment.
+
+        Only the rows of the segment are parsed.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> csv = ECLabLoader(StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... mode\ttime/s
+            ... 2\t0
+            ... 3\t1'''))
+            >>> ECLabSegment(csv, 2, (1, 2)).df
+               mode  time/s
+            1     3       1
+
+        """
+        return self.loader.select(rows=self.rows)
+
+    def __repr__(self):
+        return f"ECLabSegment({self.number}, rows={self.rows}, technique={self.technique!r})"
+
+
+class ImpedanceSpectra:
+    r"""
+    Impedance spectra recorded in consecutive frequency sweeps.
+
+    The spectra are stored compactly in a ``frequency`` array and a complex
+    ``impedance`` array containing all sweeps. The ``offsets`` are the
+    indexes at which each sweep starts followed by the total number of points.
+
+    EXAMPLES::
+
+        >>> import numpy as np
+        >>> spectra = ImpedanceSpectra(np.array([100., 10., 100., 10.]),
+        ...     np.array([1 - 1j, 2 - 2j, 1 - 1j, 2 - 2j]), np.array([0, 2, 4]))
+        >>> len(spectra)
+        2
+        >>> spectra[0]
+        (array([100.,  10.]), array([1.-1.j, 2.-2.j]))
+
+    The sweeps are views of the arrays of all the sweeps::
+
+        >>> np.shares_memory(spectra[1][1], spectra.impedance)
+        True
+
+    """
+
+    def __init__(self, frequency, impedance, offsets):
+        self.frequency = frequency
+        self.impedance = impedance
+        self.offsets = offsets
+
+    @staticmethod
+    def sweep_offsets(frequency):
+        r"""
+        Return the indexes at which the frequency sweeps in ``frequency``
+        start followed by the total number of points.
+
+        A new sweep starts when the frequency changes in the opposite
+        direction of the first sweep.
+
+        EXAMPLES::
+
+            >>> import numpy as np
+            >>> ImpedanceSpectra.sweep_offsets(np.array([1e3, 1e2, 1e1, 1e3, 1e2, 1e3]))
+            array([0, 3, 5, 6])
+            >>> ImpedanceSpectra.sweep_offsets(np.array([1e1, 1e2, 1e1, 1e2]))
+            array([0, 2, 4])
+
+        TESTS:
+
+        Repeated frequencies do not start a new sweep::
+
+            >>> ImpedanceSpectra.sweep_offsets(np.array([1e3, 1e3, 1e2]))
+            array([0, 3])
+            >>> ImpedanceSpectra.sweep_offsets(np.array([]))
+            array([0])
+
+        """
+        import numpy as np
+
+        if len(frequency) == 0:
+            return np.zeros(1, dtype=np.int64)
+
+        steps = np.diff(frequency)
+        # The direction of the first step which changes the frequency.
+        direction = np.sign(steps[np.flatnonzero(steps)[:1]])
+
+        starts = np.flatnonzero(steps * direction < 0) + 1
+
+        return np.concatenate([[0], starts, [len(frequency)]]).astype(np.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, sweep):
+        r"""
+        Return the frequencies and the impedance of the ``sweep``.
+        """
+        if not -len(self) <= sweep < len(self):
+            raise IndexError(f"There is no sweep {sweep}.")
+
+        start, stop = (
+            self.offsets[sweep % len(self)],
+            self.offsets[sweep % len(self) + 1],
+        )
+
+        return self.frequency[start:stop], self.impedance[start:stop]
+
+    def save(self, filename):
+        r"""
+        Write the spectra to the NumPy ``.npz`` file ``filename``, which
+        can be read with :meth:`load`.
+
+        EXAMPLES::
+
+            >>> import os, tempfile
+            >>> import numpy as np
+            >>> filename = os.path.join(tempfile.mkdtemp(), "spectra.npz")
+            >>> ImpedanceSpectra(np.array([10.]), np.array([1 - 1j]), np.array([0, 1])).save(filename)
+            >>> ImpedanceSpectra.load(filename)[0]
+            (array([10.]), array([1.-1.j]))
+
+        """
+        import numpy as np
+
+        np.savez(
+            filename,
+            frequency=self.frequency,
+            impedance=self.impedance,
+            offsets=self.offsets,
+        )
+
+    @classmethod
+    def load(cls, filename):
+        r"""
+        Return the spectra written to ``filename`` with :meth:`save`.
+        """
+        import numpy as np
+
+        with np.load(filename) as spectra:
+            return cls(spectra["frequency"], spectra["impedance"], spectra["offsets"])
 
-        return int(matches[0][0][1]) - 1
+    def __repr__(self):
+        return f"ImpedanceSpectra({len(self)} sweeps, {len(self.frequency)} points)"
@@ -12,7 +12,11 @@ EXAMPLES::
     Options:
       --help  Show this message and exit.
     Commands:
+      batch  Convert files containing CSV data into echemdb unitpackages.
+      cache  Inspect and clear the cache of parsed data.
       csv  Convert a file containing CSV data into an echemdb unitpackage.
+      metadata  Print a metadata skeleton extracted from the header of a file.
+      validate  Check the data of a file for malformed rows and invalid values.
       ec   Convert an electrochemistry file into an echemdb datapackage.
 
 """
@@ -38,10 +42,8 @@ EXAMPLES::
 #  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
 # ********************************************************************
 import logging
-from pathlib import Path
 
 import click
-from unitpackage.entry import Entry
 
 logger = logging.getLogger("echemdb-converters")
 
@@ -57,7 +59,12 @@ def cli():
 
 @click.command(name="csv")
 @click.argument("csv", type=click.Path(exists=True))
-@click.option("--device", type=str, default=None, help="selects a specific CSVloader")
+@click.option(
+    "--device",
+    type=str,
+    default=None,
+    help="selects a specific CSVloader or a YAML or TOML file describing the layout of the file",
+)
 @click.option(
     "--outdir",
     type=click.Path(file_okay=False),
@@ -65,11 +72,96 @@ def cli():
     help="write output files to this directory",
 )
 @click.option(
-    "--metadata", type=click.File("rb"), default=None, help="yaml file with metadata"
+    "--metadata",
+    type=click.Path(exists=True, dir_okay=False),
+    multiple=True,
+    help="yaml file with metadata; metadata in later files overrides metadata in earlier files",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=0),
+    default=1,
+    help="number of processes parsing the data in parallel; 0 to use all cores",
+)
+@click.option(
+    "--chunksize",
+    type=click.IntRange(min=1),
+    default=None,
+    help="convert the data in chunks of this many rows with constant memory",
+)
+@click.option(
+    "--rows",
+    type=(int, int),
+    default=None,
+    help="convert only the rows from START up to (excluding) STOP",
+    metavar="START STOP",
+)
+@click.option(
+    "--where",
+    type=(str, float, float),
+    default=None,
+    help="convert only the rows with values of COLUMN between LO and HI",
+    metavar="COLUMN LO HI",
+)
+@click.option(
+    "--every",
+    type=click.IntRange(min=1),
+    default=None,
+    help="convert only every N-th row",
+    metavar="N",
 )
-def convert(csv, device, outdir, metadata):
+@click.option(
+    "--buckets",
+    type=click.IntRange(min=1),
+    default=None,
+    help="convert only the rows with minimal and maximal values in at most N buckets of rows",
+    metavar="N",
+)
+@click.option(
+    "--split-cycles",
+    "cycle_column",
+    is_flag=False,
+    flag_value="",
+    default=None,
+    help="write a unitpackage for each cycle; the cycle numbers are read from COLUMN or from the column known to the device",
+    metavar="[COLUMN]",
+)
+@click.option(
+    "--profile",
+    "profile_format",
+    type=click.Choice(["text", "json"]),
+    is_flag=False,
+    flag_value="text",
+    default=None,
+    help="report time, bytes and peak memory of each stage of the conversion",
+)
+@click.option(
+    "--progress",
+    "progress_format",
+    type=click.Choice(["bar", "json"]),
+    is_flag=False,
+    flag_value="bar",
+    default=None,
+    help="report the progress of the conversion as a bar or as JSON lines on stderr",
+)
+def convert(  # pylint: disable=too-many-locals
+    csv,
+    device,
+    outdir,
+    metadata,
+    processes,
+    chunksize,
+    rows,
+    where,
+    every,
+    buckets,
+    cycle_column,
+    profile_format,
+    progress_format,
+):
     """
     Convert a file containing CSV data into an echemdb unitpackage.
+    The file can be compressed with gzip, xz or zstd.
     \f
 
     EXAMPLES::
@@ -92,36 +184,504 @@ def convert(csv, device, outdir, metadata):
         ...     finally:
         ...         os.chdir(cwd)
 
+    Metadata can be combined from several files, e.g., from a template
+    shared by many files and metadata specific to this file::
+
+        >>> with TemporaryData("../**/unit.csv*") as directory:
+        ...     with open(os.path.join(directory, "template.yaml"), "w") as template:
+        ...         _ = template.write("source: {citation key: template}")
+        ...     invoke(cli, "csv", os.path.join(directory, "unit.csv"), "--metadata", os.path.join(directory, "template.yaml"),
+        ...         "--metadata", os.path.join(directory, "unit.csv.metadata"), "--outdir", directory)
+        ...     with open(os.path.join(directory, "unit.json")) as descriptor:
+        ...         "template" in descriptor.read()
+        True
+
+    The data can be parsed in parallel::
+
+        >>> with TemporaryData("../**/eclab_cv.mpt") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "eclab_cv.mpt"), "--device", "eclab", "--processes", "2", "--outdir", directory)
+
+    Large files can be converted in chunks without holding the entire data in memory::
+
+        >>> with TemporaryData("../**/eclab_cv.mpt") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "eclab_cv.mpt"), "--device", "eclab", "--chunksize", "10", "--outdir", directory)
+
+    Chunks cannot be parsed in parallel::
+
+        >>> with TemporaryData("../**/default.csv") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "default.csv"), "--chunksize", "10", "--processes", "2")
+        Usage: cli csv [OPTIONS] CSV
+        Try 'cli csv --help' for help.
+        <BLANKLINE>
+        Error: --processes and --chunksize cannot be combined.
+
+    A range of rows or of the values of a column can be converted::
+
+        >>> with TemporaryData("../**/eclab_ca.mpt") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "eclab_ca.mpt"), "--device", "eclab", "--where", "time/s", "1", "2", "--outdir", directory)
+        ...     invoke(cli, "csv", os.path.join(directory, "eclab_ca.mpt"), "--device", "eclab", "--rows", "10", "20", "--outdir", directory)
+        ...     with open(os.path.join(directory, "eclab_ca.csv")) as csv:
+        ...         len(csv.readlines())
+        11
+
+    The data can be decimated, e.g., to create a preview of a large file::
+
+        >>> with TemporaryData("../**/eclab_ca.mpt") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "eclab_ca.mpt"), "--device", "eclab", "--buckets", "3", "--outdir", directory)
+
+    The cycles of a cyclic voltammogram can be written to separate unitpackages::
+
+        >>> with TemporaryData("../**/eclab_cv.mpt") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "eclab_cv.mpt"), "--device", "eclab", "--split-cycles", "--outdir", directory)
+        ...     os.path.exists(os.path.join(directory, "eclab_cv_cycle_1.csv"))
+        True
+
+    The time, bytes and peak memory of the stages of the conversion can be reported::
+
+        >>> with TemporaryData("../**/default.csv") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "default.csv"), "--outdir", directory, "--profile")
+        stage        wall time        bytes  peak memory
+        header ...
+        save ...
+
+        >>> with TemporaryData("../**/default.csv") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "default.csv"), "--outdir", directory, "--profile", "json")
+        [{"stage": "header", ...}]
+
+    The progress of the conversion can be reported as JSON lines::
+
+        >>> with TemporaryData("../**/default.csv") as directory:
+        ...     invoke(cli, "csv", os.path.join(directory, "default.csv"), "--outdir", directory, "--progress", "json")
+        {"stage": "delimiter", "bytes": null, "total_bytes": 23, "rows": null}
+        ...
+        {"stage": "parse", "bytes": 23, "total_bytes": 23, "rows": 3}
+        {"stage": "from_df", "bytes": null, "total_bytes": 23, "rows": null}
+        {"stage": "save", "bytes": null, "total_bytes": 23, "rows": null}
+
     """
-    import yaml
+    import sys
 
-    from echemdbconverters.baseloader import BaseLoader
+    from echemdbconverters.conversion import (
+        convert_cycles,
+        convert_file,
+        convert_file_streaming,
+    )
+    from echemdbconverters.metadata import load_metadata
+    from echemdbconverters.profiling import Profiler, profile
+    from echemdbconverters.progress import JSONLines, ProgressBar
 
-    fields = None
+    _exclusive(
+        **{
+            "--processes": processes != 1,
+            "--chunksize": chunksize,
+            "--rows/--where": rows or where,
+            "--every/--buckets": every or buckets,
+            "--split-cycles": cycle_column is not None,
+        }
+    )
+    _exclusive(**{"--every": every, "--buckets": buckets})
+
+    profiler = Profiler(memory=True) if profile_format else None
+
+    progress = None
+    if progress_format == "bar":
+        progress = ProgressBar(sys.stderr)
+    elif progress_format == "json":
+        progress = JSONLines(sys.stderr)
 
     if metadata:
-        metadata = yaml.load(metadata, Loader=yaml.SafeLoader)
-        try:
-            fields = metadata["figure description"]["fields"]
-        except (KeyError, AttributeError):
-            logger.warning("No units to the fields provided in the metadata")
-
-    if device:
-        with open(csv, "r") as file:  # pylint: disable=unspecified-encoding
-            loader = BaseLoader.create(device)(file)
+        with profile(profiler, "metadata"):
+            metadata = load_metadata(*metadata)
     else:
-        with open(csv, "r") as file:  # pylint: disable=unspecified-encoding
-            loader = BaseLoader(file)
+        metadata = None
 
-    entry = Entry.from_df(
-        df=loader.df, basename=Path(csv).stem, metadata=metadata, fields=fields
-    )
-    entry.save(outdir=outdir)
+    if cycle_column is not None:
+        convert_cycles(
+            csv,
+            device=device,
+            outdir=outdir,
+            metadata=metadata,
+            column=cycle_column,
+            profiler=profiler,
+            progress=progress,
+        )
+    elif chunksize:
+        convert_file_streaming(
+            csv,
+            device=device,
+            outdir=outdir,
+            metadata=metadata,
+            chunksize=chunksize,
+            profiler=profiler,
+            progress=progress,
+        )
+    else:
+        convert_file(
+            csv,
+            device=device,
+            outdir=outdir,
+            metadata=metadata,
+            processes=processes or None,
+            profiler=profiler,
+            progress=progress,
+            rows=rows,
+            where=where,
+            every=every,
+            buckets=buckets,
+        )
+
+    if progress_format == "bar":
+        progress.close()
+
+    if profiler:
+        click.echo(
+            profiler.summary() if profile_format == "text" else profiler.to_json(),
+            err=True,
+        )
 
 
 cli.add_command(convert)
 
 
+@click.command(name="batch")
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--device",
+    type=str,
+    default=None,
+    help="selects a specific CSVloader or a YAML or TOML file describing the layout of the file",
+)
+@click.option(
+    "--outdir",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="write output files to this directory",
+)
+@click.option(
+    "--metadata",
+    type=click.Path(exists=True, dir_okay=False),
+    multiple=True,
+    help="yaml file with metadata shared by all files, e.g., a template",
+)
+@click.option(
+    "--memory",
+    type=click.IntRange(min=1),
+    default=None,
+    help="the memory in MiB that the conversions running at the same time must not exceed",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="number of files converted at the same time; defaults to the number of cores",
+)
+@click.option(
+    "--chunksize",
+    type=click.IntRange(min=1),
+    default=100000,
+    show_default=True,
+    help="number of rows per chunk for files converted in chunks",
+)
+def batch(files, device, outdir, metadata, memory, workers, chunksize):
+    """
+    Convert files containing CSV data into echemdb unitpackages.
+    The metadata of each file is read from a YAML file with the same name
+    and the suffix .metadata if it exists. It overrides the metadata
+    shared by all files.
+
+    The files are converted in parallel, largest first, such that the
+    estimated memory needed by the conversions does not exceed the given
+    memory. Files which do not fit into the memory are converted in chunks.
+    \f
+
+    EXAMPLES::
+
+        >>> import os.path
+        >>> from echemdbconverters.test.cli import invoke, TemporaryData
+        >>> with TemporaryData("../**/eclab_c?.mpt*") as directory:
+        ...     invoke(cli, "batch", os.path.join(directory, "eclab_cv.mpt"), os.path.join(directory, "eclab_ca.mpt"),
+        ...         "--device", "eclab", "--memory", "1024", "--outdir", directory)
+        ...     os.path.exists(os.path.join(directory, "eclab_ca.json"))
+        True
+
+    """
+    import os
+
+    from echemdbconverters.batch import convert_files
+    from echemdbconverters.metadata import load_metadata
+
+    templates = metadata
+    metadata = {}
+    for filename in files:
+        sidecars = (
+            [f"{filename}.metadata"] if os.path.exists(f"{filename}.metadata") else []
+        )
+        if templates or sidecars:
+            metadata[filename] = load_metadata(*templates, *sidecars)
+
+    convert_files(
+        files,
+        device=device,
+        outdir=outdir,
+        metadata=metadata,
+        memory=memory and memory * 2**20,
+        workers=workers,
+        chunksize=chunksize,
+    )
+
+
+cli.add_command(batch)
+
+
+@click.command(name="metadata")
+@click.argument("csv", type=click.Path(exists=True))
+@click.option(
+    "--device",
+    type=str,
+    default=None,
+    help="selects a specific CSVloader or a YAML or TOML file describing the layout of the file",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["yaml", "json"]),
+    default="yaml",
+    show_default=True,
+    help="format of the metadata",
+)
+def extract_metadata(csv, device, output_format):
+    """
+    Print a metadata skeleton extracted from the header of a file.
+    \f
+
+    EXAMPLES::
+
+        >>> import os.path
+        >>> from echemdbconverters.test.cli import invoke, TemporaryData
+        >>> with TemporaryData("../**/eclab_cv.mpt") as directory:
+        ...     invoke(cli, "metadata", os.path.join(directory, "eclab_cv.mpt"), "--device", "eclab")
+        data description:
+          measurement type: CV
+        electrochemical system:
+          instrumentation:
+          - type: potentiostat
+            supplier: BioLogic VSP-300
+          electrodes:
+            reference electrode:
+              type: SCE
+            working electrode:
+              material: Au/Pd
+              geometric electrolyte contact area:
+                value: 0.001
+                unit: cm2
+        figure description:
+          fields:
+          - name: mode
+        ...
+          - name: Ewe/V
+            unit: V
+        ...
+
+        >>> with TemporaryData("../**/default.csv") as directory:
+        ...     invoke(cli, "metadata", os.path.join(directory, "default.csv"), "--format", "json")
+        {"figure description": {"fields": [{"name": "t"}, {"name": "E"}, {"name": "j"}]}}
+
+    """
+    import json
+
+    import yaml
+
+    from echemdbconverters.conversion import create_loader
+    from echemdbconverters.metadata import skeleton
+
+    metadata = skeleton(create_loader(csv, device))
+
+    if output_format == "json":
+        click.echo(json.dumps(metadata, ensure_ascii=False))
+    else:
+        click.echo(
+            yaml.dump(
+                metadata,
+                Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                sort_keys=False,
+                allow_unicode=True,
+            ),
+            nl=False,
+        )
+
+
+cli.add_command(extract_metadata)
+
+
+@click.command(name="validate")
+@click.argument("csv", type=click.Path(exists=True))
+@click.option(
+    "--device",
+    type=str,
+    default=None,
+    help="selects a specific CSVloader or a YAML or TOML file describing the layout of the file",
+)
+def validate(csv, device):
+    """
+    Check the data of a file for malformed rows and invalid values.
+    The command fails when problems are found.
+    \f
+
+    EXAMPLES::
+
+        >>> import os.path
+        >>> from echemdbconverters.test.cli import invoke, TemporaryData
+        >>> with TemporaryData("../**/eclab_cv.mpt") as directory:
+        ...     invoke(cli, "validate", os.path.join(directory, "eclab_cv.mpt"), "--device", "eclab")
+        rows: 38
+
+        >>> import tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("t,E\\n0,0\\n1,x\\n2,2,2\\n")
+        >>> invoke(cli, "validate", filename)
+        rows: 3
+        fields: '2'
+        non-numeric:
+          E: '1'
+
+    """
+    import sys
+
+    import yaml
+
+    from echemdbconverters.conversion import create_loader
+
+    summary = create_loader(csv, device).validate()
+
+    click.echo(
+        yaml.dump(
+            summary,
+            Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+            sort_keys=False,
+            allow_unicode=True,
+        ),
+        nl=False,
+    )
+
+    if len(summary) > 1:
+        sys.exit(1)
+
+
+cli.add_command(validate)
+
+
+@click.group(name="cache")
+def cache():
+    r"""
+    Inspect and clear the cache of parsed data.
+    \f
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> from echemdbconverters.baseloader import BaseLoader
+        >>> from echemdbconverters.test.cli import invoke, TemporaryData
+        >>> directory = os.path.join(tempfile.mkdtemp(), "cache")
+        >>> with TemporaryData("../**/default.csv") as data:
+        ...     _ = BaseLoader(os.path.join(data, "default.csv"), cache=directory).df
+        >>> invoke(cli, "cache", "info", "--directory", directory)
+        directory: ...cache
+        entries: 1
+        size: 471 B
+        >>> invoke(cli, "cache", "info", "--directory", directory, "--verbose")
+        directory: ...cache
+        entries: 1
+        size: 471 B
+        ...  471 B  t, E, j
+        >>> invoke(cli, "cache", "clear", "--directory", directory)
+        Removed 1 entries.
+        >>> invoke(cli, "cache", "info", "--directory", directory)
+        directory: ...cache
+        entries: 0
+        size: 0 B
+
+    """
+
+
+_cache_directory = click.option(
+    "--directory",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="the cache directory; defaults to $ECHEMDB_CONVERTERS_CACHE or the user's cache directory",
+)
+
+
+@cache.command(name="info")
+@_cache_directory
+@click.option("--verbose", is_flag=True, help="list the entries of the cache")
+def cache_info(directory, verbose):
+    r"""
+    Print the size of the cache and its entries, most recently used first.
+    """
+    from echemdbconverters.cache import default_directory, entries
+    from echemdbconverters.profiling import _format_bytes
+
+    directory = directory or default_directory()
+    described = entries(directory)
+
+    click.echo(f"directory: {directory}")
+    click.echo(f"entries: {len(described)}")
+    click.echo(f"size: {_format_bytes(sum(entry['size'] for entry in described))}")
+
+    if verbose:
+        for entry in described:
+            click.echo(
+                f"{entry['key']}  {_format_bytes(entry['size'])}  {', '.join(entry['columns'])}"
+            )
+
+
+@cache.command(name="clear")
+@_cache_directory
+@click.option(
+    "--size",
+    type=int,
+    default=None,
+    help="only remove the least recently used entries until the cache takes at most this many MiB",
+)
+def cache_clear(directory, size):
+    r"""
+    Remove the entries of the cache.
+    """
+    from echemdbconverters.cache import clear, default_directory, evict
+
+    directory = directory or default_directory()
+
+    if size is None:
+        removed = clear(directory)
+    else:
+        removed = evict(directory, size * 2**20)
+
+    click.echo(f"Removed {len(removed)} entries.")
+
+
+cli.add_command(cache)
+
+
+def _exclusive(**options):
+    r"""
+    Raise a usage error when more than one of the ``options`` has been set.
+
+    EXAMPLES::
+
+        >>> _exclusive(**{"--every": 2, "--buckets": None})
+        >>> _exclusive(**{"--every": 2, "--buckets": 3})
+        Traceback (most recent call last):
+        ...
+        click.exceptions.UsageError: --every and --buckets cannot be combined.
+
+    """
+    given = [name for (name, value) in options.items() if value]
+
+    if len(given) > 1:
+        raise click.UsageError(f"{' and '.join(given)} cannot be combined.")
+
+
 # Register command docstrings for doctesting.
 # Since commands are not functions anymore due to their decorator, their
 # docstrings would otherwise be ignored.
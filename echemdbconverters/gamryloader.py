@@ -50,6 +50,11 @@ The file can also be loaded from the base loader::
     >>> csv.column_header_names
     ['Pt / #', 'T / s', 'Vf / V vs. Ref.', 'Im / A', 'Vu / V', 'Sig / V', 'Ach / V', 'IERange / #', 'Over / bits', 'Cycle / #', 'Temp / deg C']
 
+The names, units and references of the columns are available in a structured form::
+
+    >>> csv.column_header_fields[2]
+    {'name': 'Vf', 'unit': 'V', 'reference': 'Ref.', 'original': 'Vf / V vs. Ref.'}
+
 """
 
 # ********************************************************************
@@ -72,7 +77,9 @@ The file can also be loaded from the base loader::
 # ********************************************************************
 
 
-from echemdbconverters.baseloader import BaseLoader
+from functools import cached_property
+
+from echemdbconverters.baseloader import BaseLoader, _profiled
 
 
 class GamryLoader(BaseLoader):
@@ -105,8 +112,15 @@ class GamryLoader(BaseLoader):
         >>> csv.column_header_names
         ['Pt / #', 'T / s', 'Vf / V vs. Ref.', 'Im / A', 'Vu / V', 'Sig / V', 'Ach / V', 'IERange / #', 'Over / bits', 'Cycle / #', 'Temp / deg C']
 
+        >>> [cycle for (cycle, df) in csv.cycles()]
+        [0]
+
     """
 
+    cycle_column = "Cycle / #"
+
+    _dependents = {"header_lines": ["metadata"]}
+
     def _included_files(self):
         r"""
         Some Gamry files contain several files, e.g., cycles of a CV which are split
@@ -117,7 +131,8 @@ class GamryLoader(BaseLoader):
         """
         return NotImplementedError
 
-    @property
+    @cached_property
+    @_profiled("header")
     def header_lines(self):
         r"""
         The number of header lines of an EC-Lab MPT file without column names.
@@ -147,12 +162,100 @@ class GamryLoader(BaseLoader):
 
         expression = re.compile(r"CURVE\tTABLE\t(\d+)")
 
-        for idx, line in enumerate(self.file.readlines()):
+        for idx, line in enumerate(self._lines()):
             if expression.match(line):
                 return idx + 1
 
         raise KeyError("Could not find a line containing `Curve Label` in the file.")
 
+    @cached_property
+    def metadata(self):
+        r"""
+        A dict containing the metadata found in the header of the DTA file,
+        i.e., the measurement type, the potentiostat and the geometric area
+        of the working electrode.
+
+        Only the header of the file is read.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> file = StringIO('''EXPLAIN
+            ... TAG\tCV
+            ... PSTAT\tPSTAT\tREF600-25039\tPotentiostat
+            ... AREA\tQUANT\t1,00000E+000\tElectrode &Area (cm^2)
+            ... PSTATSERIALNO\tLABEL\t25039\tPstat Serial Number
+            ... CURVE\tTABLE\t3597
+            ... \tPt\tT\tVf
+            ... \t#\ts\tV vs. Ref.
+            ... \t0\t0,06\t2,00054E-001
+            ... ''')
+            >>> GamryLoader(file).metadata  # doctest: +NORMALIZE_WHITESPACE
+            {'data description': {'measurement type': 'CV'},
+             'electrochemical system': {'instrumentation': [{'type': 'potentiostat', 'supplier': 'Gamry REF600'}],
+                                        'electrodes': {'working electrode': {'geometric electrolyte contact area': {'value': 1.0, 'unit': 'cm2'}}}}}
+
+        TESTS:
+
+        Header entries without a value are ignored::
+
+            >>> file = StringIO('''EXPLAIN
+            ... PSTAT\tPSTAT\tREF600-25039\tPotentiostat
+            ... PSTATSERIALNO\tLABEL
+            ... AREA\tQUANT
+            ... CURVE\tTABLE\t3597
+            ... \tPt\tT\tVf
+            ... \t#\ts\tV vs. Ref.
+            ... \t0\t0,06\t2,00054E-001
+            ... ''')
+            >>> GamryLoader(file).metadata
+            {'electrochemical system': {'instrumentation': [{'type': 'potentiostat', 'supplier': 'Gamry REF600-25039'}]}}
+
+        """
+        import re
+
+        from echemdbconverters.metadata import quantity
+
+        values = {}
+
+        for line in self.header.readlines():
+            items = line.rstrip("\r\n").split("\t")
+            if len(items) >= 2 and items[0]:
+                values.setdefault(items[0], items[1:])
+
+        metadata = {}
+
+        if "TAG" in values:
+            metadata["data description"] = {"measurement type": values["TAG"][0]}
+
+        system = {}
+
+        if len(values.get("PSTAT", [])) >= 2:
+            # The name of the potentiostat ends with its serial number.
+            model = values["PSTAT"][1]
+            if len(values.get("PSTATSERIALNO", [])) >= 2:
+                serial = values["PSTATSERIALNO"][1]
+                if serial:
+                    model = model.removesuffix(f"-{serial}")
+            system["instrumentation"] = [
+                {"type": "potentiostat", "supplier": f"Gamry {model}"}
+            ]
+
+        if len(values.get("AREA", [])) >= 3:
+            unit = re.search(r"\((?P<unit>[^)]*)\)$", values["AREA"][2])
+            system["electrodes"] = {
+                "working electrode": {
+                    "geometric electrolyte contact area": quantity(
+                        values["AREA"][1], unit["unit"] if unit else "cm2"
+                    )
+                }
+            }
+
+        if system:
+            metadata["electrochemical system"] = system
+
+        return metadata
+
     @property
     def column_header_lines(self):
         r"""The number of lines containing descriptive information
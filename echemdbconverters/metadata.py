@@ -0,0 +1,220 @@
+r"""
+Loading of the YAML files with the metadata of the converted files and
+extraction of metadata skeletons from the headers of files.
+
+Metadata files are parsed with the C implementation of the YAML parser if
+it is available. The parsed files are cached, so that a template shared by
+many files is only parsed once during a batch conversion. A file is parsed
+again when it has been modified.
+
+Several files can be merged, e.g., a template with the metadata shared
+by many files and the metadata specific to a single file::
+
+    >>> import os, tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> with open(os.path.join(directory, "template.yaml"), "w") as file:
+    ...     _ = file.write("experiment:\n  type: BCV\n  comment: intended approach\n")
+    >>> with open(os.path.join(directory, "data.csv.metadata"), "w") as file:
+    ...     _ = file.write("experiment:\n  comment: second attempt\n")
+    >>> load_metadata(os.path.join(directory, "template.yaml"), os.path.join(directory, "data.csv.metadata"))
+    {'experiment': {'type': 'BCV', 'comment': 'second attempt'}}
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+from functools import lru_cache
+
+
+def load_metadata(*filenames):
+    r"""
+    Return the metadata in the YAML files ``filenames`` merged with
+    :func:`merge`, i.e., the metadata in later files takes precedence.
+
+    The returned metadata can be modified without affecting the cached
+    metadata.
+
+    EXAMPLES::
+
+        >>> import os
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("eclab_cv.mpt.metadata") as directory:
+        ...     metadata = load_metadata(os.path.join(directory, "eclab_cv.mpt.metadata"))
+        >>> metadata["experiment"]
+        {'type': 'BCV', 'comment': 'intended approach'}
+
+    Files are only parsed again when they have been modified::
+
+        >>> import tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv.metadata")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("experiment: {type: BCV}")
+        >>> load_metadata(filename)["experiment"]["comment"] = "modified"
+        >>> _parse.cache_clear()
+        >>> load_metadata(filename), load_metadata(filename)
+        ({'experiment': {'type': 'BCV'}}, {'experiment': {'type': 'BCV'}})
+        >>> _parse.cache_info().misses
+        1
+
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("experiment: {type: CV, comment: modified}")
+        >>> load_metadata(filename)
+        {'experiment': {'type': 'CV', 'comment': 'modified'}}
+
+    TESTS:
+
+    Empty files contain no metadata::
+
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("")
+        >>> load_metadata(filename)
+        {}
+
+    """
+    import copy
+    import os
+
+    metadata = {}
+
+    for filename in filenames:
+        stat = os.stat(filename)
+        metadata = merge(
+            metadata,
+            _parse(os.path.abspath(filename), stat.st_mtime_ns, stat.st_size),
+        )
+
+    return copy.deepcopy(metadata)
+
+
+@lru_cache(maxsize=256)
+def _parse(filename, mtime, size):  # pylint: disable=unused-argument
+    r"""
+    Return the metadata parsed from the YAML file ``filename``.
+
+    The ``mtime`` and ``size`` of the file are only used to invalidate the
+    cache when the file has been modified.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv.metadata")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("experiment: {type: BCV}")
+        >>> _parse(filename, None, None)
+        {'experiment': {'type': 'BCV'}}
+
+    """
+    import yaml
+
+    # The C implementation is much faster but not available in all installations of PyYAML.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    with open(filename, "rb") as file:
+        return yaml.load(file, Loader=loader) or {}
+
+
+def merge(metadata, override):
+    r"""
+    Return the ``metadata`` updated recursively with ``override``.
+
+    Nested dicts are merged, all other values such as lists are replaced.
+    Neither ``metadata`` nor ``override`` are modified.
+
+    EXAMPLES::
+
+        >>> merge({"experiment": {"type": "BCV", "tags": ["a"]}, "source": "lab"},
+        ...     {"experiment": {"tags": ["b"]}, "curator": "me"})
+        {'experiment': {'type': 'BCV', 'tags': ['b']}, 'source': 'lab', 'curator': 'me'}
+
+    """
+    merged = dict(metadata)
+
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = value
+
+    return merged
+
+
+def skeleton(loader):
+    r"""
+    Return a skeleton of the metadata of the file loaded with ``loader``.
+
+    The skeleton contains the :meth:`~echemdbconverters.baseloader.BaseLoader.metadata`
+    found in the header of the file and a description of the fields derived
+    from the :meth:`~echemdbconverters.baseloader.BaseLoader.column_header_fields`.
+    Only the header and the first lines of the data, from which the delimiter
+    is determined, are read.
+
+    EXAMPLES::
+
+        >>> import os
+        >>> from echemdbconverters.baseloader import BaseLoader
+        >>> from echemdbconverters.test.cli import TemporaryData
+        >>> with TemporaryData("eclab_cv.mpt") as directory:
+        ...     metadata = skeleton(BaseLoader.create("eclab")(os.path.join(directory, "eclab_cv.mpt")))
+        >>> metadata["data description"]
+        {'measurement type': 'CV'}
+        >>> metadata["figure description"]["fields"][7]
+        {'name': 'Ewe/V', 'unit': 'V'}
+
+    Loaders which do not extract metadata from the header only describe the fields::
+
+        >>> from io import StringIO
+        >>> skeleton(BaseLoader(StringIO("T,E\nK,V vs. RHE\n0,0"), column_header_lines=2))
+        {'figure description': {'fields': [{'name': 'T / K', 'unit': 'K'}, {'name': 'E / V vs. RHE', 'unit': 'V', 'reference': 'RHE'}]}}
+
+    """
+    try:
+        metadata = loader.metadata
+    except NotImplementedError:
+        metadata = {}
+
+    fields = [
+        {
+            "name": field["original"],
+            **{key: field[key] for key in ["unit", "reference"] if field[key]},
+        }
+        for field in loader.column_header_fields
+    ]
+
+    return merge(metadata, {"figure description": {"fields": fields}})
+
+
+def quantity(value, unit):
+    r"""
+    Return a dict describing the quantity ``value`` in ``unit`` as found in
+    the header of a file.
+
+    The value can use a decimal comma. Superscript powers in the unit are
+    replaced with plain numbers.
+
+    EXAMPLES::
+
+        >>> quantity("0,001", "cm²")
+        {'value': 0.001, 'unit': 'cm2'}
+        >>> quantity("1,00000E+000", "cm^2")
+        {'value': 1.0, 'unit': 'cm2'}
+
+    """
+    unit = unit.replace("²", "2").replace("³", "3").replace("^", "")
+
+    return {"value": float(value.replace(",", ".")), "unit": unit}
@@ -0,0 +1,254 @@
+r"""
+Instrumentation of the stages of loading and converting files.
+
+A :class:`Profiler` records the wall time, the number of bytes processed and
+the peak memory for each stage of a conversion, such as detecting the
+delimiter of a file or parsing its data.
+
+EXAMPLES::
+
+    >>> from io import StringIO
+    >>> from echemdbconverters.baseloader import BaseLoader
+    >>> profiler = Profiler()
+    >>> file = StringIO('''a,b
+    ... 0,0
+    ... 1,1''')
+    >>> csv = BaseLoader(file, profiler=profiler)
+    >>> csv.df
+       a  b
+    0  0  0
+    1  1  1
+
+    >>> [record["stage"] for record in profiler.records]
+    ['header', 'encoding', 'delimiter', 'decimal', 'parse']
+
+The records can be forwarded to other systems with a callback::
+
+    >>> records = []
+    >>> profiler = Profiler(callback=records.append)
+    >>> with profiler.stage("convert"):
+    ...     pass
+    >>> records[0]["stage"]
+    'convert'
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+from contextlib import contextmanager
+
+
+class Profiler:
+    r"""
+    Records the wall time, the bytes processed, and the peak memory of
+    stages of a conversion.
+
+    Each record is a dict with the keys ``stage``, ``wall_time`` (in seconds),
+    ``bytes``, and ``peak_memory`` (in bytes). Bytes are only recorded for
+    stages which process the data of a file. The peak memory allocated during
+    a stage is measured with :mod:`tracemalloc` and only recorded when
+    ``memory`` is set, since tracing memory allocations slows down the
+    conversion.
+
+    When a ``callback`` is provided, it is invoked with each record as soon as
+    a stage has finished.
+
+    EXAMPLES::
+
+        >>> profiler = Profiler(memory=True)
+        >>> with profiler.stage("allocate") as record:
+        ...     data = bytearray(2**20)
+        ...     record["bytes"] = len(data)
+        >>> record = profiler.records[0]
+        >>> record["stage"], record["bytes"], record["peak_memory"] >= 2**20
+        ('allocate', 1048576, True)
+
+    """
+
+    def __init__(self, callback=None, memory=False):
+        self.records = []
+        self._callback = callback
+        self._memory = memory
+        self._stack = []
+        self._tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        r"""
+        Record the stage ``name`` while the context is active.
+
+        The context provides the record of the stage, which can be updated,
+        e.g., with the number of ``bytes`` processed.
+
+        EXAMPLES:
+
+        Stages can be nested. The peak memory of an outer stage includes the
+        peak memory of its inner stages::
+
+            >>> profiler = Profiler(memory=True)
+            >>> with profiler.stage("outer"):
+            ...     with profiler.stage("inner"):
+            ...         data = bytearray(2**20)
+            ...     del data
+            >>> [record["stage"] for record in profiler.records]
+            ['inner', 'outer']
+            >>> profiler.records[1]["peak_memory"] >= profiler.records[0]["peak_memory"]
+            True
+
+        """
+        import time
+
+        record = {"stage": name, "wall_time": None, "bytes": None, "peak_memory": None}
+
+        if self._memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+
+            if self._stack:
+                # Keep the peak of the outer stage before measuring the peak of this stage.
+                self._stack[-1]["peak"] = max(
+                    self._stack[-1]["peak"], tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+
+        frame = {"peak": 0}
+        self._stack.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - start
+
+            self._stack.pop()
+
+            if self._memory:
+                import tracemalloc
+
+                record["peak_memory"] = max(
+                    frame["peak"], tracemalloc.get_traced_memory()[1]
+                )
+
+                if self._stack:
+                    self._stack[-1]["peak"] = max(
+                        self._stack[-1]["peak"], record["peak_memory"]
+                    )
+                elif self._tracing:
+                    tracemalloc.stop()
+                    self._tracing = False
+
+            self.records.append(record)
+
+            if self._callback is not None:
+                self._callback(record)
+
+    def summary(self):
+        r"""
+        Return a human readable summary of the recorded stages.
+
+        EXAMPLES::
+
+            >>> profiler = Profiler()
+            >>> profiler.records.append({"stage": "parse", "wall_time": 1.5, "bytes": 2**21, "peak_memory": None})
+            >>> print(profiler.summary())
+            stage        wall time        bytes  peak memory
+            parse          1.500 s      2.0 MiB            -
+
+        """
+        lines = [f"{'stage':<10} {'wall time':>11} {'bytes':>12} {'peak memory':>12}"]
+
+        for record in self.records:
+            lines.append(
+                f"{record['stage']:<10} {record['wall_time']:>9.3f} s "
+                f"{_format_bytes(record['bytes']):>12} "
+                f"{_format_bytes(record['peak_memory']):>12}"
+            )
+
+        return "\n".join(lines)
+
+    def to_json(self):
+        r"""
+        Return the recorded stages as a JSON string.
+
+        EXAMPLES::
+
+            >>> profiler = Profiler()
+            >>> profiler.records.append({"stage": "parse", "wall_time": 1.5, "bytes": 1024, "peak_memory": None})
+            >>> profiler.to_json()
+            '[{"stage": "parse", "wall_time": 1.5, "bytes": 1024, "peak_memory": null}]'
+
+        """
+        import json
+
+        return json.dumps(self.records)
+
+
+def profile(profiler, name):
+    r"""
+    Return a context recording the stage ``name`` with ``profiler``.
+
+    When ``profiler`` is ``None``, nothing is recorded.
+
+    EXAMPLES::
+
+        >>> with profile(None, "parse") as record:
+        ...     record["bytes"] = 1024
+
+        >>> profiler = Profiler()
+        >>> with profile(profiler, "parse") as record:
+        ...     record["bytes"] = 1024
+        >>> profiler.records[0]["bytes"]
+        1024
+
+    """
+    if profiler is None:
+        from contextlib import nullcontext
+
+        return nullcontext({})
+
+    return profiler.stage(name)
+
+
+def _format_bytes(size):
+    r"""
+    Return a human readable representation of ``size`` bytes.
+
+    EXAMPLES::
+
+        >>> _format_bytes(512)
+        '512 B'
+        >>> _format_bytes(3 * 2**30)
+        '3.0 GiB'
+        >>> _format_bytes(None)
+        '-'
+
+    """
+    if size is None:
+        return "-"
+
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} GiB"
@@ -0,0 +1,227 @@
+r"""
+Reporting of the progress of loading and converting files.
+
+Loaders report their progress to a ``progress`` callback, which is invoked
+with events such as ``{"stage": "parse", "bytes": 1024, "total_bytes": 4096, "rows": 10}``.
+The ``bytes`` are the position in the (decompressed) file, ``total_bytes`` is
+the size of the file if it is known, and ``rows`` is the number of rows
+parsed so far if it is known.
+
+EXAMPLES::
+
+    >>> from io import StringIO
+    >>> from echemdbconverters.baseloader import BaseLoader
+    >>> events = []
+    >>> file = StringIO('''a,b
+    ... 0,0
+    ... 1,1''')
+    >>> csv = BaseLoader(file, progress=events.append)
+    >>> csv.df
+       a  b
+    0  0  0
+    1  1  1
+
+    >>> events[-1]
+    {'stage': 'parse', 'bytes': 11, 'total_bytes': 11, 'rows': 2}
+
+Stages are reported when they start, so the detection of the delimiter,
+which requires the header, is reported before the header. The events can be
+written as JSON lines::
+
+    >>> import sys
+    >>> csv = BaseLoader(StringIO("a,b\n0,0"), progress=JSONLines(sys.stdout))
+    >>> csv.df
+    {"stage": "delimiter", "bytes": null, "total_bytes": 7, "rows": null}
+    {"stage": "header", "bytes": null, "total_bytes": 7, "rows": null}
+    {"stage": "encoding", "bytes": null, "total_bytes": 7, "rows": null}
+    {"stage": "decimal", "bytes": null, "total_bytes": 7, "rows": null}
+    {"stage": "parse", "bytes": 7, "total_bytes": 7, "rows": 1}
+       a  b
+    0  0  0
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+import io
+
+
+def event(
+    stage, bytes=None, total_bytes=None, rows=None
+):  # pylint: disable=redefined-builtin
+    r"""
+    Return a progress event of ``stage``.
+
+    EXAMPLES::
+
+        >>> event("parse", bytes=1024)
+        {'stage': 'parse', 'bytes': 1024, 'total_bytes': None, 'rows': None}
+
+    """
+    return {"stage": stage, "bytes": bytes, "total_bytes": total_bytes, "rows": rows}
+
+
+class JSONLines:  # pylint: disable=too-few-public-methods
+    r"""
+    A progress callback writing each event as a line of JSON to ``file``.
+
+    EXAMPLES::
+
+        >>> from io import StringIO
+        >>> file = StringIO()
+        >>> progress = JSONLines(file)
+        >>> progress(event("parse", bytes=1024))
+        >>> file.getvalue()
+        '{"stage": "parse", "bytes": 1024, "total_bytes": null, "rows": null}\n'
+
+    """
+
+    def __init__(self, file):
+        self._file = file
+
+    def __call__(self, event):  # pylint: disable=redefined-outer-name
+        import json
+
+        self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+
+
+class ProgressBar:
+    r"""
+    A progress callback rendering the events as a progress bar on ``file``.
+
+    The bar is redrawn in place and terminated with a newline when
+    :meth:`close` is called.
+
+    EXAMPLES::
+
+        >>> from io import StringIO
+        >>> file = StringIO()
+        >>> progress = ProgressBar(file, width=10)
+        >>> progress(event("parse", bytes=2**20, total_bytes=2**22, rows=1000))
+        >>> file.getvalue()
+        '\r[##........]  25% parse      1.0 MiB / 4.0 MiB  1000 rows'
+
+    When the size of the file is not known, no bar is shown::
+
+        >>> file = StringIO()
+        >>> progress = ProgressBar(file)
+        >>> progress(event("parse", bytes=2**20))
+        >>> progress.close()
+        >>> file.getvalue()
+        '\rparse      1.0 MiB\n'
+
+    """
+
+    def __init__(self, file, width=30):
+        self._file = file
+        self._width = width
+        self._length = 0
+
+    def __call__(self, event):  # pylint: disable=redefined-outer-name
+        from echemdbconverters.profiling import _format_bytes
+
+        line = ""
+
+        if event["total_bytes"] and event["bytes"] is not None:
+            fraction = min(event["bytes"] / event["total_bytes"], 1)
+            done = int(fraction * self._width)
+            line += f"[{'#' * done}{'.' * (self._width - done)}] {fraction:4.0%} "
+
+        line += f"{event['stage']:<10}"
+
+        if event["bytes"] is not None:
+            line += f" {_format_bytes(event['bytes'])}"
+            if event["total_bytes"]:
+                line += f" / {_format_bytes(event['total_bytes'])}"
+
+        if event["rows"] is not None:
+            line += f"  {event['rows']} rows"
+
+        # Overwrite the remainder of a longer previous line.
+        padding = " " * max(self._length - len(line), 0)
+        self._length = len(line)
+
+        self._file.write("\r" + line + padding)
+        self._file.flush()
+
+    def close(self):
+        r"""
+        Terminate the progress bar with a newline.
+        """
+        if self._length:
+            self._file.write("\n")
+            self._file.flush()
+            self._length = 0
+
+
+class ProgressReader(io.RawIOBase):
+    r"""
+    A binary file object reading from ``file`` and invoking
+    ``callback`` with the position in the file after at least
+    ``interval`` bytes have been read since the last invocation.
+
+    EXAMPLES::
+
+        >>> from io import BytesIO
+        >>> positions = []
+        >>> reader = ProgressReader(BytesIO(b"0123456789"), positions.append, interval=4)
+        >>> reader.read(3), reader.read(3), reader.read()
+        (b'012', b'345', b'6789')
+        >>> positions
+        [6, 10]
+
+    """
+
+    def __init__(self, file, callback, interval=2**22):
+        super().__init__()
+        self._file = file
+        self._callback = callback
+        self._interval = interval
+        self._position = file.tell()
+        self._reported = self._position
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        read = self._file.readinto(buffer)
+
+        if read:
+            self._position += read
+            if self._position - self._reported >= self._interval:
+                self.report()
+
+        return read
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def report(self):
+        r"""
+        Invoke the callback with the current position in the file.
+        """
+        self._reported = self._position
+        self._callback(self._position)
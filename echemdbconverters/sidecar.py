@@ -0,0 +1,203 @@
+r"""
+Persistent indexes of files stored next to the files.
+
+A sidecar index records the properties of a file determined by a loader,
+such as the number of header lines, the delimiter, the decimal separator,
+the column names, and the offsets of the data lines. When the file is
+loaded again, these properties are read from the sidecar index instead
+of scanning the file again.
+
+The sidecar index is only used when the size and the modification time of
+the file and the options of the loader have not changed since it was written.
+
+EXAMPLES::
+
+    >>> import os, tempfile
+    >>> from echemdbconverters.baseloader import BaseLoader
+    >>> filename = os.path.join(tempfile.mkdtemp(), "data.csv")
+    >>> with open(filename, "w") as file:
+    ...     _ = file.write("t,E\n0,0.1\n1,0.2\n")
+    >>> csv = BaseLoader(filename, sidecar=True)
+    >>> csv.line_index
+    {'interval': 1000, 'offsets': [4], 'rows': 2}
+    >>> os.path.exists(filename + ".index.json")
+    True
+
+When the file is loaded again, the index does not need to be created again::
+
+    >>> csv = BaseLoader(filename, sidecar=True)
+    >>> "line_index" in csv.__dict__
+    True
+    >>> csv.delimiter
+    ','
+
+The sidecar index is discarded when the file has been modified::
+
+    >>> with open(filename, "a") as file:
+    ...     _ = file.write("2,0.3\n")
+    >>> csv = BaseLoader(filename, sidecar=True)
+    >>> "line_index" in csv.__dict__
+    False
+    >>> csv.line_index["rows"]
+    3
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+
+import logging
+
+logger = logging.getLogger("echemdb-converters")
+
+VERSION = 2
+r"""
+The version of the format of sidecar indexes. Sidecar indexes written
+with another version are ignored.
+"""
+
+RANGES = ["cycle_index", "segment_index"]
+r"""
+The properties which map numbers to ranges of rows ``(start, stop)``.
+Since JSON objects only have string keys, these are stored as lists of
+``[number, start, stop]``.
+"""
+
+
+def _stat(source):
+    r"""
+    Return the size and the modification time of the file ``source``.
+
+    EXAMPLES::
+
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile() as file:
+        ...     _stat(file.name)["size"]
+        0
+
+    """
+    import os
+
+    stat = os.stat(source)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def read_sidecar(filename, source, options):
+    r"""
+    Return the properties recorded in the sidecar index ``filename`` of the
+    file ``source`` for a loader with ``options``.
+
+    Returns an empty dict when there is no such index or when the index is
+    outdated.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> source = os.path.join(tempfile.mkdtemp(), "data.csv")
+        >>> with open(source, "w") as file:
+        ...     _ = file.write("a,b\n0,0\n")
+        >>> write_sidecar(source + ".index.json", source, {"loader": "BaseLoader"}, {"delimiter": ",", "cycle_index": {1: (0, 1)}})
+        >>> read_sidecar(source + ".index.json", source, {"loader": "BaseLoader"})
+        {'delimiter': ',', 'cycle_index': {1: (0, 1)}}
+
+    Indexes created for other options are ignored::
+
+        >>> read_sidecar(source + ".index.json", source, {"loader": "ECLabLoader"})
+        {}
+
+    Missing and invalid indexes are ignored::
+
+        >>> read_sidecar(source + ".missing.json", source, {"loader": "BaseLoader"})
+        {}
+
+        >>> with open(source + ".index.json", "w") as file:
+        ...     _ = file.write("{")
+        >>> read_sidecar(source + ".index.json", source, {"loader": "BaseLoader"})
+        {}
+
+    """
+    import json
+
+    try:
+        with open(filename, encoding="utf-8") as file:
+            index = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring invalid sidecar index {filename}: {e}")
+        return {}
+
+    if (
+        index.get("version") != VERSION
+        or index.get("file") != _stat(source)
+        or index.get("options") != options
+    ):
+        return {}
+
+    properties = index["properties"]
+
+    for name in RANGES:
+        if name in properties:
+            properties[name] = {
+                number: (start, stop) for (number, start, stop) in properties[name]
+            }
+
+    return properties
+
+
+def write_sidecar(filename, source, options, properties):
+    r"""
+    Write the ``properties`` of the file ``source`` determined by a loader
+    with ``options`` to the sidecar index ``filename``.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> source = os.path.join(tempfile.mkdtemp(), "data.csv")
+        >>> with open(source, "w") as file:
+        ...     _ = file.write("a,b\n0,0\n")
+        >>> write_sidecar(source + ".index.json", source, {}, {"delimiter": ","})
+        >>> with open(source + ".index.json") as file:
+        ...     print(file.read())
+        {"version": 2, "file": {"size": 8, "mtime": ...}, "options": {}, "properties": {"delimiter": ","}}
+
+    """
+    import json
+    import os
+
+    properties = dict(properties)
+
+    for name in RANGES:
+        if name in properties:
+            properties[name] = [
+                [number, start, stop]
+                for (number, (start, stop)) in properties[name].items()
+            ]
+
+    index = {
+        "version": VERSION,
+        "file": _stat(source),
+        "options": options,
+        "properties": properties,
+    }
+
+    # Replace the index atomically so that concurrent readers never see a partial index.
+    with open(filename + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(index, file)
+    os.replace(filename + ".tmp", filename)
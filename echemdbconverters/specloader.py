@@ -0,0 +1,480 @@
+r"""
+Loaders for text tables described by a declarative spec.
+
+Many formats consist of a header of a certain number of lines, one or more
+column header lines, and a table of data, possibly followed by other content.
+Instead of implementing a :class:`~echemdbconverters.baseloader.BaseLoader`
+for such a format, the layout can be described in a YAML or TOML file::
+
+    # The name of the loader (optional)
+    name: eclab
+    header:
+      # A regular expression searched in the first lines of the file. When it
+      # contains a group named `lines`, the group is the number of header
+      # lines. Otherwise, the header ends with the first matching line.
+      marker: 'Nb header lines *: *(?P<lines>\d+)'
+      # Added to the number of header lines (optional)
+      offset: -1
+      # The number of lines searched for the marker (optional)
+      limit: 1000
+      # Alternatively, a fixed number of header lines
+      # lines: 3
+    # The number of column header lines (optional, defaults to 1)
+    column header lines: 1
+    # The decimal separator and the delimiter (optional, detected otherwise)
+    decimal: ','
+    delimiter: "\t"
+    # A regular expression matching the first line after the data (optional)
+    end: '^END'
+
+The spec is compiled once into a loader class which only scans the lines
+up to the header marker and stops at the end marker.
+
+EXAMPLES::
+
+    >>> import os, tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> with open(os.path.join(directory, "table.yaml"), "w") as file:
+    ...     _ = file.write('''
+    ... header:
+    ...   marker: '^Table'
+    ... delimiter: ';'
+    ... end: '^End of table'
+    ... ''')
+    >>> with open(os.path.join(directory, "data.txt"), "w") as file:
+    ...     _ = file.write('''Instrument;X
+    ... Table
+    ... t;E
+    ... 0;0,1
+    ... 1;0,2
+    ... End of table
+    ... Checksum;123
+    ... ''')
+    >>> loader = load_spec(os.path.join(directory, "table.yaml"))
+    >>> csv = loader(os.path.join(directory, "data.txt"))
+    >>> csv.header_lines
+    2
+    >>> csv.df
+       t    E
+    0  0  0.1
+    1  1  0.2
+
+The spec can be used as the device of a loader::
+
+    >>> from echemdbconverters.baseloader import BaseLoader
+    >>> BaseLoader.create(os.path.join(directory, "table.yaml")) is loader
+    True
+
+"""
+
+# ********************************************************************
+#  This file is part of echemdb-converters.
+#
+#        Copyright (C) 2025 Albert Engstfeld
+#
+#  echemdb-converters is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  echemdb-converters is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with echemdb-converters. If not, see <https://www.gnu.org/licenses/>.
+# ********************************************************************
+import io
+from functools import cached_property, lru_cache
+
+from echemdbconverters.baseloader import BaseLoader, _profiled
+
+LIMIT = 1000
+r"""
+The default number of lines searched for the header marker of a spec.
+"""
+
+
+class SpecLoader(BaseLoader):
+    r"""
+    Loads text tables whose layout is described by the :attr:`spec`.
+
+    Loaders for a specific spec are created with :func:`compile_spec`.
+
+    EXAMPLES::
+
+        >>> from io import StringIO
+        >>> loader = compile_spec({"header": {"lines": 1}, "column header lines": 2})
+        >>> csv = loader(StringIO('''Some header
+        ... t,E
+        ... s,V
+        ... 0,0.1'''))
+        >>> csv.column_header_names
+        ['t / s', 'E / V']
+        >>> csv.df
+           t / s  E / V
+        0      0    0.1
+
+    """
+
+    spec = {}
+    r"""
+    The spec describing the layout of the files, see :mod:`echemdbconverters.specloader`.
+    """
+
+    blocksize = 2**22
+    r"""
+    The number of bytes read at once when searching for the end marker.
+    """
+
+    _marker = None
+    _end = None
+
+    _dependents = {"header_lines": ["_data_end"], "_data_end": ["line_index"]}
+
+    def __init__(self, file, **kwargs):
+        spec = self.spec
+
+        if kwargs.get("header_lines") is None and "lines" in spec.get("header", {}):
+            kwargs["header_lines"] = spec["header"]["lines"] + spec["header"].get(
+                "offset", 0
+            )
+        if kwargs.get("column_header_lines") is None:
+            kwargs["column_header_lines"] = spec.get("column header lines")
+        if kwargs.get("decimal") is None:
+            kwargs["decimal"] = spec.get("decimal")
+        if kwargs.get("delimiters") is None and "delimiter" in spec:
+            kwargs["delimiters"] = [spec["delimiter"]]
+
+        super().__init__(file, **kwargs)
+
+    @property
+    def _sidecar_options(self):
+        r"""
+        The options of this loader which a sidecar index depends on.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> compile_spec({"decimal": ","})(StringIO("a;b\n0;0"))._sidecar_options["spec"]
+            {'decimal': ','}
+
+        """
+        return {**super()._sidecar_options, "spec": self.spec}
+
+    @cached_property
+    @_profiled("header")
+    def header_lines(self):
+        r"""
+        The number of header lines excluding the column header lines.
+
+        Only the first lines of the file up to the header marker are read.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> loader = compile_spec({"header": {"marker": r"Nb header lines *: *(?P<lines>\d+)", "offset": -1}})
+            >>> csv = loader(StringIO('''EC-Lab ASCII FILE
+            ... Nb header lines : 3
+            ... mode\ttime/s
+            ... 2\t0'''))
+            >>> csv.header_lines
+            2
+
+        TESTS:
+
+        The marker is only searched in the first lines of the file::
+
+            >>> loader = compile_spec({"header": {"marker": "^Table", "limit": 2}})
+            >>> loader(StringIO("a\nb\nTable\nt\n0")).header_lines
+            Traceback (most recent call last):
+            ...
+            KeyError: 'Could not find a line matching `^Table` in the first 2 lines of the file.'
+
+        """
+        from itertools import islice
+
+        if self._header_lines is not None or self._marker is None:
+            return super().header_lines
+
+        header = self.spec["header"]
+        limit = header.get("limit", LIMIT)
+
+        for idx, line in enumerate(islice(self._lines(), limit)):
+            match = self._marker.search(line)
+
+            if match:
+                if "lines" in self._marker.groupindex:
+                    lines = int(match.group("lines"))
+                else:
+                    lines = idx + 1
+
+                return lines + header.get("offset", 0)
+
+        raise KeyError(
+            f"Could not find a line matching `{header['marker']}` in the first {limit} lines of the file."
+        )
+
+    def _data_stream(self):
+        r"""
+        Return a binary file object positioned at the first line of the data
+        which ends before the end marker.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> loader = compile_spec({"end": "^#"})
+            >>> with loader(StringIO("a,b\n0,0\n# end\n1,1\n"))._data_stream() as data:
+            ...     data.read()
+            b'0,0\n'
+
+        """
+        data = super()._data_stream()
+
+        if self._data_end is None:
+            return data
+
+        return io.BufferedReader(_Truncated(data, self._data_end))
+
+    @cached_property
+    def _data_end(self):
+        r"""
+        The offset of the end marker in the file or ``None`` if the data
+        extends to the end of the file.
+
+        The data is searched for the end marker in blocks of
+        :attr:`blocksize` bytes.
+
+        EXAMPLES::
+
+            >>> from io import StringIO
+            >>> loader = compile_spec({"end": "^#"})
+            >>> loader(StringIO("a,b\n0,0\n# end\n"))._data_end
+            8
+            >>> loader(StringIO("a,b\n0,0\n"))._data_end is None
+            True
+
+        The end marker is found across the boundaries of blocks::
+
+            >>> csv = loader(StringIO("a,b\n" + "0,0\n" * 10 + "# end\n"))
+            >>> csv.blocksize = 3
+            >>> csv._data_end
+            44
+
+        """
+        if self._end is None:
+            return None
+
+        with super()._data_stream() as data:
+            # The buffer always starts with the newline preceding its first
+            # line. The offset is the position of the start of the buffer.
+            offset = data.tell() - 1
+            rest = b"\n"
+
+            while True:
+                block = data.read(self.blocksize)
+                buffer = rest + block
+
+                # Only search complete lines unless the end of the file has been reached.
+                complete = buffer.rfind(b"\n") + 1 if block else len(buffer)
+
+                match = self._end.search(buffer, 0, complete)
+                if match:
+                    return offset + buffer.rfind(b"\n", 0, match.start() + 1) + 1
+
+                if not block:
+                    return None
+
+                offset += complete - 1
+                rest = buffer[complete - 1 :]
+
+
+class _Truncated(io.RawIOBase):
+    r"""
+    A binary file object reading ``file`` up to the offset ``end``.
+
+    EXAMPLES::
+
+        >>> from io import BytesIO
+        >>> file = BytesIO(b"0123456789")
+        >>> _ = file.seek(2)
+        >>> reader = _Truncated(file, 5)
+        >>> reader.read(), reader.tell()
+        (b'234', 5)
+
+    """
+
+    def __init__(self, file, end):
+        super().__init__()
+        self._file = file
+        self._position = file.tell()
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def readinto(self, buffer):
+        size = min(len(buffer), max(self._end - self._position, 0))
+
+        if not size:
+            return 0
+
+        read = self._file.readinto(memoryview(buffer)[:size])
+        self._position += read
+        return read
+
+
+_keys = {
+    "name": None,
+    "header": {"marker", "lines", "offset", "limit"},
+    "column header lines": None,
+    "decimal": None,
+    "delimiter": None,
+    "end": None,
+}
+
+
+def compile_spec(spec, name=None):
+    r"""
+    Return a loader class for files whose layout is described by ``spec``.
+
+    The class is named after the ``name`` of the spec or ``name`` if the
+    spec has no name.
+
+    EXAMPLES::
+
+        >>> loader = compile_spec({"name": "table", "header": {"marker": "^Table"}})
+        >>> loader.__name__
+        'table'
+        >>> loader._marker
+        re.compile('^Table')
+
+    TESTS:
+
+    Invalid specs::
+
+        >>> compile_spec({"header": {"marker": "^Table", "lines": 2}})
+        Traceback (most recent call last):
+        ...
+        ValueError: The header of a spec cannot have both a marker and a number of lines.
+
+        >>> compile_spec({"delimiters": ";"})
+        Traceback (most recent call last):
+        ...
+        ValueError: Unknown keys in spec: delimiters.
+
+    """
+    import re
+
+    unknown = [key for key in spec if key not in _keys] + [
+        f"header.{key}" for key in spec.get("header", {}) if key not in _keys["header"]
+    ]
+    if unknown:
+        raise ValueError(f"Unknown keys in spec: {', '.join(unknown)}.")
+
+    header = spec.get("header", {})
+    if "marker" in header and "lines" in header:
+        raise ValueError(
+            "The header of a spec cannot have both a marker and a number of lines."
+        )
+
+    attributes = {"spec": spec, "__module__": __name__}
+
+    if "marker" in header:
+        attributes["_marker"] = re.compile(header["marker"])
+
+    if "end" in spec:
+        # The end marker is searched in the binary data. Python's regular
+        # expressions are much faster when searching for a line starting with
+        # the marker with a newline than with a ^ in multiline mode.
+        end = spec["end"].encode("utf-8")
+        if end.startswith(b"^"):
+            end = b"\n(?:" + end[1:] + b")"
+        attributes["_end"] = re.compile(b"(?m)" + end)
+
+    return type(spec.get("name") or name or "SpecLoader", (SpecLoader,), attributes)
+
+
+def load_spec(filename):
+    r"""
+    Return a loader class for the spec in the YAML or TOML file ``filename``,
+    see :func:`compile_spec`.
+
+    The spec is only compiled again when the file has been modified.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "table.toml")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write('''
+        ... decimal = ","
+        ... [header]
+        ... lines = 2
+        ... ''')
+        >>> loader = load_spec(filename)
+        >>> loader.spec
+        {'decimal': ',', 'header': {'lines': 2}}
+        >>> load_spec(filename) is loader
+        True
+
+    """
+    import os
+
+    stat = os.stat(filename)
+
+    return _load_spec(os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=64)
+def _load_spec(filename, mtime, size):  # pylint: disable=unused-argument
+    r"""
+    Return a loader class for the spec in the YAML or TOML file ``filename``.
+
+    The ``mtime`` and ``size`` of the file are only used to invalidate the
+    cache when the file has been modified.
+
+    EXAMPLES::
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "table.yaml")
+        >>> with open(filename, "w") as file:
+        ...     _ = file.write("decimal: ','")
+        >>> _load_spec(filename, None, None).__name__
+        'table'
+
+    """
+    import os
+
+    if filename.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            # tomllib is only part of the standard library since Python 3.11.
+            try:
+                import tomli as tomllib
+            except ImportError as e:
+                raise ImportError(
+                    f"Reading the TOML spec '{filename}' requires Python 3.11 or the tomli package."
+                ) from e
+
+        with open(filename, "rb") as file:
+            spec = tomllib.load(file)
+    else:
+        import yaml
+
+        with open(filename, "rb") as file:
+            spec = yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+    return compile_spec(
+        spec or {}, name=os.path.splitext(os.path.basename(filename))[0]
+    )
@@ -187,3 +187,477 @@ def test_csv(name, args):
             )
         finally:
             os.chdir(cwd)
+
+
+@pytest.mark.parametrize(
+    "name,args",
+    [
+        ("default", ["default.csv"]),
+        ("unit", ["unit.csv", "--metadata", "unit.csv.metadata"]),
+        ("eclab_cv", ["eclab_cv.mpt", "--device", "eclab"]),
+        ("eclab_ca", ["eclab_ca.mpt", "--device", "eclab"]),
+        ("gamry_cv", ["gamry_cv.DTA", "--device", "gamry"]),
+    ],
+)
+@pytest.mark.parametrize("chunksize", ["1", "7", "100000"])
+def test_csv_chunksize(name, args, chunksize):
+    r"""
+    Test that the csv command produces the same JSON and CSV files when
+    the data is converted in chunks as when it is converted at once.
+    """
+    import os
+
+    cwd = os.getcwd()
+    with TemporaryData(f"{name}.*") as workdir:
+        os.chdir(workdir)
+        try:
+            from echemdbconverters.entrypoint import cli
+
+            invoke(cli, "csv", *args, "--outdir", "expected")
+            invoke(cli, "csv", *args, "--chunksize", chunksize, "--outdir", "outdir")
+
+            import json
+
+            with open(f"outdir/{name}.json", encoding="utf-8") as actual:
+                with open(f"expected/{name}.json", encoding="utf-8") as expected:
+                    assert json.load(actual) == json.load(expected)
+
+            import pandas
+            import pandas.testing
+
+            pandas.testing.assert_frame_equal(
+                pandas.read_csv(f"outdir/{name}.csv"),
+                pandas.read_csv(f"expected/{name}.csv"),
+            )
+        finally:
+            os.chdir(cwd)
+
+
+def test_csv_chunksize_error():
+    r"""
+    Test that the csv command does not leave a partially written CSV file
+    behind when a chunk of the data cannot be parsed.
+    """
+    import os
+
+    from pandas.errors import ParserError
+
+    cwd = os.getcwd()
+    with TemporaryData("default.csv") as workdir:
+        os.chdir(workdir)
+        try:
+            from echemdbconverters.entrypoint import cli
+
+            with open("default.csv", "a", encoding="utf-8") as file:
+                file.write('\n3,"3,3\n4,4,4\n')
+
+            with pytest.raises(ParserError):
+                invoke(
+                    cli, "csv", "default.csv", "--chunksize", "1", "--outdir", "outdir"
+                )
+
+            assert os.listdir("outdir") == []
+        finally:
+            os.chdir(cwd)
+
+
+def _compress(filename, module):
+    r"""
+    Write the file ``filename`` compressed with the compression ``module``
+    next to it and return the suffix of the compressed file.
+    """
+    from echemdbconverters.compression import suffixes
+
+    suffix = suffixes[
+        {"lzma": "xz", "zstandard": "zstd"}.get(module.__name__, module.__name__)
+    ]
+
+    with open(filename, "rb") as file:
+        data = file.read()
+
+    if module.__name__ == "zstandard":
+        data = module.ZstdCompressor().compress(data)
+    else:
+        data = module.compress(data)
+
+    with open(f"{filename}{suffix}", "wb") as file:
+        file.write(data)
+
+    return suffix
+
+
+@pytest.mark.parametrize("compression", ["gzip", "lzma", "zstandard"])
+def test_csv_compressed(compression):
+    r"""
+    Test that the csv command produces the same output for compressed files
+    as for the uncompressed file.
+    """
+    import os
+
+    module = pytest.importorskip(compression)
+
+    cwd = os.getcwd()
+    with TemporaryData("eclab_cv.*") as workdir:
+        os.chdir(workdir)
+        try:
+            suffix = _compress("eclab_cv.mpt", module)
+
+            from echemdbconverters.entrypoint import cli
+
+            invoke(
+                cli,
+                "csv",
+                f"eclab_cv.mpt{suffix}",
+                "--metadata",
+                "eclab_cv.mpt.metadata",
+                "--device",
+                "eclab",
+                "--outdir",
+                "outdir",
+            )
+
+            import json
+
+            with open("outdir/eclab_cv.json", encoding="ASCII") as actual:
+                with open("eclab_cv.json.expected", encoding="ASCII") as expected:
+                    assert json.load(actual) == json.load(expected)
+
+            import pandas
+            import pandas.testing
+
+            pandas.testing.assert_frame_equal(
+                pandas.read_csv("outdir/eclab_cv.csv"),
+                pandas.read_csv("eclab_cv.csv.expected"),
+            )
+        finally:
+            os.chdir(cwd)
+
+
+@pytest.mark.parametrize("compression", ["gzip", "lzma", "zstandard"])
+@pytest.mark.parametrize(
+    "select", [["--rows", "10", "30"], ["--where", "time/s", "87", "87.2"]]
+)
+def test_csv_select_compressed(compression, select):
+    r"""
+    Test that the csv command selects the same rows of compressed files as
+    of the uncompressed file, also for streams which are not seekable.
+    """
+    import os
+
+    module = pytest.importorskip(compression)
+
+    cwd = os.getcwd()
+    with TemporaryData("eclab_cv.mpt") as workdir:
+        os.chdir(workdir)
+        try:
+            suffix = _compress("eclab_cv.mpt", module)
+
+            from echemdbconverters.entrypoint import cli
+
+            args = ["--device", "eclab", *select]
+            invoke(cli, "csv", "eclab_cv.mpt", *args, "--outdir", "expected")
+            invoke(cli, "csv", f"eclab_cv.mpt{suffix}", *args, "--outdir", "outdir")
+
+            import pandas
+            import pandas.testing
+
+            actual = pandas.read_csv("outdir/eclab_cv.csv")
+            assert len(actual) > 0
+            pandas.testing.assert_frame_equal(
+                actual, pandas.read_csv("expected/eclab_cv.csv")
+            )
+
+            # Skip over several lines recorded in the line index.
+            from echemdbconverters.baseloader import BaseLoader
+
+            loader = BaseLoader.create("eclab")(f"eclab_cv.mpt{suffix}")
+            loader.line_index_interval = 4
+            expected = BaseLoader.create("eclab")("eclab_cv.mpt").df
+
+            pandas.testing.assert_frame_equal(
+                loader.select(rows=(10, 30)), expected.iloc[10:30]
+            )
+            pandas.testing.assert_frame_equal(
+                loader.select(where=("time/s", 87, 87.2)),
+                expected[expected["time/s"].between(87, 87.2)],
+            )
+        finally:
+            os.chdir(cwd)
+
+
+def test_csv_cp1252():
+    r"""
+    Test that the csv command produces the same output for an EC-Lab file
+    written with Windows-1252 as for the UTF-8 encoded file.
+    """
+    import os
+
+    cwd = os.getcwd()
+    with TemporaryData("eclab_cv.*") as workdir:
+        os.chdir(workdir)
+        try:
+            with open("eclab_cv.mpt", encoding="utf-8") as file:
+                data = file.read()
+
+            with open("eclab_cv.mpt", "w", encoding="cp1252") as file:
+                file.write(data)
+
+            from echemdbconverters.entrypoint import cli
+
+            invoke(
+                cli,
+                "csv",
+                "eclab_cv.mpt",
+                "--metadata",
+                "eclab_cv.mpt.metadata",
+                "--device",
+                "eclab",
+                "--outdir",
+                "outdir",
+            )
+
+            import json
+
+            with open("outdir/eclab_cv.json", encoding="ASCII") as actual:
+                with open("eclab_cv.json.expected", encoding="ASCII") as expected:
+                    assert json.load(actual) == json.load(expected)
+
+            import pandas
+            import pandas.testing
+
+            pandas.testing.assert_frame_equal(
+                pandas.read_csv("outdir/eclab_cv.csv"),
+                pandas.read_csv("eclab_cv.csv.expected"),
+            )
+        finally:
+            os.chdir(cwd)
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+def test_csv_progress(processes):
+    r"""
+    Test that the csv command reports the progress of parsing the entire file
+    as JSON lines.
+    """
+    import os
+
+    cwd = os.getcwd()
+    with TemporaryData("eclab_cv.*") as workdir:
+        os.chdir(workdir)
+        try:
+            from click.testing import CliRunner
+
+            from echemdbconverters.entrypoint import cli
+
+            invocation = CliRunner().invoke(
+                cli,
+                [
+                    "csv",
+                    "eclab_cv.mpt",
+                    "--device",
+                    "eclab",
+                    "--processes",
+                    processes,
+                    "--outdir",
+                    "outdir",
+                    "--progress",
+                    "json",
+                ],
+                catch_exceptions=False,
+            )
+
+            import json
+
+            events = [json.loads(line) for line in invocation.output.splitlines()]
+            parsed = [event for event in events if event["stage"] == "parse"]
+
+            import pandas
+
+            assert parsed[-1]["bytes"] == os.path.getsize("eclab_cv.mpt")
+            assert parsed[-1]["total_bytes"] == os.path.getsize("eclab_cv.mpt")
+            assert parsed[-1]["rows"] == len(pandas.read_csv("outdir/eclab_cv.csv"))
+            assert events[-1]["stage"] == "save"
+        finally:
+            os.chdir(cwd)
+
+
+@pytest.mark.parametrize("memory", [None, "1"])
+def test_batch(memory):
+    r"""
+    Test that the batch command produces the same output as the csv command,
+    also when the files are converted in chunks to stay within the memory.
+    """
+    import os
+
+    cwd = os.getcwd()
+    with TemporaryData("eclab_c?.*") as workdir:
+        os.chdir(workdir)
+        try:
+            from echemdbconverters.entrypoint import cli
+
+            args = ["--memory", memory] if memory else []
+            invoke(
+                cli,
+                "batch",
+                "eclab_cv.mpt",
+                "eclab_ca.mpt",
+                "--device",
+                "eclab",
+                "--workers",
+                "2",
+                "--outdir",
+                "outdir",
+                *args,
+            )
+
+            import json
+
+            import pandas
+            import pandas.testing
+
+            for name in ["eclab_cv", "eclab_ca"]:
+                with open(f"outdir/{name}.json", encoding="ASCII") as actual:
+                    actual = json.load(actual)
+
+                with open(f"{name}.json.expected", encoding="ASCII") as expected:
+                    assert actual == json.load(expected)
+
+                pandas.testing.assert_frame_equal(
+                    pandas.read_csv(f"outdir/{name}.csv"),
+                    pandas.read_csv(f"{name}.csv.expected"),
+                )
+        finally:
+            os.chdir(cwd)
+
+
+@pytest.mark.parametrize("name", ["eclab_cv", "eclab_ca"])
+def test_cache(name):
+    r"""
+    Test that the data read from the cache is the same as the parsed data
+    and that the cache command clears the cache.
+    """
+    import os
+    import tempfile
+
+    import pandas.testing
+
+    from echemdbconverters.baseloader import BaseLoader
+    from echemdbconverters.cache import entries
+    from echemdbconverters.entrypoint import cli
+
+    cache = os.path.join(tempfile.mkdtemp(), "cache")
+
+    with TemporaryData(f"{name}.mpt") as workdir:
+        filename = os.path.join(workdir, f"{name}.mpt")
+        loader = BaseLoader.create("eclab")
+
+        expected = loader(filename).df
+        pandas.testing.assert_frame_equal(loader(filename, cache=cache).df, expected)
+        assert len(entries(cache)) == 1
+        pandas.testing.assert_frame_equal(loader(filename, cache=cache).df, expected)
+
+    invoke(cli, "cache", "clear", "--directory", cache)
+    assert entries(cache) == []
+
+
+@pytest.mark.parametrize(
+    "name,device,spec",
+    [
+        (
+            "eclab_cv.mpt",
+            "eclab",
+            "header:\n  marker: 'Nb header lines *: *(?P<lines>\\d+)'\n  offset: -1\n",
+        ),
+        (
+            "gamry_cv.DTA",
+            "gamry",
+            "header:\n  marker: '^CURVE\\tTABLE'\ncolumn header lines: 2\ndelimiter: \"\\t\"\n",
+        ),
+    ],
+)
+def test_spec(name, device, spec):
+    r"""
+    Test that loaders described by a spec load the same data as the
+    corresponding device loaders.
+    """
+    import os
+
+    import pandas.testing
+
+    from echemdbconverters.baseloader import BaseLoader
+
+    with TemporaryData(name) as workdir:
+        filename = os.path.join(workdir, name)
+        with open(os.path.join(workdir, "spec.yaml"), "w", encoding="utf-8") as file:
+            file.write(spec)
+
+        expected = BaseLoader.create(device)(filename)
+        actual = BaseLoader.create(os.path.join(workdir, "spec.yaml"))(filename)
+
+        assert actual.header_lines == expected.header_lines
+        assert actual.column_header_names == expected.column_header_names
+        pandas.testing.assert_frame_equal(actual.df, expected.df)
+
+
+def test_segments():
+    r"""
+    Test that the data of an EC-Lab file of linked techniques is split into
+    the data of each technique, also when the index is read from a sidecar.
+    """
+    import os
+
+    import pandas.testing
+
+    from echemdbconverters.eclabloader import ECLabLoader
+
+    with TemporaryData("eclab_linked.mpt") as workdir:
+        filename = os.path.join(workdir, "eclab_linked.mpt")
+
+        loader = ECLabLoader(filename, sidecar=True)
+        df = loader.df
+
+        assert loader.segment_index == {1: (0, 5), 2: (5, 25), 3: (25, 43)}
+        assert [segment.technique for segment in loader.segments] == [
+            "Open Circuit Voltage",
+            "Chronoamperometry / Chronocoulometry",
+            "Chronoamperometry / Chronocoulometry",
+        ]
+
+        for segment in loader.segments:
+            start, stop = segment.rows
+            pandas.testing.assert_frame_equal(segment.df, df.iloc[start:stop])
+
+        assert "segment_index" in ECLabLoader(filename, sidecar=True).__dict__
+
+
+@pytest.mark.parametrize("semaphore", [False, True])
+def test_convert_file_async(semaphore):
+    r"""
+    Test that files are converted from asyncio applications with and
+    without a semaphore limiting the number of concurrent conversions.
+    """
+    import asyncio
+    import os
+    import tempfile
+
+    import pandas.testing
+
+    from echemdbconverters.asynchronous import convert_file
+
+    async def convert(filename, outdir):
+        return await convert_file(
+            filename,
+            device="eclab",
+            outdir=outdir,
+            semaphore=asyncio.Semaphore(1) if semaphore else None,
+        )
+
+    with TemporaryData("eclab_cv.*") as workdir:
+        outdir = tempfile.mkdtemp()
+        entry = asyncio.run(convert(os.path.join(workdir, "eclab_cv.mpt"), outdir))
+
+        pandas.testing.assert_frame_equal(
+            pandas.read_csv(os.path.join(outdir, "eclab_cv.csv")),
+            pandas.read_csv(os.path.join(workdir, "eclab_cv.csv.expected")),
+        )
+        assert entry.identifier == "eclab_cv"